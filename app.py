@@ -1,13 +1,42 @@
 import os
-from flask import Flask, request, jsonify, render_template, send_from_directory, flash, redirect, url_for
+from flask import Flask, Blueprint, request, jsonify, render_template, send_from_directory, flash, redirect, url_for, Response, g, abort
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.exceptions import HTTPException
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
-import requests
-import xml.etree.ElementTree as ET
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+import sqlite3
+import zlib
+import re
+import html
+import click
+import time
+import json
+import mimetypes
+import hashlib
+import hmac
+import secrets
+import threading
+from collections import Counter
+from functools import wraps
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from markupsafe import escape
+# Selten oder erst nach dem ersten Request benötigte Module (requests, xml.etree, gzip, ProcessPoolExecutor)
+# werden in den Funktionen importiert, die sie verwenden: das verkürzt den Kaltstart
+
+# Optionales, schnelleres JSON-Backend; ohne orjson wird die Standardbibliothek verwendet
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Lade Umgebungsvariablen aus .env-Datei (für lokale Entwicklung, in Codespaces durch Secrets überschrieben)
 load_dotenv()
@@ -22,11 +51,203 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY_FLASK_LOGIN', 'your_super_
 basedir = os.path.abspath(os.path.dirname(__file__))
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'podcast_tracker.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False # Deaktiviert Warnungen zur Objektmodifikation
+# 'inline': Beschreibung als Rohtext in Episode.description
+# 'compressed': Beschreibung komprimiert (zlib) plus HTML-freier Text in der separaten Tabelle EpisodeDescription
+app.config['DESCRIPTION_STORAGE'] = os.getenv('DESCRIPTION_STORAGE', 'inline')
+# Anzahl Zeilen, die Listen-Endpunkte pro Block aus der Datenbank lesen und serialisieren
+app.config['LISTING_CHUNK_SIZE'] = int(os.getenv('LISTING_CHUNK_SIZE', 1000))
+# Produktionsprofil für SQLite: WAL-Journal, synchronous=NORMAL, busy_timeout, mmap und Cache,
+# sowie ein eigener Schreib-Thread, der Ingest-Commits (Refresh, Import) serialisiert und bündelt
+app.config['SQLITE_TUNED'] = os.getenv('SQLITE_TUNED', '0') == '1'
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+app.config['SQLITE_CACHE_SIZE_KB'] = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+app.config['INGEST_WRITER_MAX_BATCH'] = int(os.getenv('INGEST_WRITER_MAX_BATCH', 20))
+# Höchstdauer einer gebündelten Schreibtransaktion und Pause danach, damit Request-Schreibzugriffe
+# nicht länger als SQLITE_BUSY_TIMEOUT_MS auf die Schreibsperre warten
+app.config['INGEST_WRITER_MAX_BATCH_MS'] = int(os.getenv('INGEST_WRITER_MAX_BATCH_MS', 500))
+app.config['INGEST_WRITER_PAUSE_MS'] = int(os.getenv('INGEST_WRITER_PAUSE_MS', 50))
+# Inkrementeller Refresh: nur neue Episoden parsen; ein vollständiger Parse erfolgt auf Wunsch (?full=1)
+# oder spätestens nach FULL_PARSE_INTERVAL_HOURS. INCREMENTAL_KNOWN_WINDOW = Anzahl jüngster Episoden als bekannte Grenze
+app.config['FULL_PARSE_INTERVAL_HOURS'] = int(os.getenv('FULL_PARSE_INTERVAL_HOURS', 24))
+app.config['INCREMENTAL_KNOWN_WINDOW'] = int(os.getenv('INCREMENTAL_KNOWN_WINDOW', 200))
+# Archiv der geladenen Feed-Inhalte (gzip, benannt nach SHA-256) für 'flask reingest' ohne erneuten Abruf.
+# Leerer Wert deaktiviert das Archiv.
+app.config['FEED_ARCHIVE_DIR'] = os.getenv('FEED_ARCHIVE_DIR', os.path.join(basedir, 'feed_archive'))
+# Duplikaterkennung: Inhalts-Fingerabdruck aus Kanaltitel und den FEED_FINGERPRINT_EPISODES ältesten Episoden-GUIDs
+app.config['FEED_FINGERPRINT_EPISODES'] = int(os.getenv('FEED_FINGERPRINT_EPISODES', 10))
+# WebSub (PubSubHubbub): nur aktiv, wenn eine öffentlich erreichbare Basis-URL für den Callback gesetzt ist
+app.config['WEBSUB_CALLBACK_BASE_URL'] = os.getenv('WEBSUB_CALLBACK_BASE_URL', '').rstrip('/')
+app.config['WEBSUB_LEASE_SECONDS'] = int(os.getenv('WEBSUB_LEASE_SECONDS', 10 * 24 * 3600))
+app.config['WEBSUB_RENEW_BEFORE_HOURS'] = int(os.getenv('WEBSUB_RENEW_BEFORE_HOURS', 24))
+# Sammel-Prüfung der iTunes/YouTube-Verfügbarkeit: Feeds, deren letzte Prüfung älter als AVAILABILITY_MAX_AGE_HOURS ist.
+# AVAILABILITY_CONCURRENCY begrenzt die gleichzeitigen Anfragen insgesamt (iTunes und YouTube zusammen),
+# AVAILABILITY_TIME_BUDGET_SECONDS die Laufzeit eines Durchlaufs
+app.config['AVAILABILITY_MAX_AGE_HOURS'] = int(os.getenv('AVAILABILITY_MAX_AGE_HOURS', 7 * 24))
+app.config['AVAILABILITY_CONCURRENCY'] = int(os.getenv('AVAILABILITY_CONCURRENCY', 8))
+app.config['AVAILABILITY_TIME_BUDGET_SECONDS'] = float(os.getenv('AVAILABILITY_TIME_BUDGET_SECONDS', 120))
+# Direkte Apple-Podcasts-Links der Episoden: ein iTunes-Lookup pro Feed (bis EPISODE_LINK_LOOKUP_LIMIT neueste Episoden),
+# Zuordnung über Medien-URL oder Titel und Datum (± EPISODE_LINK_MATCH_DAYS). Erneute Prüfung nach EPISODE_LINK_TTL_HOURS,
+# für Episoden ohne Link frühestens nach EPISODE_LINK_RETRY_MINUTES. ITUNES_API_BASE_URL z.B. für einen lokalen Stub
+app.config['ITUNES_API_BASE_URL'] = os.getenv('ITUNES_API_BASE_URL', 'https://itunes.apple.com').rstrip('/')
+app.config['EPISODE_LINK_TTL_HOURS'] = int(os.getenv('EPISODE_LINK_TTL_HOURS', 7 * 24))
+app.config['EPISODE_LINK_RETRY_MINUTES'] = int(os.getenv('EPISODE_LINK_RETRY_MINUTES', 60))
+app.config['EPISODE_LINK_LOOKUP_LIMIT'] = int(os.getenv('EPISODE_LINK_LOOKUP_LIMIT', 200))
+app.config['EPISODE_LINK_MATCH_DAYS'] = int(os.getenv('EPISODE_LINK_MATCH_DAYS', 2))
+# Startoptimierter Modus (Scale-to-zero, z.B. Cloud Run): Schema und Standardbenutzer nur über 'flask init-db',
+# keine Datenbankprüfung pro Request und eine vorgerenderte, zwischengespeicherte Hauptseite
+app.config['FAST_STARTUP'] = os.getenv('FAST_STARTUP', '0') == '1'
+app.config['APP_SHELL_CACHE_FILE'] = os.getenv('APP_SHELL_CACHE_FILE', os.path.join(basedir, 'instance', 'app_shell.html'))
+# Verbindungspool für Server-Datenbanken (z.B. PostgreSQL); SQLite behält die Standardeinstellungen.
+# Die Poolgröße richtet sich standardmäßig nach der Thread-Anzahl von gunicorn (GUNICORN_THREADS, siehe start.sh).
+# DB_STATEMENT_TIMEOUT_MS gilt für die primäre Datenbank (0 = kein Limit, z.B. für lange Ingest-Transaktionen)
+app.config['GUNICORN_THREADS'] = int(os.getenv('GUNICORN_THREADS', 8))
+app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', app.config['GUNICORN_THREADS']))
+app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 4))
+app.config['DB_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', 10))
+app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))
+app.config['DB_STATEMENT_TIMEOUT_MS'] = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+# Eigene Lese-Engine mit eigenem Pool für Listen- und Suchendpunkte, optional auf ein Replikat (DATABASE_READ_URL).
+# Ohne DATABASE_READ_URL zeigt sie bei Server-Datenbanken auf die primäre Datenbank; bei SQLite entfällt sie.
+app.config['DATABASE_READ_URL'] = os.getenv('DATABASE_READ_URL', '')
+app.config['DB_READ_POOL_SIZE'] = int(os.getenv('DB_READ_POOL_SIZE', app.config['GUNICORN_THREADS']))
+app.config['DB_READ_STATEMENT_TIMEOUT_MS'] = int(os.getenv('DB_READ_STATEMENT_TIMEOUT_MS', 15000))
+# Administratoren (kommagetrennte Benutzernamen) für Diagnose-Endpunkte; leer = niemand
+app.config['ADMIN_USERS'] = {name.strip() for name in os.getenv('ADMIN_USERS', '').split(',') if name.strip()}
+# Opt-in-Diagnose, ohne Kosten wenn deaktiviert (Hooks und Routen werden nur dann registriert):
+# PROFILING_ENABLED: Administratoren fordern per Header 'X-Profile: 1' oder ?_profile=1 ein cProfile des Requests an,
+#   gespeichert in PROFILE_DIR und abrufbar über /admin/profiles/<name>
+# SLOW_QUERY_MS: SQL-Anweisungen ab dieser Dauer mit Parametern und Aufrufstelle protokollieren (0 = aus)
+# TRACEMALLOC_FRAMES: > 0 startet tracemalloc mit dieser Stacktiefe und aktiviert /admin/memory
+app.config['PROFILING_ENABLED'] = os.getenv('PROFILING_ENABLED', '0') == '1'
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', os.path.join(basedir, 'instance', 'profiles'))
+app.config['SLOW_QUERY_MS'] = float(os.getenv('SLOW_QUERY_MS', 0))
+app.config['TRACEMALLOC_FRAMES'] = int(os.getenv('TRACEMALLOC_FRAMES', 0))
+# Webhooks: Episoden-Ereignisse werden in derselben Transaktion wie der Ingest in die Outbox (EpisodeEvent) geschrieben
+# und gebündelt zugestellt. WEBHOOK_WORKER_ENABLED startet dafür einen Hintergrund-Thread, der
+# WEBHOOK_BATCH_DELAY_SECONDS nach neuen Ereignissen (spätestens alle WEBHOOK_POLL_SECONDS) zustellt;
+# alternativ 'flask deliver-webhooks' per Cron/Job. Fehlgeschlagene Zustellungen werden mit exponentiellem Backoff
+# (bis WEBHOOK_MAX_BACKOFF_SECONDS) wiederholt; pro Lauf gehen höchstens WEBHOOK_MAX_BATCHES_PER_RUN Batches an einen Endpunkt
+app.config['WEBHOOK_WORKER_ENABLED'] = os.getenv('WEBHOOK_WORKER_ENABLED', '1') == '1'
+app.config['WEBHOOK_BATCH_SIZE'] = int(os.getenv('WEBHOOK_BATCH_SIZE', 100))
+app.config['WEBHOOK_BATCH_DELAY_SECONDS'] = float(os.getenv('WEBHOOK_BATCH_DELAY_SECONDS', 2))
+app.config['WEBHOOK_POLL_SECONDS'] = float(os.getenv('WEBHOOK_POLL_SECONDS', 60))
+app.config['WEBHOOK_TIMEOUT_SECONDS'] = float(os.getenv('WEBHOOK_TIMEOUT_SECONDS', 10))
+app.config['WEBHOOK_MAX_BATCHES_PER_RUN'] = int(os.getenv('WEBHOOK_MAX_BATCHES_PER_RUN', 10))
+app.config['WEBHOOK_MAX_BACKOFF_SECONDS'] = int(os.getenv('WEBHOOK_MAX_BACKOFF_SECONDS', 3600))
+# Aufbewahrung: Episoden, die älter als RETENTION_MONTHS sind und von niemandem favorisiert wurden, wandern in die
+# Tabelle ArchivedEpisode (0 = aus). Archiviert wird nur über 'flask archive-episodes' (z. B. per Cron), nicht beim
+# Aktualisieren der Feeds; pro Lauf höchstens RETENTION_MAX_PER_RUN Episoden (0 = unbegrenzt)
+app.config['RETENTION_MONTHS'] = int(os.getenv('RETENTION_MONTHS', 0))
+app.config['RETENTION_BATCH_SIZE'] = int(os.getenv('RETENTION_BATCH_SIZE', 1000))
+app.config['RETENTION_MAX_PER_RUN'] = int(os.getenv('RETENTION_MAX_PER_RUN', 20000))
+# Analyse-Snapshots von PodcastFeed und Episode ('flask snapshot', /admin/snapshots): Parquet mit pyarrow, sonst gzip-CSV.
+# Gelesen wird über die Lese-Engine in Batches von SNAPSHOT_BATCH_SIZE Zeilen
+app.config['SNAPSHOT_DIR'] = os.getenv('SNAPSHOT_DIR', os.path.join(basedir, 'instance', 'snapshots'))
+app.config['SNAPSHOT_BATCH_SIZE'] = int(os.getenv('SNAPSHOT_BATCH_SIZE', 10000))
+
+# Bind-Schlüssel der Lese-Engine (siehe read_session)
+READ_BIND = 'read'
+
+def pool_engine_options(url, pool_size, statement_timeout_ms):
+    """
+    Engine-Optionen (Pool, Pre-Ping, Statement-Timeout) für eine Datenbank-URL. Für SQLite leer.
+    """
+    backend = make_url(url).get_backend_name()
+    if backend == 'sqlite':
+        return {}
+    options = {
+        'pool_pre_ping': True, # Nach Failover oder Idle-Timeout getrennte Verbindungen vor der Nutzung erkennen
+        'pool_size': pool_size,
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        'pool_recycle': app.config['DB_POOL_RECYCLE'],
+        'pool_use_lifo': True # Wenige Verbindungen warm halten, überzählige können serverseitig auslaufen
+    }
+    if backend == 'postgresql' and statement_timeout_ms:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_engine_options(
+    app.config['SQLALCHEMY_DATABASE_URI'], app.config['DB_POOL_SIZE'], app.config['DB_STATEMENT_TIMEOUT_MS'])
+_read_url = app.config['DATABASE_READ_URL'] or (
+    app.config['SQLALCHEMY_DATABASE_URI'] if make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'sqlite' else '')
+if _read_url:
+    app.config['SQLALCHEMY_BINDS'] = {READ_BIND: dict(url=_read_url, **pool_engine_options(
+        _read_url, app.config['DB_READ_POOL_SIZE'], app.config['DB_READ_STATEMENT_TIMEOUT_MS']))}
 
 
 db = SQLAlchemy(app)
 CORS(app) # Ermöglicht Cross-Origin Requests
 
+def read_session():
+    """
+    Session für lesende Listen- und Suchendpunkte über die Lese-Engine (eigener Pool, ggf. Replikat).
+    Ohne Lese-Engine die normale Session. Schreibzugriffe laufen immer über db.session (primäre Datenbank).
+    """
+    if READ_BIND not in db.engines:
+        return db.session
+    if 'read_session' not in g:
+        g.read_session = Session(db.engines[READ_BIND])
+    return g.read_session
+
+@app.teardown_appcontext
+def close_read_session(exception=None):
+    session = g.pop('read_session', None)
+    if session is not None:
+        session.close()
+
+# Anzahl der Requests, die keine Verbindung aus dem Pool erhalten haben (siehe /api/db-pool)
+POOL_TIMEOUTS = Counter()
+
+@app.errorhandler(PoolTimeoutError)
+def pool_exhausted(e):
+    # Pool erschöpft: schnell mit 503 antworten statt den Worker-Thread weiter zu blockieren
+    POOL_TIMEOUTS['total'] += 1
+    print(f"Verbindungspool erschöpft: {e}")
+    response = jsonify({"error": "Datenbank ausgelastet, bitte erneut versuchen."})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+# SQLite erzwingt Fremdschlüssel (und damit ON DELETE CASCADE) nur, wenn es pro Verbindung aktiviert wird
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if app.config['SQLITE_TUNED']:
+            # WAL: Leser blockieren nie hinter einem Schreiber (z.B. einem Feed-Refresh)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={app.config['SQLITE_BUSY_TIMEOUT_MS']}")
+            cursor.execute(f"PRAGMA mmap_size={app.config['SQLITE_MMAP_SIZE']}")
+            # Negativer Wert = Größe in KiB statt in Seiten
+            cursor.execute(f"PRAGMA cache_size=-{app.config['SQLITE_CACHE_SIZE_KB']}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# Der Schreib-Thread (IngestWriter) bündelt Jobs in SAVEPOINTs. pysqlite beginnt Transaktionen selbst erst vor DML
+# und committet vor anderen Anweisungen, womit SAVEPOINTs wirkungslos wären. Für seine Transaktionen übernimmt daher
+# SQLAlchemy die Steuerung (dokumentierter Workaround für pysqlite) und reserviert die Schreibsperre sofort.
+# Alle übrigen Verbindungen bleiben im Standardmodus: Lesende Anweisungen halten keinen Snapshot, sodass ein späteres
+# Schreiben im Request per busy_timeout auf den Schreib-Thread wartet, statt sofort mit "database is locked" zu scheitern.
+def _sqlite_writer_transaction(connection):
+    return connection.dialect.name == 'sqlite' and connection.get_execution_options().get('sqlite_begin_immediate')
+
+@event.listens_for(Engine, "begin")
+def begin_sqlite_transaction(connection):
+    if _sqlite_writer_transaction(connection):
+        connection.connection.dbapi_connection.isolation_level = None
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def end_sqlite_transaction(connection):
+    if _sqlite_writer_transaction(connection):
+        # Zurück in den Standardmodus; die offene Transaktion beendet das folgende commit()/rollback() des Treibers
+        connection.connection.dbapi_connection.isolation_level = ''
+
 # Flask-Login initialisieren
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -46,58 +267,1509 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
+class ApiToken(db.Model):
+    """
+    API-Token für die zustandslose JSON-API unter /api/v2. Gespeichert wird nur der SHA-256-Hash.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    name = db.Column(db.String(80))
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<ApiToken {self.name}>'
+
+def hash_api_token(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
 @login_manager.user_loader
 def load_user(user_id):
     # Lade den Benutzer anhand der ID aus der Datenbank
     return User.query.get(int(user_id))
 
+@login_manager.request_loader
+def load_user_from_request(req):
+    # Token-Authentifizierung per 'Authorization: Bearer <token>' (ohne Session)
+    auth_header = req.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return None
+    api_token = ApiToken.query.filter_by(token_hash=hash_api_token(auth_header[7:].strip())).first()
+    return db.session.get(User, api_token.user_id) if api_token else None
+
+@login_manager.unauthorized_handler
+def unauthorized():
+    if request.blueprint == 'api_v2':
+        return jsonify({"error": "Authentifizierung erforderlich."}), 401
+    return redirect(url_for(login_manager.login_view, next=request.url))
+
+def is_admin(user):
+    return user.is_authenticated and user.username in app.config['ADMIN_USERS']
+
+def admin_required(view):
+    """
+    Wie login_required, zusätzlich nur für Benutzer aus ADMIN_USERS (sonst 403).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin(current_user):
+            return jsonify({"error": "Nur für Administratoren."}), 403
+        return view(*args, **kwargs)
+    return login_required(wrapper)
+
+class ApiAwareSessionInterface(SecureCookieSessionInterface):
+    """
+    Cookie-Session, die für /api/v2 nie gespeichert wird: kein Set-Cookie, keine Serialisierung.
+    Eine bestehende Login-Session wird dort nur gelesen; flash()-Meldungen der gemeinsamen Views verfallen.
+    """
+
+    def save_session(self, app, session, response):
+        if request.blueprint == 'api_v2':
+            return
+        return super().save_session(app, session, response)
+
+app.session_interface = ApiAwareSessionInterface()
+
 # Erstelle einen Standardbenutzer, falls keiner existiert (NUR FÜR ENTWICKLUNG/TESTZWECKE)
-@app.before_request
-def create_default_user():
-    with app.app_context():
-        if User.query.filter_by(username='user1').first() is None:
-            user = User(username='user1')
-            # Hier wird DEIN zuvor definierter, gehashter Passwortwert zugewiesen
-            # Dieser Hash stammt von "SpeilPW"
-            user.password_hash = """scrypt:32768:8:1$anilOJC7MTH87cwT$624d07e2737d25657bff2e6d516bd38cdee48729cd9421b22b8f6a30f3e49a3627e3a334718f84216a6698bf0c55a21043f63fe4c73c9007ae212d6d657929d3""" 
-            db.session.add(user)
+def ensure_default_user():
+    if User.query.filter_by(username='user1').first() is None:
+        user = User(username='user1')
+        # Hier wird DEIN zuvor definierter, gehashter Passwortwert zugewiesen
+        # Dieser Hash stammt von "SpeilPW"
+        user.password_hash = """scrypt:32768:8:1$anilOJC7MTH87cwT$624d07e2737d25657bff2e6d516bd38cdee48729cd9421b22b8f6a30f3e49a3627e3a334718f84216a6698bf0c55a21043f63fe4c73c9007ae212d6d657929d3""" 
+        db.session.add(user)
+        db.session.commit()
+        print("Default user 'user1' created with predefined hash.")
+
+# Im startoptimierten Modus übernimmt 'flask init-db' das Anlegen; sonst wie bisher vor jedem Request prüfen
+if not app.config['FAST_STARTUP']:
+    @app.before_request
+    def create_default_user():
+        with app.app_context():
+            ensure_default_user()
+
+
+# Datenbankmodelle
+class PodcastFeed(db.Model):
+    # canonical_url: normalisierte URL (siehe canonicalize_feed_url), eindeutig; NULL nur bei noch nicht
+    # zusammengeführten Altbeständen. content_fingerprint: siehe feed_content_fingerprint
+    __table_args__ = (db.Index('ix_podcast_feed_canonical_url', 'canonical_url', unique=True),
+                      db.Index('ix_podcast_feed_content_fingerprint', 'content_fingerprint'))
+
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    canonical_url = db.Column(db.String(500))
+    content_fingerprint = db.Column(db.String(64))
+    name = db.Column(db.String(255), nullable=False)
+    topic = db.Column(db.String(255))
+    is_active = db.Column(db.Boolean, default=True)
+    last_checked = db.Column(db.DateTime, default=datetime.now)
+    homepage_url = db.Column(db.String(500)) # Neues Feld für Homepage URL
+    itunes_available = db.Column(db.Boolean, default=None) # iTunes Verfügbarkeit
+    youtube_available = db.Column(db.Boolean, default=None) # YouTube Verfügbarkeit
+    availability_checked = db.Column(db.DateTime, default=None) # Wann zuletzt geprüft
+    itunes_collection_id = db.Column(db.Integer) # Apple-Podcasts-ID, ermittelt beim ersten Auflösen der Episodenlinks
+    episode_links_checked = db.Column(db.DateTime) # Letzter iTunes-Lookup der Episodenlinks
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now) # Für inkrementelle Snapshots
+    last_full_parse = db.Column(db.DateTime, default=None) # Letzter vollständiger (nicht inkrementeller) Parse
+
+    # passive_deletes: Episoden nicht einzeln in die Session laden, gelöscht werden sie per Bulk-DELETE (siehe delete_feeds)
+    episodes = db.relationship('Episode', backref='feed', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+
+    def __repr__(self):
+        return f'<PodcastFeed {self.name}>'
+
+class Episode(db.Model):
+    # Für die neueste Episode eines Feeds (Grenze beim inkrementellen Parsen)
+    __table_args__ = (db.Index('ix_episode_feed_id_pub_date', 'feed_id', 'pub_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), nullable=False, index=True)
+    title = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.Text)
+    pub_date = db.Column(db.DateTime, nullable=False)
+    url = db.Column(db.String(500))
+    is_favorite = db.Column(db.Boolean, default=False)
+    host = db.Column(db.String(255))
+    itunes_url = db.Column(db.String(500)) # Direkter Apple-Podcasts-Link (siehe resolve_episode_links)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True) # Für inkrementelle Snapshots
+    restored_at = db.Column(db.DateTime) # Aus dem Archiv zurückgeholt: wird nicht erneut archiviert
+
+    def __repr__(self):
+        return f'<Episode {self.title}>'
+
+class Subscription(db.Model):
+    """
+    Abonnement eines Benutzers auf einen (gemeinsam abgerufenen und gespeicherten) Feed.
+    PodcastFeed.is_active ist aktiv, solange mindestens ein Abonnement aktiv ist (siehe sync_feed_active).
+    """
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), primary_key=True, index=True)
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<Subscription {self.user_id}:{self.feed_id}>'
+
+class UserEpisodeState(db.Model):
+    """
+    Benutzerspezifischer Stand einer Episode (Favorit, bearbeiteter Host). None übernimmt den gemeinsamen Wert
+    aus Episode; wirksam ist jeweils coalesce(UserEpisodeState.<feld>, Episode.<feld>).
+    """
+    # Für die Favoriten eines Benutzers (Statistiken)
+    __table_args__ = (db.Index('ix_user_episode_state_user_favorite', 'user_id', 'is_favorite'),)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    episode_id = db.Column(db.Integer, db.ForeignKey('episode.id', ondelete='CASCADE'), primary_key=True, index=True)
+    is_favorite = db.Column(db.Boolean)
+    host = db.Column(db.String(255))
+
+    def __repr__(self):
+        return f'<UserEpisodeState {self.user_id}:{self.episode_id}>'
+
+class ArchivedEpisode(db.Model):
+    """
+    Archivierte (alte, nicht favorisierte) Episode. Hält die Tabelle Episode klein;
+    abrufbar über /episodes/archive, zurückholbar über /episodes/archive/<id>/restore.
+    """
+    __table_args__ = (db.Index('ix_archived_episode_feed_id_pub_date', 'feed_id', 'pub_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    episode_id = db.Column(db.Integer, nullable=False) # Ursprüngliche ID (SQLite kann IDs später neu vergeben)
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), nullable=False)
+    title = db.Column(db.String(500), nullable=False)
+    description_compressed = db.Column(db.LargeBinary) # zlib-komprimiertes HTML
+    pub_date = db.Column(db.DateTime, nullable=False)
+    url = db.Column(db.String(500))
+    host = db.Column(db.String(255))
+    archived_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f'<ArchivedEpisode {self.title}>'
+
+class FeedArchiveEntry(db.Model):
+    """
+    Verweis auf einen archivierten Feed-Inhalt (Datei <FEED_ARCHIVE_DIR>/<hash[:2]>/<hash>.xml.gz).
+    Pro Feed-URL wird nur bei geändertem Inhalt ein neuer Eintrag angelegt.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    feed_url = db.Column(db.String(500), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f'<FeedArchiveEntry {self.feed_url} {self.content_hash[:12]}>'
+
+class WebSubSubscription(db.Model):
+    """
+    WebSub-Abonnement eines Feeds bei seinem Hub. Feeds mit aktivem Abonnement werden nicht mehr gepollt.
+    state: 'pending' (Verifizierung ausstehend), 'active', 'denied' oder 'failed'
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), unique=True, nullable=False)
+    hub_url = db.Column(db.String(500), nullable=False)
+    topic_url = db.Column(db.String(500), nullable=False)
+    secret = db.Column(db.String(64), nullable=False)
+    state = db.Column(db.String(20), nullable=False, default='pending')
+    lease_expires_at = db.Column(db.DateTime)
+    last_push_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<WebSubSubscription {self.feed_id} {self.state}>'
+
+class FeedStats(db.Model):
+    """
+    Vorberechnete Kennzahlen pro Feed. Wird beim Ingest und bei Änderungen an Episoden fortgeschrieben,
+    damit Listen und Statistiken nie über die gesamte Episode-Tabelle aggregieren müssen.
+    """
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), primary_key=True)
+    episode_count = db.Column(db.Integer, nullable=False, default=0)
+    favorite_count = db.Column(db.Integer, nullable=False, default=0)
+    latest_pub_date = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<FeedStats {self.feed_id}: {self.episode_count}>'
+
+class EpisodePublishBucket(db.Model):
+    """
+    Anzahl veröffentlichter Episoden pro Feed und Woche (Montag) bzw. Monat (Monatserster).
+    """
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'), primary_key=True)
+    granularity = db.Column(db.String(10), primary_key=True) # 'week' oder 'month'
+    bucket_start = db.Column(db.Date, primary_key=True)
+    episode_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<EpisodePublishBucket {self.feed_id} {self.granularity} {self.bucket_start}>'
+
+class SavedSearch(db.Model):
+    """
+    Gespeicherte Suche (Smart List) eines Benutzers. Die Treffer stehen in SavedSearchEpisode und werden beim
+    Ingest und bei Änderungen an Episoden nur für die betroffenen Episoden neu bewertet.
+    Leere Kriterien (None) filtern nicht. Das Zeitfenster (max_age_days) ist relativ und wird beim Abruf angewendet.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+    name = db.Column(db.String(255), nullable=False)
+    topic = db.Column(db.String(255))
+    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id', ondelete='CASCADE'))
+    search_term = db.Column(db.String(255)) # Teilstring in Titel, Podcast-Name oder Host (ohne Groß-/Kleinschreibung)
+    is_favorite = db.Column(db.Boolean) # True/False filtert, None = alle
+    max_age_days = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<SavedSearch {self.name}>'
+
+class SavedSearchEpisode(db.Model):
+    """
+    Treffer einer gespeicherten Suche mit Gelesen-Status.
+    """
+    # Für die Anzahl ungelesener Treffer pro Suche
+    __table_args__ = (db.Index('ix_saved_search_episode_unread', 'saved_search_id', 'is_read'),)
+
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_search.id', ondelete='CASCADE'), primary_key=True)
+    episode_id = db.Column(db.Integer, db.ForeignKey('episode.id', ondelete='CASCADE'), primary_key=True, index=True)
+    matched_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+    is_read = db.Column(db.Boolean, default=False, nullable=False)
+
+    def __repr__(self):
+        return f'<SavedSearchEpisode {self.saved_search_id}:{self.episode_id}>'
+
+class EpisodeEvent(db.Model):
+    """
+    Outbox für Webhooks: kompaktes Ereignis 'added', 'changed' oder 'removed' zu einer Episode bzw. 'feed_removed'.
+    Die fortlaufende ID dient den Endpunkten als Cursor (die neueste Zeile wird deshalb nie gelöscht, siehe
+    prune_delivered_events). Wird nur geschrieben, solange aktive Webhooks existieren.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(20), nullable=False)
+    feed_id = db.Column(db.Integer, nullable=False)
+    episode_id = db.Column(db.Integer)
+    payload = db.Column(db.Text, nullable=False) # JSON
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f'<EpisodeEvent {self.id} {self.event_type}>'
+
+class WebhookEndpoint(db.Model):
+    """
+    Webhook-Empfänger mit eigenem Cursor (letzte bestätigte Ereignis-ID) und Backoff-Zustand.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    secret = db.Column(db.String(128), nullable=False) # HMAC-SHA256-Schlüssel für X-PodTracker-Signature
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    last_event_id = db.Column(db.Integer, default=0, nullable=False)
+    failure_count = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String(500))
+    last_delivered_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<WebhookEndpoint {self.url}>'
+
+class EpisodeDescription(db.Model):
+    """
+    Ausgelagerte Episodenbeschreibung (DESCRIPTION_STORAGE='compressed').
+    Listen-Abfragen auf Episode lesen diese Tabelle nie; sie wird nur für einzelne Episoden geladen.
+    """
+    episode_id = db.Column(db.Integer, db.ForeignKey('episode.id', ondelete='CASCADE'), primary_key=True)
+    html_compressed = db.Column(db.LargeBinary) # zlib-komprimiertes Original-HTML aus dem Feed
+    plain_text = db.Column(db.Text) # HTML-freier Text, z.B. für Vorschauen und Suche
+
+    def __repr__(self):
+        return f'<EpisodeDescription {self.episode_id}>'
+
+# Hilfsfunktionen für komprimierte Episodenbeschreibungen
+def strip_html(html_text):
+    """
+    Entfernt HTML-Tags und Entities und normalisiert Leerraum.
+    """
+    if not html_text:
+        return ''
+    text = re.sub(r'<[^>]+>', ' ', html_text)
+    return re.sub(r'\s+', ' ', html.unescape(text)).strip()
+
+def build_episode_description(episode_id, html_text):
+    return EpisodeDescription(
+        episode_id=episode_id,
+        html_compressed=zlib.compress(html_text.encode('utf-8'), 9),
+        plain_text=strip_html(html_text)
+    )
+
+def set_episode_description(episode_id, html_text):
+    """
+    Schreibt die Beschreibung einer Episode je nach DESCRIPTION_STORAGE inline oder komprimiert (ohne Commit).
+    """
+    if app.config['DESCRIPTION_STORAGE'] == 'compressed':
+        db.session.merge(build_episode_description(episode_id, html_text or ''))
+    else:
+        Episode.query.filter_by(id=episode_id).update({Episode.description: html_text}, synchronize_session=False)
+
+def add_episodes(feed_id, episodes_data):
+    """
+    Legt geparste Episoden für einen Feed an (ohne Commit) und gibt deren Anzahl zurück.
+    """
+    compressed = app.config['DESCRIPTION_STORAGE'] == 'compressed'
+    episodes = []
+    descriptions = []
+    for ep_data in episodes_data:
+        ep_data['feed_id'] = feed_id
+        ep_data.setdefault('is_favorite', False)
+        if compressed:
+            descriptions.append(ep_data.pop('description', None))
+        episodes.append(Episode(**ep_data))
+    db.session.add_all(episodes)
+    update_feed_stats(feed_id, [(episode.pub_date, episode.is_favorite) for episode in episodes])
+
+    if saved_searches_exist():
+        # IDs werden für die Zuordnung zu gespeicherten Suchen benötigt
+        db.session.flush()
+        evaluate_saved_searches([episode.id for episode in episodes])
+
+    if webhooks_active():
+        db.session.flush()
+        record_ingest_events(feed_id, episodes)
+
+    if compressed:
+        # IDs werden für die Fremdschlüssel der Beschreibungen benötigt
+        db.session.flush()
+        db.session.add_all([
+            build_episode_description(episode.id, description)
+            for episode, description in zip(episodes, descriptions) if description
+        ])
+    return len(episodes)
+
+# Vorberechnete Statistiken (FeedStats, EpisodePublishBucket)
+STATS_GRANULARITIES = ('week', 'month')
+
+def publish_bucket_start(pub_date, granularity):
+    day = pub_date.date()
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def update_feed_stats(feed_id, episodes, sign=1):
+    """
+    Schreibt die Statistiken eines Feeds fort (ohne Commit). episodes: Liste von (pub_date, is_favorite);
+    sign=-1 nimmt die Episoden wieder heraus (Löschen oder alter Stand vor einer Änderung).
+    """
+    if not episodes:
+        return
+    stats = db.session.get(FeedStats, feed_id)
+    if stats is None:
+        stats = FeedStats(feed_id=feed_id, episode_count=0, favorite_count=0)
+        db.session.add(stats)
+    stats.episode_count += sign * len(episodes)
+    stats.favorite_count += sign * sum(1 for _, is_favorite in episodes if is_favorite)
+    # Die Datenbank speichert pub_date ohne Zeitzone; frisch geparste Werte vergleichbar machen
+    pub_dates = [pub_date.replace(tzinfo=None) for pub_date, _ in episodes if pub_date is not None]
+    if sign > 0 and pub_dates:
+        stats.latest_pub_date = max([stats.latest_pub_date or pub_dates[0]] + pub_dates)
+
+    counts = Counter((granularity, publish_bucket_start(pub_date, granularity))
+                     for pub_date in pub_dates for granularity in STATS_GRANULARITIES)
+    buckets = {(bucket.granularity, bucket.bucket_start): bucket
+               for bucket in EpisodePublishBucket.query.filter_by(feed_id=feed_id)}
+    for (granularity, bucket_start), count in counts.items():
+        bucket = buckets.get((granularity, bucket_start))
+        if bucket is None:
+            if sign > 0:
+                db.session.add(EpisodePublishBucket(feed_id=feed_id, granularity=granularity,
+                                                    bucket_start=bucket_start, episode_count=count))
+            continue
+        bucket.episode_count += sign * count
+        if bucket.episode_count <= 0:
+            db.session.delete(bucket)
+
+def refresh_feed_stats(feed_ids):
+    """
+    Berechnet die Statistiken der angegebenen Feeds aus ihren Episoden neu (ohne Commit).
+    Für Massenänderungen, bei denen die alten Werte nicht geladen werden.
+    """
+    feed_ids = list(feed_ids)
+    if not feed_ids:
+        return
+    reset_feed_stats(feed_ids)
+    for feed_id in feed_ids:
+        episodes = db.session.query(Episode.pub_date, Episode.is_favorite).filter_by(feed_id=feed_id).all()
+        update_feed_stats(feed_id, [tuple(row) for row in episodes] + archived_episode_stats(feed_id))
+
+def archived_episode_stats(feed_id):
+    # Archivierte Episoden zählen weiterhin zu Statistiken und Histogrammen (nie Favoriten)
+    return [(pub_date, False) for (pub_date,) in db.session.query(ArchivedEpisode.pub_date).filter_by(feed_id=feed_id)]
+
+def reset_feed_stats(feed_ids):
+    EpisodePublishBucket.query.filter(EpisodePublishBucket.feed_id.in_(feed_ids)).delete()
+    FeedStats.query.filter(FeedStats.feed_id.in_(feed_ids)).delete()
+
+# Gespeicherte Suchen (SavedSearch, SavedSearchEpisode)
+SAVED_SEARCH_EVALUATION_CHUNK = 500
+# Episodenfelder, deren Änderung eine Neubewertung der gespeicherten Suchen erfordert
+SAVED_SEARCH_EPISODE_FIELDS = ('title', 'host', 'is_favorite')
+
+def saved_searches_exist():
+    return db.session.query(SavedSearch.id).first() is not None
+
+def saved_search_matches(search, title, host, is_favorite, feed_id, feed_name, feed_topic):
+    if search.feed_id is not None and feed_id != search.feed_id:
+        return False
+    if search.topic and feed_topic != search.topic:
+        return False
+    if search.is_favorite is not None and bool(is_favorite) != search.is_favorite:
+        return False
+    if search.search_term:
+        term = search.search_term.lower()
+        if not any(term in (value or '').lower() for value in (title, feed_name, host)):
+            return False
+    return True
+
+def evaluate_saved_searches(episode_ids, searches=None):
+    """
+    Bewertet nur die angegebenen Episoden gegen alle (bzw. die übergebenen) gespeicherten Suchen und gleicht
+    die Trefferliste ab: neue Treffer anlegen, nicht mehr passende entfernen (ohne Commit).
+    Berücksichtigt werden nur abonnierte Feeds und der benutzerspezifische Stand (Favorit, Host) des Suchenden.
+    """
+    episode_ids = list(episode_ids)
+    searches = SavedSearch.query.all() if searches is None else searches
+    if not episode_ids or not searches:
+        return
+    search_ids = [search.id for search in searches]
+    user_ids = {search.user_id for search in searches}
+    subscribed = set(db.session.query(Subscription.user_id, Subscription.feed_id).filter(Subscription.user_id.in_(user_ids)))
+    for start in range(0, len(episode_ids), SAVED_SEARCH_EVALUATION_CHUNK):
+        chunk = episode_ids[start:start + SAVED_SEARCH_EVALUATION_CHUNK]
+        rows = db.session.query(
+            Episode.id, Episode.title, Episode.host, Episode.is_favorite, Episode.feed_id,
+            db.func.coalesce(PodcastFeed.name, PodcastFeed.url), PodcastFeed.topic
+        ).join(PodcastFeed, PodcastFeed.id == Episode.feed_id).filter(Episode.id.in_(chunk)).all()
+        states = {(user_id, episode_id): (is_favorite, host) for user_id, episode_id, is_favorite, host in db.session.query(
+            UserEpisodeState.user_id, UserEpisodeState.episode_id, UserEpisodeState.is_favorite, UserEpisodeState.host
+        ).filter(UserEpisodeState.user_id.in_(user_ids), UserEpisodeState.episode_id.in_(chunk))}
+        matches = set()
+        for episode_id, title, host, is_favorite, feed_id, feed_name, feed_topic in rows:
+            for search in searches:
+                if (search.user_id, feed_id) not in subscribed:
+                    continue
+                user_favorite, user_host = states.get((search.user_id, episode_id), (None, None))
+                if saved_search_matches(search, title, host if user_host is None else user_host,
+                                        is_favorite if user_favorite is None else user_favorite, feed_id, feed_name, feed_topic):
+                    matches.add((search.id, episode_id))
+        existing = set(db.session.query(SavedSearchEpisode.saved_search_id, SavedSearchEpisode.episode_id).filter(
+            SavedSearchEpisode.episode_id.in_(chunk), SavedSearchEpisode.saved_search_id.in_(search_ids)))
+
+        for search_id, episode_id in existing - matches:
+            SavedSearchEpisode.query.filter_by(saved_search_id=search_id, episode_id=episode_id).delete()
+        if matches - existing:
+            matched_at = datetime.now()
+            db.session.execute(db.insert(SavedSearchEpisode), [
+                {'saved_search_id': search_id, 'episode_id': episode_id, 'matched_at': matched_at, 'is_read': False}
+                for search_id, episode_id in matches - existing
+            ])
+
+def rebuild_saved_search(search):
+    """
+    Gleicht die Treffer einer neuen oder geänderten Suche ab. Die SQL-Vorauswahl nutzt Abonnements sowie Feed-
+    und Themen-Kriterium; nur diese Kandidaten (plus bisherige Treffer) werden bewertet.
+    """
+    candidates = db.session.query(Episode.id).join(PodcastFeed, PodcastFeed.id == Episode.feed_id) \
+        .join(Subscription, db.and_(Subscription.feed_id == Episode.feed_id, Subscription.user_id == search.user_id))
+    if search.feed_id is not None:
+        candidates = candidates.filter(Episode.feed_id == search.feed_id)
+    if search.topic:
+        candidates = candidates.filter(PodcastFeed.topic == search.topic)
+    episode_ids = {episode_id for (episode_id,) in candidates}
+    episode_ids.update(episode_id for (episode_id,) in db.session.query(SavedSearchEpisode.episode_id).filter_by(saved_search_id=search.id))
+    evaluate_saved_searches(sorted(episode_ids), [search])
+
+# Webhooks (Outbox EpisodeEvent, WebhookEndpoint)
+# Spalten, aus denen das Ereignis-Payload einer Episode besteht
+EPISODE_EVENT_FIELDS = ('title', 'pub_date', 'url', 'host', 'is_favorite')
+
+def webhooks_active():
+    return db.session.query(WebhookEndpoint.id).filter_by(is_active=True).first() is not None
+
+def episode_event_payload(episode_id, feed_id, values):
+    payload = {'id': episode_id, 'feed_id': feed_id, 'key': episode_key(values.get('url'), values.get('title'))}
+    payload.update(values)
+    return payload
+
+def add_episode_events(events):
+    """
+    Schreibt Ereignisse [(event_type, feed_id, episode_id, payload)] in die Outbox (ohne Commit).
+    """
+    if not events:
+        return
+    created_at = datetime.now()
+    db.session.execute(db.insert(EpisodeEvent), [
+        {'event_type': event_type, 'feed_id': feed_id, 'episode_id': episode_id,
+         'payload': json_dumps(payload).decode('utf-8'), 'created_at': created_at}
+        for event_type, feed_id, episode_id, payload in events
+    ])
+    webhook_worker.wake()
+
+def record_ingest_events(feed_id, episodes):
+    """
+    'added'-Ereignisse für neu angelegte Episoden. Die Episoden müssen geflusht sein.
+    """
+    events = []
+    for episode in episodes:
+        values = {field: getattr(episode, field) for field in EPISODE_EVENT_FIELDS}
+        if values['pub_date'] is not None:
+            # Wie in der Datenbank ohne Zeitzone
+            values['pub_date'] = values['pub_date'].replace(tzinfo=None)
+        events.append(('added', feed_id, episode.id, episode_event_payload(episode.id, feed_id, values)))
+    add_episode_events(events)
+
+def record_episode_changes(episode_ids):
+    """
+    'changed'-Ereignisse mit dem aktuellen Stand der angegebenen Episoden (z.B. nach Bearbeitung), ohne Commit.
+    """
+    episode_ids = list(episode_ids)
+    columns = [getattr(Episode, field) for field in EPISODE_EVENT_FIELDS]
+    events = []
+    for start in range(0, len(episode_ids), SAVED_SEARCH_EVALUATION_CHUNK):
+        chunk = episode_ids[start:start + SAVED_SEARCH_EVALUATION_CHUNK]
+        for episode_id, feed_id, *values in db.session.query(Episode.id, Episode.feed_id, *columns).filter(Episode.id.in_(chunk)):
+            events.append(('changed', feed_id, episode_id, episode_event_payload(episode_id, feed_id, dict(zip(EPISODE_EVENT_FIELDS, values)))))
+    add_episode_events(events)
+
+def webhook_signature(secret, timestamp, body):
+    """
+    HMAC-SHA256 über '<timestamp>.<body>' (Zeitstempel gegen Replays, siehe scripts/webhook_receiver.py).
+    """
+    return hmac.new(secret.encode('utf-8'), f'{timestamp}.'.encode('utf-8') + body, hashlib.sha256).hexdigest()
+
+def send_webhook_batch(url, secret, body):
+    """
+    Stellt einen Batch zu. Gibt (ok, Fehlertext, Retry-After in Sekunden oder None) zurück.
+    """
+    import requests
+    timestamp = str(int(time.time()))
+    headers = {
+        'Content-Type': 'application/json',
+        'X-PodTracker-Timestamp': timestamp,
+        'X-PodTracker-Signature': f'sha256={webhook_signature(secret, timestamp, body)}'
+    }
+    try:
+        response = requests.post(url, data=body, headers=headers, timeout=app.config['WEBHOOK_TIMEOUT_SECONDS'])
+    except requests.exceptions.RequestException as e:
+        return False, str(e), None
+    if 200 <= response.status_code < 300:
+        return True, None, None
+    retry_after = response.headers.get('Retry-After')
+    return False, f"Status {response.status_code}", int(retry_after) if retry_after and retry_after.isdigit() else None
+
+def deliver_webhooks(max_batches_per_endpoint=None):
+    """
+    Stellt ausstehende Ereignisse an alle fälligen Endpunkte zu, parallel über die Endpunkte und je Endpunkt
+    in Batches von WEBHOOK_BATCH_SIZE. Ein Endpunkt rückt seinen Cursor nur nach einer 2xx-Antwort vor; bei Fehlern
+    (oder 429/Retry-After) pausiert er mit exponentiellem Backoff, ohne die anderen Endpunkte aufzuhalten.
+    Löscht anschließend von allen aktiven Endpunkten bestätigte Ereignisse. Gibt eine Zusammenfassung zurück.
+    """
+    max_batches_per_endpoint = max_batches_per_endpoint or app.config['WEBHOOK_MAX_BATCHES_PER_RUN']
+    summary = {'endpoints': 0, 'batches': 0, 'events': 0, 'failures': 0}
+    now = datetime.now()
+    endpoints = WebhookEndpoint.query.filter(WebhookEndpoint.is_active == True, db.or_(
+        WebhookEndpoint.next_attempt_at.is_(None), WebhookEndpoint.next_attempt_at <= now)).all()
+    summary['endpoints'] = len(endpoints)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(endpoints))) as executor:
+        for _ in range(max_batches_per_endpoint):
+            # Je Runde ein Batch pro Endpunkt mit ausstehenden Ereignissen
+            batches = {}
+            for endpoint in endpoints:
+                events = EpisodeEvent.query.filter(EpisodeEvent.id > endpoint.last_event_id) \
+                    .order_by(EpisodeEvent.id).limit(app.config['WEBHOOK_BATCH_SIZE']).all()
+                if events:
+                    batches[endpoint] = events
+            if not batches:
+                break
+            futures = {}
+            for endpoint, events in batches.items():
+                body = json_dumps({
+                    'endpoint_id': endpoint.id,
+                    'cursor': events[-1].id,
+                    'events': [{'id': event.id, 'type': event.event_type, 'feed_id': event.feed_id,
+                                'episode_id': event.episode_id, 'created_at': event.created_at,
+                                'data': json.loads(event.payload)} for event in events]
+                })
+                futures[executor.submit(send_webhook_batch, endpoint.url, endpoint.secret, body)] = endpoint
+            for future in as_completed(futures):
+                endpoint = futures[future]
+                ok, error, retry_after = future.result()
+                if ok:
+                    endpoint.last_event_id = batches[endpoint][-1].id
+                    endpoint.failure_count = 0
+                    endpoint.next_attempt_at = None
+                    endpoint.last_error = None
+                    endpoint.last_delivered_at = datetime.now()
+                    summary['batches'] += 1
+                    summary['events'] += len(batches[endpoint])
+                else:
+                    endpoint.failure_count += 1
+                    backoff = min(app.config['WEBHOOK_MAX_BACKOFF_SECONDS'], 5 * 2 ** (endpoint.failure_count - 1))
+                    endpoint.next_attempt_at = datetime.now() + timedelta(seconds=max(backoff, retry_after or 0))
+                    endpoint.last_error = (error or '')[:500]
+                    summary['failures'] += 1
+                    print(f"Webhook-Zustellung an {endpoint.url} fehlgeschlagen ({error}), nächster Versuch {endpoint.next_attempt_at:%H:%M:%S}")
+            db.session.commit()
+            endpoints = [endpoint for endpoint in endpoints if endpoint.next_attempt_at is None]
+
+    prune_delivered_events()
+    return summary
+
+def prune_delivered_events():
+    # Von allen aktiven Endpunkten bestätigte Ereignisse (ohne aktive Endpunkte: alle) aus der Outbox löschen.
+    # Das neueste Ereignis bleibt immer stehen: SQLite vergibt IDs ohne AUTOINCREMENT als max(rowid) + 1, nach einer
+    # leeren Outbox begännen sie wieder bei 1 und lägen unter den Cursorn (last_event_id) der Endpunkte.
+    newest = db.session.query(db.func.max(EpisodeEvent.id)).scalar()
+    if newest is None:
+        return
+    acknowledged = db.session.query(db.func.min(WebhookEndpoint.last_event_id)).filter_by(is_active=True).scalar()
+    query = EpisodeEvent.query.filter(EpisodeEvent.id < newest)
+    if acknowledged is not None:
+        query = query.filter(EpisodeEvent.id <= acknowledged)
+    query.delete(synchronize_session=False)
+    db.session.commit()
+
+class WebhookWorker:
+    """
+    Hintergrund-Thread für die Webhook-Zustellung. Neue Ereignisse wecken ihn; er wartet WEBHOOK_BATCH_DELAY_SECONDS,
+    damit ein Refresh-Lauf gebündelt zugestellt wird (und die Ingest-Transaktion committet ist).
+    """
+
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def wake(self):
+        if not self.app.config['WEBHOOK_WORKER_ENABLED']:
+            return
+        with self.lock:
+            # Erst beim ersten Ereignis starten, damit der Thread nach dem Fork im Gunicorn-Worker läuft
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='webhook-worker', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                self.wakeup.wait(timeout=self.app.config['WEBHOOK_POLL_SECONDS'])
+                self.wakeup.clear()
+                time.sleep(self.app.config['WEBHOOK_BATCH_DELAY_SECONDS'])
+                try:
+                    deliver_webhooks()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Fehler bei der Webhook-Zustellung: {e}")
+                finally:
+                    db.session.remove()
+
+webhook_worker = WebhookWorker(app)
+
+# Abonnements und benutzerspezifischer Episodenstand (Subscription, UserEpisodeState)
+# Felder, die pro Benutzer gespeichert werden; alle anderen Episodenfelder sind gemeinsam
+USER_EPISODE_FIELDS = ('is_favorite', 'host')
+USER_STATE_CHUNK = 500
+
+def user_feed_ids_query(user_id):
+    return db.session.query(Subscription.feed_id).filter(Subscription.user_id == user_id)
+
+def subscribed_feed_or_404(feed_id, user_id):
+    feed = PodcastFeed.query.join(Subscription, Subscription.feed_id == PodcastFeed.id) \
+        .filter(PodcastFeed.id == feed_id, Subscription.user_id == user_id).first()
+    if feed is None:
+        abort(404)
+    return feed
+
+def feeds_shared_with_others(feed_ids):
+    """
+    Feeds aus feed_ids, die außer dem aktuellen Benutzer noch andere abonniert haben (für Administratoren leer).
+    Gemeinsame Daten dieser Feeds (Metadaten, Episodenfelder außer Favorit/Host, Löschen von Episoden) ändern nur Administratoren.
+    """
+    feed_ids = set(feed_ids)
+    if not feed_ids or is_admin(current_user):
+        return set()
+    return {feed_id for (feed_id,) in db.session.query(Subscription.feed_id).filter(
+        Subscription.feed_id.in_(feed_ids), Subscription.user_id != current_user.id).distinct()}
+
+SHARED_FEED_ERROR = "Der Feed wird auch von anderen Benutzern abonniert; gemeinsame Daten ändern nur Administratoren."
+
+def subscribed_episode_or_404(episode_id, user_id):
+    episode = Episode.query.filter(Episode.id == episode_id, Episode.feed_id.in_(user_feed_ids_query(user_id))).first()
+    if episode is None:
+        abort(404)
+    return episode
+
+def sync_feed_active(feed_ids):
+    """
+    Setzt PodcastFeed.is_active auf 'mindestens ein aktives Abonnement' (ohne Commit). Nur aktive Feeds
+    werden von update_all_feeds abgerufen, jeder Feed genau einmal unabhängig von der Anzahl der Abonnenten.
+    """
+    feed_ids = list(feed_ids)
+    if not feed_ids:
+        return
+    has_active = db.session.query(Subscription.feed_id).filter(
+        Subscription.feed_id == PodcastFeed.id, Subscription.is_active == True).exists()
+    PodcastFeed.query.filter(PodcastFeed.id.in_(feed_ids)).update({PodcastFeed.is_active: has_active}, synchronize_session=False)
+
+def subscribe_feed(user_id, feed_id, is_active=True):
+    """
+    Abonniert einen Feed (ohne Commit). Gibt False zurück, wenn das Abonnement schon bestand.
+    """
+    subscription = db.session.get(Subscription, (user_id, feed_id))
+    if subscription is not None:
+        if is_active is not None and subscription.is_active != bool(is_active):
+            subscription.is_active = bool(is_active)
+            sync_feed_active([feed_id])
+        return False
+    db.session.add(Subscription(user_id=user_id, feed_id=feed_id, is_active=True if is_active is None else bool(is_active)))
+    db.session.flush()
+    sync_feed_active([feed_id])
+    searches = SavedSearch.query.filter_by(user_id=user_id).all()
+    if searches:
+        evaluate_saved_searches([episode_id for (episode_id,) in db.session.query(Episode.id).filter_by(feed_id=feed_id)], searches)
+    return True
+
+def unsubscribe_feeds(user_id, feed_ids):
+    """
+    Kündigt Abonnements (ohne Commit). Feeds ohne verbleibende Abonnenten werden samt Episoden gelöscht.
+    Gibt die Anzahl gekündigter Abonnements zurück.
+    """
+    feed_ids = [feed_id for (feed_id,) in db.session.query(Subscription.feed_id).filter(
+        Subscription.user_id == user_id, Subscription.feed_id.in_(list(feed_ids)))]
+    if not feed_ids:
+        return 0
+    search_ids = db.session.query(SavedSearch.id).filter_by(user_id=user_id)
+    SavedSearchEpisode.query.filter(SavedSearchEpisode.saved_search_id.in_(search_ids), SavedSearchEpisode.episode_id.in_(
+        db.session.query(Episode.id).filter(Episode.feed_id.in_(feed_ids)))).delete(synchronize_session=False)
+    Subscription.query.filter(Subscription.user_id == user_id, Subscription.feed_id.in_(feed_ids)).delete(synchronize_session=False)
+
+    orphaned = [feed_id for (feed_id,) in db.session.query(PodcastFeed.id).filter(
+        PodcastFeed.id.in_(feed_ids), ~db.session.query(Subscription.feed_id).filter(Subscription.feed_id == PodcastFeed.id).exists())]
+    if orphaned:
+        if webhooks_active():
+            add_episode_events([('feed_removed', feed_id, None, {'feed_id': feed_id}) for feed_id in orphaned])
+        delete_feeds(orphaned)
+    sync_feed_active(set(feed_ids) - set(orphaned))
+    return len(feed_ids)
+
+def delete_feeds(feed_ids):
+    """
+    Löscht Feeds samt Episoden (ohne Commit). Die Episoden werden ausdrücklich gelöscht, da Datenbanken aus der Zeit
+    vor ON DELETE CASCADE auf Episode.feed_id den Fremdschlüssel ohne Kaskade behalten (upgrade_schema ergänzt nur
+    Spalten und Indizes). Abhängige Zeilen der Episoden und übrige Feed-Tabellen entfernen deren Kaskaden.
+    """
+    feed_ids = list(feed_ids)
+    Episode.query.filter(Episode.feed_id.in_(feed_ids)).delete(synchronize_session=False)
+    PodcastFeed.query.filter(PodcastFeed.id.in_(feed_ids)).delete(synchronize_session=False)
+
+def set_user_episode_state(user_id, episode_ids, changes):
+    """
+    Setzt benutzerspezifische Felder (USER_EPISODE_FIELDS) für mehrere Episoden (Upsert, ohne Commit).
+    """
+    changes = {field: value for field, value in changes.items() if field in USER_EPISODE_FIELDS}
+    episode_ids = list(episode_ids)
+    if not changes or not episode_ids:
+        return
+    for start in range(0, len(episode_ids), USER_STATE_CHUNK):
+        chunk = episode_ids[start:start + USER_STATE_CHUNK]
+        existing = {episode_id for (episode_id,) in db.session.query(UserEpisodeState.episode_id).filter(
+            UserEpisodeState.user_id == user_id, UserEpisodeState.episode_id.in_(chunk))}
+        if existing:
+            UserEpisodeState.query.filter(UserEpisodeState.user_id == user_id, UserEpisodeState.episode_id.in_(existing)) \
+                .update(changes, synchronize_session=False)
+        new_rows = [dict(changes, user_id=user_id, episode_id=episode_id) for episode_id in chunk if episode_id not in existing]
+        if new_rows:
+            db.session.execute(db.insert(UserEpisodeState), new_rows)
+
+def backfill_subscriptions():
+    """
+    Bestehende Datenbanken (vor Abonnements): alle Benutzer abonnieren alle Feeds, mit deren bisherigem Aktiv-Status.
+    """
+    user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+    feeds = db.session.query(PodcastFeed.id, PodcastFeed.is_active).all()
+    rows = [{'user_id': user_id, 'feed_id': feed_id, 'is_active': bool(is_active), 'created_at': datetime.now()}
+            for user_id in user_ids for feed_id, is_active in feeds]
+    if rows:
+        db.session.execute(db.insert(Subscription), rows)
+    db.session.commit()
+    print(f"{len(rows)} Abonnements für {len(user_ids)} Benutzer angelegt.")
+
+# Aufbewahrung (ArchivedEpisode)
+def retention_cutoff(months):
+    # Monate als 30 Tage: für die Aufbewahrung genau genug und unabhängig von der Monatslänge
+    return datetime.now() - timedelta(days=30 * months)
+
+def archive_candidates_query(cutoff):
+    """
+    Episoden vor 'cutoff', die weder gemeinsam noch von einem Benutzer favorisiert und nicht aus dem Archiv
+    wiederhergestellt sind.
+    """
+    user_favorites = db.session.query(UserEpisodeState.episode_id).filter(UserEpisodeState.is_favorite == True)
+    return db.session.query(Episode.id).filter(
+        Episode.pub_date < cutoff, Episode.is_favorite.isnot(True), Episode.restored_at.is_(None),
+        Episode.id.notin_(user_favorites))
+
+def archive_episode_batch(episode_ids):
+    """
+    Verschiebt Episoden nach ArchivedEpisode (ohne Commit). Beschreibungen werden komprimiert übernommen;
+    abhängige Zeilen (EpisodeDescription, Treffer gespeicherter Suchen, Benutzerstand) entfernt ON DELETE CASCADE.
+    Statistiken bleiben unverändert, da archivierte Episoden weiter mitzählen.
+    """
+    stored = {episode_id: html_compressed for episode_id, html_compressed in db.session.query(
+        EpisodeDescription.episode_id, EpisodeDescription.html_compressed).filter(EpisodeDescription.episode_id.in_(episode_ids))}
+    archived_at = datetime.now()
+    rows = []
+    for episode_id, feed_id, title, description, pub_date, url, host in db.session.query(
+            Episode.id, Episode.feed_id, Episode.title, Episode.description, Episode.pub_date, Episode.url, Episode.host
+    ).filter(Episode.id.in_(episode_ids)):
+        description_compressed = stored.get(episode_id)
+        if description_compressed is None and description:
+            description_compressed = zlib.compress(description.encode('utf-8'))
+        rows.append({'episode_id': episode_id, 'feed_id': feed_id, 'title': title, 'description_compressed': description_compressed,
+                     'pub_date': pub_date, 'url': url, 'host': host, 'archived_at': archived_at})
+    if rows:
+        db.session.execute(db.insert(ArchivedEpisode), rows)
+        Episode.query.filter(Episode.id.in_([row['episode_id'] for row in rows])).delete(synchronize_session=False)
+    return len(rows)
+
+def archive_old_episodes(months=None, batch_size=None, max_episodes=None, dry_run=False):
+    """
+    Archiviert Episoden, die älter als 'months' Monate und nicht favorisiert sind, in Batches mit je einem Commit.
+    Gibt die Anzahl (bzw. mit dry_run die Anzahl der Kandidaten) zurück.
+    """
+    months = app.config['RETENTION_MONTHS'] if months is None else months
+    batch_size = batch_size or app.config['RETENTION_BATCH_SIZE']
+    if months <= 0:
+        return 0
+    cutoff = retention_cutoff(months)
+    if dry_run:
+        return archive_candidates_query(cutoff).count()
+    archived = 0
+    while max_episodes is None or archived < max_episodes:
+        limit = batch_size if max_episodes is None else min(batch_size, max_episodes - archived)
+        episode_ids = [episode_id for (episode_id,) in archive_candidates_query(cutoff).order_by(Episode.id).limit(limit)]
+        if not episode_ids:
+            break
+        archived += run_ingest_write(archive_episode_batch, episode_ids)
+    return archived
+
+def restore_archived_episode(archived):
+    """
+    Holt eine archivierte Episode in die Tabelle Episode zurück (ohne Commit); sie erhält eine neue ID.
+    Über restored_at ist sie von der weiteren Archivierung ausgenommen, obwohl sie ihr altes pub_date behält.
+    """
+    description = zlib.decompress(archived.description_compressed).decode('utf-8') if archived.description_compressed else None
+    episode = Episode(feed_id=archived.feed_id, title=archived.title, pub_date=archived.pub_date,
+                      url=archived.url, host=archived.host, is_favorite=False, restored_at=datetime.now())
+    if app.config['DESCRIPTION_STORAGE'] == 'compressed':
+        db.session.add(episode)
+        db.session.flush()
+        if description:
+            db.session.add(build_episode_description(episode.id, description))
+    else:
+        episode.description = description
+        db.session.add(episode)
+    db.session.delete(archived)
+    db.session.flush()
+    evaluate_saved_searches([episode.id])
+    return episode
+
+def archive_path(content_hash):
+    return os.path.join(app.config['FEED_ARCHIVE_DIR'], content_hash[:2], f"{content_hash}.xml.gz")
+
+def archive_feed_content(content):
+    """
+    Legt einen Feed-Inhalt komprimiert und inhaltsadressiert im Archiv ab und gibt den SHA-256-Hash zurück
+    (None, wenn das Archiv deaktiviert ist). Bereits vorhandene Inhalte werden nicht erneut geschrieben.
+    """
+    if not app.config['FEED_ARCHIVE_DIR']:
+        return None
+    content_hash = hashlib.sha256(content).hexdigest()
+    path = archive_path(content_hash)
+    if not os.path.exists(path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Erst temporär schreiben, dann umbenennen, damit parallele Leser nie eine halbe Datei sehen
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            import gzip
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as archive_file:
+                archive_file.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warnung: Feed-Inhalt {content_hash[:12]} konnte nicht archiviert werden: {e}")
+            return None
+    return content_hash
+
+def load_archived_feed_content(content_hash):
+    import gzip
+    with gzip.open(archive_path(content_hash), 'rb') as archive_file:
+        return archive_file.read()
+
+def record_feed_archive(feed_url, content_hash):
+    """
+    Merkt sich den zuletzt geladenen Inhalt eines Feeds (ohne Commit), sofern er sich geändert hat.
+    """
+    if not content_hash:
+        return
+    latest = db.session.query(FeedArchiveEntry.content_hash).filter_by(feed_url=feed_url) \
+        .order_by(FeedArchiveEntry.fetched_at.desc(), FeedArchiveEntry.id.desc()).limit(1).scalar()
+    if latest != content_hash:
+        db.session.add(FeedArchiveEntry(feed_url=feed_url, content_hash=content_hash, fetched_at=datetime.now()))
+
+# Episodenfelder, die ein vollständiger Parse an gespeicherten Episoden aktualisiert
+PARSED_EPISODE_FIELDS = ('title', 'pub_date', 'url', 'host', 'description')
+
+def merge_parsed_episodes(feed_id, episodes_data):
+    """
+    Gleicht bei einem vollständigen Parse die gespeicherten Episoden eines Feeds über episode_key mit den geparsten ab
+    (ohne Commit). Gespeicherte Episoden behalten ihre ID und damit Favoriten, benutzerspezifische Zustände,
+    Apple-Podcasts-Links und Treffer gespeicherter Suchen samt Gelesen-Status; geändert (und mit neuem updated_at
+    versehen) werden nur tatsächlich abweichende Felder. Nicht mehr enthaltene Episoden werden gelöscht.
+    Gibt (Anzahl abgeglichener Episoden, Daten der neu anzulegenden Episoden) zurück.
+    """
+    compressed = app.config['DESCRIPTION_STORAGE'] == 'compressed'
+    stored = {}
+    for episode_id, *values in db.session.query(Episode.id, *[getattr(Episode, field) for field in PARSED_EPISODE_FIELDS]) \
+            .filter_by(feed_id=feed_id).order_by(Episode.id):
+        values = dict(zip(PARSED_EPISODE_FIELDS, values))
+        stored.setdefault(episode_key(values['url'], values['title']), []).append((episode_id, values))
+    stored_descriptions = {}
+    if compressed:
+        stored_descriptions = dict(db.session.query(EpisodeDescription.episode_id, EpisodeDescription.html_compressed)
+                                   .join(Episode, Episode.id == EpisodeDescription.episode_id).filter(Episode.feed_id == feed_id))
+
+    new_episodes = []
+    kept_count = 0
+    search_episode_ids, event_episode_ids = [], []
+    stats_changed = False
+    for ep_data in episodes_data:
+        matches = stored.get(episode_key(ep_data.get('url'), ep_data.get('title')))
+        if not matches:
+            new_episodes.append(ep_data)
+            continue
+        episode_id, values = matches.pop(0)
+        kept_count += 1
+        if episode_id in stored_descriptions:
+            values['description'] = zlib.decompress(stored_descriptions[episode_id]).decode('utf-8') if stored_descriptions[episode_id] else ''
+        changes = {}
+        for field in PARSED_EPISODE_FIELDS:
+            new_value, old_value = ep_data.get(field), values[field]
+            if field == 'pub_date' and new_value is not None:
+                # In der Datenbank ohne Zeitzone gespeichert
+                changed = new_value.replace(tzinfo=None) != old_value
+            elif field == 'description':
+                changed = (new_value or '') != (old_value or '')
+            else:
+                changed = new_value != old_value
+            if changed:
+                changes[field] = new_value
+        if not changes:
+            continue
+        if 'description' in changes and compressed:
+            set_episode_description(episode_id, changes.pop('description'))
+        if changes:
+            Episode.query.filter_by(id=episode_id).update(changes, synchronize_session=False)
+        stats_changed = stats_changed or 'pub_date' in changes
+        if any(field in changes for field in SAVED_SEARCH_EPISODE_FIELDS):
+            search_episode_ids.append(episode_id)
+        if any(field in changes for field in EPISODE_EVENT_FIELDS):
+            event_episode_ids.append(episode_id)
+
+    removed = [(key, episode_id) for key, matches in stored.items() for episode_id, _ in matches]
+    if removed:
+        if webhooks_active():
+            add_episode_events([('removed', feed_id, episode_id, {'id': episode_id, 'feed_id': feed_id, 'key': key})
+                                for key, episode_id in removed])
+        removed_ids = [episode_id for _, episode_id in removed]
+        for start in range(0, len(removed_ids), SAVED_SEARCH_EVALUATION_CHUNK):
+            Episode.query.filter(Episode.id.in_(removed_ids[start:start + SAVED_SEARCH_EVALUATION_CHUNK])).delete(synchronize_session=False)
+    if removed or stats_changed:
+        refresh_feed_stats([feed_id])
+    if search_episode_ids and saved_searches_exist():
+        evaluate_saved_searches(search_episode_ids)
+    if event_episode_ids and webhooks_active():
+        record_episode_changes(event_episode_ids)
+    return kept_count, new_episodes
+
+def store_parsed_feed(feed_id, parsed_feed_data, episodes_data, is_active=None, incremental=False):
+    """
+    Übernimmt geparste Daten in einen bestehenden Feed (ohne Commit): Metadaten aktualisieren
+    und die Episoden abgleichen (siehe merge_parsed_episodes) bzw. im inkrementellen Modus nur die neuen anhängen.
+    Gibt (Feed-Name, Anzahl Episoden) zurück.
+    """
+    feed = db.session.get(PodcastFeed, feed_id)
+    # KORREKTUR: Name und Topic nur aktualisieren, wenn sie nicht bereits manuell gesetzt wurden
+    # Dies verhindert das Überschreiben manueller Edits durch den RSS-Feed
+    if feed.name == feed.url or feed.name == 'Unbekannter Podcast':
+        feed.name = parsed_feed_data.get('name', feed.name)
+
+    # Wenn das geparste Thema nicht None ist UND das aktuelle Thema leer ist ODER es gleich dem geparsten ist
+    if parsed_feed_data.get('topic') is not None and (feed.topic is None or feed.topic == parsed_feed_data['topic']):
+        feed.topic = parsed_feed_data['topic']
+
+    if is_active is not None:
+        feed.is_active = is_active
+    feed.homepage_url = parsed_feed_data.get('homepage_url', feed.homepage_url)
+    feed.content_fingerprint = parsed_feed_data.get('content_fingerprint', feed.content_fingerprint)
+    feed.last_checked = datetime.now()
+
+    record_feed_archive(feed.url, parsed_feed_data.get('content_hash'))
+
+    if not incremental:
+        # Archivierte Episoden nicht erneut in die Tabelle Episode übernehmen
+        archived_keys = {episode_key(url, title) for url, title in
+                         db.session.query(ArchivedEpisode.url, ArchivedEpisode.title).filter_by(feed_id=feed.id)}
+        if archived_keys:
+            episodes_data = [ep_data for ep_data in episodes_data
+                             if episode_key(ep_data.get('url'), ep_data.get('title')) not in archived_keys]
+        # Mit den gespeicherten Episoden abgleichen; nur die neuen werden angelegt
+        kept_count, episodes_data = merge_parsed_episodes(feed.id, episodes_data)
+        feed.last_full_parse = datetime.now()
+    else:
+        kept_count = 0
+    episodes_count = kept_count + add_episodes(feed.id, episodes_data)
+    return feed.name, episodes_count
+
+def incremental_parse_args(feed_id, force_full=False):
+    """
+    Liefert (known_keys, newer_than) für parse_rss_feed. (None, None) bedeutet vollständiger Parse:
+    auf Wunsch, wenn der letzte vollständige Parse älter als FULL_PARSE_INTERVAL_HOURS ist oder keine Episoden existieren.
+    """
+    if force_full:
+        return None, None
+    last_full_parse = db.session.query(PodcastFeed.last_full_parse).filter_by(id=feed_id).scalar()
+    if last_full_parse is None or last_full_parse < datetime.now() - timedelta(hours=app.config['FULL_PARSE_INTERVAL_HOURS']):
+        return None, None
+    known_keys, newer_than = known_episode_keys(feed_id)
+    if not known_keys:
+        return None, None
+    return known_keys, newer_than
+
+def known_episode_keys(feed_id):
+    """
+    Schlüssel der jüngsten INCREMENTAL_KNOWN_WINDOW Episoden eines Feeds und dessen neuestes pub_date.
+    """
+    recent = db.session.query(Episode.url, Episode.title, Episode.pub_date).filter_by(feed_id=feed_id) \
+        .order_by(Episode.pub_date.desc()).limit(app.config['INCREMENTAL_KNOWN_WINDOW']).all()
+    if not recent:
+        return set(), None
+    return {episode_key(url, title) for url, title, _ in recent}, recent[0].pub_date
+
+# Kanonische Feed-URLs und Duplikaterkennung
+# Query-Parameter, die nur der Reichweitenmessung dienen (zusätzlich alle utm_*)
+TRACKING_QUERY_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+# Hosts, die denselben Feed unter mehreren Namen ausliefern
+FEED_HOST_ALIASES = {'feeds2.feedburner.com': 'feeds.feedburner.com', 'feedproxy.google.com': 'feeds.feedburner.com'}
+FEED_MERGE_CHUNK = 500
+
+def canonicalize_feed_url(url):
+    """
+    Normalisierte Form einer Feed-URL als Vergleichsschlüssel (keine abrufbare URL): ohne Schema (http, https, feed),
+    Host in Kleinbuchstaben ohne 'www.' und Standardport, ohne abschließenden Schrägstrich, Fragment und
+    Tracking-Parameter, übrige Parameter sortiert. Feedburner-Aliase werden zusammengefasst.
+    """
+    from urllib.parse import urlsplit, parse_qsl, urlencode
+    url = (url or '').strip()
+    if url.lower().startswith('feed:'):
+        url = url[5:]
+    if not url:
+        return None
+    if '://' not in url and not url.startswith('//'):
+        url = '//' + url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    host = FEED_HOST_ALIASES.get(host, host)
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    params = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS)
+    if host == 'feeds.feedburner.com':
+        # Feedburner liefert mit und ohne format=xml denselben Feed
+        params = [(key, value) for key, value in params if key.lower() != 'format']
+    query = urlencode(params)
+    return f"{host}{path}{'?' + query if query else ''}"[:500]
+
+def feed_content_fingerprint(title, identities):
+    """
+    Fingerabdruck für denselben Inhalt hinter verschiedenen URLs: SHA-256 über den normalisierten Kanaltitel und die
+    GUIDs (ersatzweise Medien-URLs) der FEED_FINGERPRINT_EPISODES ältesten Episoden. Die ältesten Episoden ändern sich
+    nicht, wenn neue Folgen erscheinen, sodass auch zu verschiedenen Zeiten geladene Kopien übereinstimmen.
+    identities: Liste von (pub_date, Kennung); None bei Feeds ohne Episoden.
+    """
+    if not identities:
+        return None
+    oldest = sorted(identities, key=lambda entry: (entry[0].replace(tzinfo=None), entry[1]))[:app.config['FEED_FINGERPRINT_EPISODES']]
+    normalized_title = ' '.join((title or '').lower().split())
+    return hashlib.sha256('\n'.join([normalized_title] + [identity for _, identity in oldest]).encode('utf-8')).hexdigest()
+
+def find_feed_by_url(feed_url):
+    """
+    Bestehender Feed zu einer URL: exakt oder über die kanonische Form.
+    """
+    canonical_url = canonicalize_feed_url(feed_url)
+    if canonical_url is None:
+        return PodcastFeed.query.filter_by(url=feed_url).first()
+    return PodcastFeed.query.filter(db.or_(PodcastFeed.url == feed_url, PodcastFeed.canonical_url == canonical_url)) \
+        .order_by(PodcastFeed.id).first()
+
+def find_duplicate_feed(parsed_feed_data):
+    """
+    Bestehender Feed mit demselben Inhalt unter anderer URL: über das Ziel von Weiterleitungen
+    oder den Inhalts-Fingerabdruck eines vollständigen Parses.
+    """
+    if parsed_feed_data.get('final_url'):
+        feed = find_feed_by_url(parsed_feed_data['final_url'])
+        if feed is not None:
+            return feed
+    if parsed_feed_data.get('content_fingerprint'):
+        return PodcastFeed.query.filter_by(content_fingerprint=parsed_feed_data['content_fingerprint']) \
+            .order_by(PodcastFeed.id).first()
+    return None
+
+def backfill_canonical_urls():
+    """
+    Setzt canonical_url für Feeds ohne Wert. Ist die kanonische Form schon vergeben, bleibt der Wert leer,
+    bis 'flask merge-duplicate-feeds' die Duplikate zusammengeführt hat. Gibt die Anzahl dieser Duplikate zurück.
+    """
+    taken = {canonical_url for (canonical_url,) in db.session.query(PodcastFeed.canonical_url).filter(PodcastFeed.canonical_url != None)}
+    duplicates = 0
+    for feed in PodcastFeed.query.filter(PodcastFeed.canonical_url == None).order_by(PodcastFeed.id):
+        canonical_url = canonicalize_feed_url(feed.url)
+        if canonical_url in taken:
+            duplicates += 1
+            continue
+        feed.canonical_url = canonical_url
+        taken.add(canonical_url)
+    db.session.commit()
+    return duplicates
+
+def backfill_feed_fingerprints():
+    """
+    Berechnet fehlende Inhalts-Fingerabdrücke aus dem zuletzt archivierten Feed-Inhalt (ohne erneuten Abruf, mit Commit).
+    """
+    count = 0
+    for feed in PodcastFeed.query.filter(PodcastFeed.content_fingerprint == None).order_by(PodcastFeed.id):
+        content_hash = db.session.query(FeedArchiveEntry.content_hash).filter_by(feed_url=feed.url) \
+            .order_by(FeedArchiveEntry.fetched_at.desc(), FeedArchiveEntry.id.desc()).limit(1).scalar()
+        if content_hash is None:
+            continue
+        try:
+            feed_data, _ = parse_feed_content(load_archived_feed_content(content_hash))
+        except Exception as e:
+            print(f"Archivierter Inhalt von {feed.url} nicht lesbar: {e}")
+            continue
+        if feed_data.get('content_fingerprint'):
+            feed.content_fingerprint = feed_data['content_fingerprint']
+            count += 1
+    db.session.commit()
+    return count
+
+def find_duplicate_feed_groups(use_fingerprint=True):
+    """
+    Gruppen doppelter Feeds (gleiche kanonische URL oder gleicher Fingerabdruck) als Listen von IDs,
+    der älteste Feed zuerst.
+    """
+    parent = {}
+
+    def find(feed_id):
+        while parent[feed_id] != feed_id:
+            parent[feed_id] = parent[parent[feed_id]]
+            feed_id = parent[feed_id]
+        return feed_id
+
+    first_by_key = {}
+    for feed_id, url, fingerprint in db.session.query(PodcastFeed.id, PodcastFeed.url, PodcastFeed.content_fingerprint).order_by(PodcastFeed.id):
+        parent[feed_id] = feed_id
+        keys = [('url', canonicalize_feed_url(url))]
+        if use_fingerprint and fingerprint:
+            keys.append(('fingerprint', fingerprint))
+        for key in keys:
+            if key in first_by_key:
+                parent[find(feed_id)] = find(first_by_key[key])
+            else:
+                first_by_key[key] = feed_id
+    groups = {}
+    for feed_id in parent:
+        groups.setdefault(find(feed_id), []).append(feed_id)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+def merge_feeds(target_id, duplicate_id):
+    """
+    Führt einen doppelten Feed in den Feed target_id zusammen (ohne Commit). Abonnements, Favoriten und
+    benutzerspezifische Zustände werden übernommen (Zuordnung der Episoden über episode_key), nur im Duplikat
+    vorhandene Episoden verschoben und das Duplikat anschließend gelöscht. Gibt die Anzahl verschobener Episoden zurück.
+    """
+    # Abonnements: bestehende des Ziel-Feeds bleiben, aktiv, wenn eines der beiden aktiv war
+    target_subscriptions = {subscription.user_id: subscription for subscription in Subscription.query.filter_by(feed_id=target_id)}
+    for subscription in Subscription.query.filter_by(feed_id=duplicate_id).all():
+        existing = target_subscriptions.get(subscription.user_id)
+        if existing is None:
+            db.session.add(Subscription(user_id=subscription.user_id, feed_id=target_id, is_active=subscription.is_active,
+                                        created_at=subscription.created_at))
+        elif subscription.is_active and not existing.is_active:
+            existing.is_active = True
+        db.session.delete(subscription)
+
+    known = {episode_key(url, title): episode_id for episode_id, url, title in
+             db.session.query(Episode.id, Episode.url, Episode.title).filter_by(feed_id=target_id)}
+    matched = {}
+    moved_ids = []
+    favorite_ids = []
+    for episode_id, url, title, is_favorite in db.session.query(Episode.id, Episode.url, Episode.title, Episode.is_favorite) \
+            .filter_by(feed_id=duplicate_id):
+        key = episode_key(url, title)
+        if key in known:
+            matched[episode_id] = known[key]
+            if is_favorite:
+                favorite_ids.append(known[key])
+        else:
+            known[key] = episode_id
+            moved_ids.append(episode_id)
+
+    for start in range(0, len(favorite_ids), FEED_MERGE_CHUNK):
+        Episode.query.filter(Episode.id.in_(favorite_ids[start:start + FEED_MERGE_CHUNK])) \
+            .update({Episode.is_favorite: True}, synchronize_session=False)
+    # Benutzerzustände doppelter Episoden auf die Episode des Ziel-Feeds übertragen
+    states = db.session.query(UserEpisodeState).join(Episode, Episode.id == UserEpisodeState.episode_id) \
+        .filter(Episode.feed_id == duplicate_id).all()
+    for state in states:
+        target_episode_id = matched.get(state.episode_id)
+        if target_episode_id is None:
+            continue
+        existing = db.session.get(UserEpisodeState, (state.user_id, target_episode_id))
+        if existing is None:
+            db.session.add(UserEpisodeState(user_id=state.user_id, episode_id=target_episode_id,
+                                            is_favorite=state.is_favorite, host=state.host))
+            continue
+        if state.is_favorite:
+            existing.is_favorite = True
+        if existing.host is None:
+            existing.host = state.host
+    for start in range(0, len(moved_ids), FEED_MERGE_CHUNK):
+        Episode.query.filter(Episode.id.in_(moved_ids[start:start + FEED_MERGE_CHUNK])) \
+            .update({Episode.feed_id: target_id}, synchronize_session=False)
+
+    known.update({episode_key(url, title): None for url, title in
+                  db.session.query(ArchivedEpisode.url, ArchivedEpisode.title).filter_by(feed_id=target_id)})
+    archived_ids = [archived_id for archived_id, url, title in
+                    db.session.query(ArchivedEpisode.id, ArchivedEpisode.url, ArchivedEpisode.title).filter_by(feed_id=duplicate_id)
+                    if episode_key(url, title) not in known]
+    for start in range(0, len(archived_ids), FEED_MERGE_CHUNK):
+        ArchivedEpisode.query.filter(ArchivedEpisode.id.in_(archived_ids[start:start + FEED_MERGE_CHUNK])) \
+            .update({ArchivedEpisode.feed_id: target_id}, synchronize_session=False)
+    SavedSearch.query.filter_by(feed_id=duplicate_id).update({SavedSearch.feed_id: target_id}, synchronize_session=False)
+
+    duplicate = db.session.get(PodcastFeed, duplicate_id)
+    target = db.session.get(PodcastFeed, target_id)
+    target.content_fingerprint = target.content_fingerprint or duplicate.content_fingerprint
+    db.session.flush()
+    if webhooks_active():
+        add_episode_events([('feed_removed', duplicate_id, None, {'feed_id': duplicate_id, 'merged_into': target_id})])
+    # Übrige (doppelte) Episoden, Statistiken und WebSub-Abonnement des Duplikats
+    delete_feeds([duplicate_id])
+    db.session.expunge(duplicate)
+    if target.canonical_url is None:
+        canonical_url = canonicalize_feed_url(target.url)
+        if not PodcastFeed.query.filter_by(canonical_url=canonical_url).first():
+            target.canonical_url = canonical_url
+
+    db.session.flush()
+    refresh_feed_stats([target_id])
+    sync_feed_active([target_id])
+    if saved_searches_exist():
+        evaluate_saved_searches([episode_id for (episode_id,) in db.session.query(Episode.id).filter_by(feed_id=target_id)])
+    return len(moved_ids)
+
+def create_feed(feed_url, parsed_feed_data, episodes_data, default_name='Unbekannter Podcast', is_active=True, subscriber_id=None):
+    """
+    Legt einen neuen Feed mit seinen Episoden an (ohne Commit), mit subscriber_id samt Abonnement dieses Benutzers
+    (im selben Schreibjob, damit kein Feed ohne Abonnenten zurückbleibt). Gibt (Feed-ID, Feed-Name) zurück.
+    """
+    new_feed = PodcastFeed(
+        url=feed_url,
+        canonical_url=canonicalize_feed_url(feed_url),
+        content_fingerprint=parsed_feed_data.get('content_fingerprint'),
+        name=parsed_feed_data.get('name', default_name),
+        topic=parsed_feed_data.get('topic'),
+        is_active=is_active,
+        last_checked=datetime.now(),
+        last_full_parse=datetime.now(),
+        homepage_url=parsed_feed_data.get('homepage_url')
+    )
+    db.session.add(new_feed)
+    db.session.flush()
+    record_feed_archive(feed_url, parsed_feed_data.get('content_hash'))
+    add_episodes(new_feed.id, episodes_data)
+    if subscriber_id is not None:
+        subscribe_feed(subscriber_id, new_feed.id, is_active)
+    return new_feed.id, new_feed.name
+
+class IngestWriter:
+    """
+    Einzelner Schreib-Thread für Ingest-Schreibvorgänge (SQLite-Produktionsprofil).
+    Jobs laufen in eigenen Savepoints; mehrere wartende Jobs werden mit einem gemeinsamen Commit abgeschlossen
+    (über die pysqlite-Transaktionssteuerung aus begin_sqlite_transaction).
+    """
+
+    def __init__(self, flask_app, max_batch):
+        self.app = flask_app
+        self.max_batch = max_batch
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        with self.lock:
+            # Erst beim ersten Job starten, damit der Thread nach dem Fork im Gunicorn-Worker läuft
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='ingest-writer', daemon=True)
+                self.thread.start()
+        self.jobs.put((future, func, args, kwargs))
+        return future
+
+    def _run(self):
+        with self.app.app_context():
+            batch = []
+            while True:
+                if not batch:
+                    batch = [self.jobs.get()]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self.jobs.get_nowait())
+                    except queue.Empty:
+                        break
+                batch = self._process(batch)
+                if batch or not self.jobs.empty():
+                    # Schreibsperre kurz freigeben, damit im busy_timeout wartende Request-Schreibzugriffe zum Zug kommen
+                    time.sleep(self.app.config['INGEST_WRITER_PAUSE_MS'] / 1000)
+
+    def _process(self, batch):
+        """
+        Führt Jobs aus batch in einer Transaktion aus, bis INGEST_WRITER_MAX_BATCH_MS überschritten ist.
+        Gibt die nicht mehr ausgeführten Jobs zurück.
+        """
+        done = []
+        remaining = []
+        deadline = time.monotonic() + self.app.config['INGEST_WRITER_MAX_BATCH_MS'] / 1000
+        db.session.connection(execution_options={'sqlite_begin_immediate': True})
+        for index, (future, func, args, kwargs) in enumerate(batch):
+            if index and time.monotonic() > deadline:
+                remaining = batch[index:]
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            savepoint = db.session.begin_nested()
+            try:
+                result = func(*args, **kwargs)
+                savepoint.commit()
+                done.append((future, result))
+            except Exception as e:
+                savepoint.rollback()
+                future.set_exception(e)
+        try:
             db.session.commit()
-            print("Default user 'user1' created with predefined hash.")
+            for future, result in done:
+                future.set_result(result)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Fehler beim gebündelten Ingest-Commit ({len(done)} Jobs): {e}")
+            for future, _ in done:
+                future.set_exception(e)
+        finally:
+            # Identity Map leeren, damit der langlebige Thread keinen Speicher ansammelt
+            db.session.expunge_all()
+        return remaining
 
+ingest_writer = IngestWriter(app, app.config['INGEST_WRITER_MAX_BATCH'])
 
-# Datenbankmodelle
-class PodcastFeed(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    url = db.Column(db.String(500), unique=True, nullable=False)
-    name = db.Column(db.String(255), nullable=False)
-    topic = db.Column(db.String(255))
-    is_active = db.Column(db.Boolean, default=True)
-    last_checked = db.Column(db.DateTime, default=datetime.now)
-    homepage_url = db.Column(db.String(500)) # Neues Feld für Homepage URL
-    itunes_available = db.Column(db.Boolean, default=None) # iTunes Verfügbarkeit
-    youtube_available = db.Column(db.Boolean, default=None) # YouTube Verfügbarkeit
-    availability_checked = db.Column(db.DateTime, default=None) # Wann zuletzt geprüft
+def submit_ingest_write(func, *args, **kwargs):
+    """
+    Führt einen Ingest-Schreibjob aus und committet ihn. Im SQLite-Produktionsprofil läuft der Job
+    im Schreib-Thread; sonst direkt in der aktuellen Session. Gibt ein Future mit dem Ergebnis zurück.
+    """
+    if app.config['SQLITE_TUNED'] and db.engine.dialect.name == 'sqlite':
+        return ingest_writer.submit(func, *args, **kwargs)
 
-    episodes = db.relationship('Episode', backref='feed', lazy=True, cascade="all, delete-orphan")
+    future = Future()
+    try:
+        result = func(*args, **kwargs)
+        db.session.commit()
+        future.set_result(result)
+    except Exception as e:
+        db.session.rollback()
+        future.set_exception(e)
+    return future
 
-    def __repr__(self):
-        return f'<PodcastFeed {self.name}>'
+def run_ingest_write(func, *args, **kwargs):
+    return submit_ingest_write(func, *args, **kwargs).result()
 
-class Episode(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    feed_id = db.Column(db.Integer, db.ForeignKey('podcast_feed.id'), nullable=False)
-    title = db.Column(db.String(500), nullable=False)
-    description = db.Column(db.Text)
-    pub_date = db.Column(db.DateTime, nullable=False)
-    url = db.Column(db.String(500))
-    is_favorite = db.Column(db.Boolean, default=False)
-    host = db.Column(db.String(255))
+# Hilfsfunktionen für die JSON-Serialisierung der Listen-Endpunkte
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Typ {type(value).__name__} ist nicht JSON-serialisierbar")
 
-    def __repr__(self):
-        return f'<Episode {self.title}>'
+def json_dumps(data):
+    """
+    Serialisiert nach JSON (bytes), mit orjson falls installiert. datetime-Werte werden als ISO 8601 ausgegeben.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(data, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def stream_json_array(keys, rows, chunk_size):
+    """
+    Erzeugt ein JSON-Array aus Tupel-Zeilen blockweise, ohne die gesamte Liste im Speicher aufzubauen.
+    """
+    yield b'['
+    separator = b''
+    chunk = []
+    for row in rows:
+        chunk.append(dict(zip(keys, row)))
+        if len(chunk) >= chunk_size:
+            # Äußere Klammern des Teil-Arrays entfernen, Elemente werden direkt angehängt
+            yield separator + json_dumps(chunk)[1:-1]
+            separator = b','
+            chunk = []
+    if chunk:
+        yield separator + json_dumps(chunk)[1:-1]
+    yield b']'
+
+def stream_statement_json(keys, statement, chunk_size):
+    """
+    Streamt das Ergebnis von statement als JSON-Array (siehe stream_json_array). Die Abfrage läuft erst beim
+    Ausliefern der Antwort, also nach dem Teardown des Requests, daher in einer eigenen Session über die Lese-Engine
+    (sonst die primäre), die nach dem letzten Block oder beim Abbruch durch den Client geschlossen wird.
+    """
+    engine = db.engines[READ_BIND] if READ_BIND in db.engines else db.engine
+    def generate():
+        session = Session(engine)
+        try:
+            yield from stream_json_array(keys, session.execute(statement.execution_options(yield_per=chunk_size)), chunk_size)
+        finally:
+            session.close()
+    return generate()
 
 # Hilfsfunktion zum Parsen von Datumsstrings
-def parse_date(date_string):
+def parse_date(date_string, strict=False):
+    # strict: None statt der aktuellen Zeit zurückgeben, wenn das Datum nicht geparst werden kann
     formats = [
         "%a, %d %b %Y %H:%M:%S %Z",  # RFC 2822 (most common for RSS)
         "%a, %d %b %Y %H:%M:%S %z",  # RFC 2822 with UTC offset
@@ -113,203 +1785,281 @@ def parse_date(date_string):
             return datetime.strptime(date_string, fmt)
         except ValueError:
             continue
+    if strict:
+        return None
     print(f"Warnung: Datum '{date_string}' konnte nicht geparst werden.")
     return datetime.now() # Fallback auf aktuelle Zeit, wenn Parsen fehlschlägt
 
-def parse_rss_feed(feed_url):
+def episode_key(url, title):
     """
-    Parst einen RSS- oder Atom-Feed und gibt Feed- und Episodendaten zurück.
+    Identität einer Episode für das inkrementelle Parsen: Medien-URL, ersatzweise der Titel.
     """
-    try:
-        response = requests.get(feed_url, timeout=10) # Timeout hinzugefügt
-        response.raise_for_status() # Löst HTTPError für schlechte Antworten (4xx oder 5xx) aus
-        
-        # Versuche, den XML-Baum zu parsen
-        root = ET.fromstring(response.content)
-        
-        # Namespaces für RSS, iTunes und Atom
-        namespaces = {
-            'itunes': 'http://www.itunes.com/dtds/podcast-1.0.dtd', 
-            'googleplay': 'http://www.google.com/schemas/play-podcasts/1.0',
-            'atom': 'http://www.w3.org/2005/Atom',
-            'dc': 'http://purl.org/dc/elements/1.1/' # Hinzugefügt für Dublin Core Creator
-        }
-
-        feed_data = {}
-        episodes = []
-
-        # Prüfen, ob es sich um einen RSS-Feed handelt (hat ein 'channel'-Element)
-        if root.find('channel') is not None:
-            channel = root.find('channel')
-            # RSS Feed Parsing
-            feed_data['name'] = channel.find('title').text if channel.find('title') is not None else 'Unbekannter Podcast'
-            
-            # Homepage URL: Verbesserte Priorisierung
-            homepage_url = None
-
-            # Priorität 1: Standard <link> Tag im <channel>
-            link_element = channel.find('link')
-            if link_element is not None:
-                # Prüfe den Textinhalt zuerst
-                if link_element.text and (link_element.text.startswith('http://') or link_element.text.startswith('https://')):
-                    homepage_url = link_element.text.strip()
-                # Wenn Textinhalt nicht valide, prüfe 'href' Attribut (weniger üblich für channel/link, aber möglich)
-                elif 'href' in link_element.attrib and (link_element.attrib['href'].startswith('http://') or link_element.attrib['href'].startswith('https://')):
-                    homepage_url = link_element.attrib['href'].strip()
-
-            # Priorität 2: itunes:new-feed-url (falls noch keine Homepage gefunden)
-            if homepage_url is None:
-                itunes_new_feed_url = channel.find('itunes:new-feed-url', namespaces)
-                if itunes_new_feed_url is not None and itunes_new_feed_url.text and \
-                   (itunes_new_feed_url.text.startswith('http://') or itunes_new_feed_url.text.startswith('https://')):
-                    homepage_url = itunes_new_feed_url.text.strip()
-
-            # Priorität 3: atom:link rel="alternate" (falls noch keine Homepage gefunden)
-            if homepage_url is None:
-                atom_alternate_link = channel.find('atom:link[@rel="alternate"]', namespaces)
-                if atom_alternate_link is not None and 'href' in atom_alternate_link.attrib and \
-                   (atom_alternate_link.attrib['href'].startswith('http://') or atom_alternate_link.attrib['href'].startswith('https://')):
-                    homepage_url = atom_alternate_link.attrib['href'].strip()
-            
-            # Priorität 4 (Fallback): Ableitung von atom:link rel="self"
-            if homepage_url is None:
-                atom_self_link = channel.find('atom:link[@rel="self"]', namespaces)
-                if atom_self_link is not None and 'href' in atom_self_link.attrib:
-                    feed_base_url = atom_self_link.attrib['href'].strip()
-                    # Heuristik: Entferne bekannte Feed-Pfade, um zur Basis-URL zu kommen
-                    if '/feed/mp3' in feed_base_url:
-                        homepage_url = feed_base_url.replace('/feed/mp3', '')
-                    elif '/rss' in feed_base_url:
-                        homepage_url = feed_base_url.replace('/rss', '')
-                    # Wenn nichts entfernt wurde, bedeutet dies, dass es sich möglicherweise um eine Basis-URL handelt
-                    # oder dass keine weitere Ableitung möglich ist.
-                    if homepage_url == feed_base_url: 
-                         homepage_url = None # Setze es auf None, wenn keine sinnvolle Ableitung möglich war
-
-
-            # Letzte Validierung der gefundenen Homepage URL
-            if homepage_url and not (homepage_url.startswith('http://') or homepage_url.startswith('https://')):
-                homepage_url = None # Setze ungültige URLs auf None
-
-            feed_data['homepage_url'] = homepage_url
-
-            # Den Topic aus verschiedenen möglichen Tags lesen
-            topic = None
-            category_elem = channel.find('category')
-            if category_elem is not None and category_elem.text:
-                topic = category_elem.text
-            else:
-                itunes_category_elem = channel.find('itunes:category', namespaces)
-                if itunes_category_elem is not None:
-                    topic = itunes_category_elem.attrib.get('text')
-            feed_data['topic'] = topic
-
-            for item in channel.findall('item'):
-                title_elem = item.find('title')
-                description_elem = item.find('description')
-                pub_date_elem = item.find('pubDate')
-                url_elem = item.find('enclosure') # enclosure-Tag für die Mediendatei-URL
-                
-                # Alternative: direkter Link aus dem item
-                if url_elem is None:
-                    url_elem = item.find('link') 
+    return url or title
 
-                # KORREKTUR: Host/Author Parsing verbessert
-                host_text = 'Unbekannter Host' # Default value
-                
-                # Priority 1: item-level iTunes author
-                itunes_author_item = item.find('itunes:author', namespaces)
-                if itunes_author_item is not None and itunes_author_item.text:
-                    host_text = itunes_author_item.text.strip()
+def _reached_known_boundary(episode_url, title, pub_date, known_keys, newer_than):
+    if known_keys and episode_key(episode_url, title) in known_keys:
+        return True
+    # Gespeicherte Datumswerte sind naiv; Zeitzoneninformation für den Vergleich verwerfen
+    return newer_than is not None and pub_date.replace(tzinfo=None) < newer_than
+
+def _newest_first(items, date_path, namespaces=None):
+    """
+    Gibt die Items neueste-zuerst zurück; aufsteigend sortierte Feeds werden umgedreht.
+    """
+    if len(items) > 1:
+        first_date = items[0].find(date_path, namespaces)
+        last_date = items[-1].find(date_path, namespaces)
+        if first_date is not None and last_date is not None and first_date.text and last_date.text:
+            if parse_date(first_date.text).replace(tzinfo=None) < parse_date(last_date.text).replace(tzinfo=None):
+                return list(reversed(items))
+    return items
+
+def parse_feed_content(content, known_keys=None, newer_than=None):
+    """
+    Parst den Inhalt eines RSS- oder Atom-Feeds (bytes) und gibt Feed- und Episodendaten zurück.
+    Inkrementeller Modus: Mit known_keys (siehe episode_key) und/oder newer_than (neuestes gespeichertes pub_date)
+    werden die Items neueste-zuerst gelesen und das Parsen endet an der ersten bereits bekannten Episode.
+    Wirft ET.ParseError bzw. ValueError bei ungültigem Inhalt.
+    """
+    import xml.etree.ElementTree as ET
+    incremental = bool(known_keys) or newer_than is not None
+    root = ET.fromstring(content)
+
+    # Namespaces für RSS, iTunes und Atom
+    namespaces = {
+        'itunes': 'http://www.itunes.com/dtds/podcast-1.0.dtd', 
+        'googleplay': 'http://www.google.com/schemas/play-podcasts/1.0',
+        'atom': 'http://www.w3.org/2005/Atom',
+        'dc': 'http://purl.org/dc/elements/1.1/' # Hinzugefügt für Dublin Core Creator
+    }
+
+    feed_data = {}
+    episodes = []
+    identities = [] # (pub_date, GUID bzw. Medien-URL) für den Inhalts-Fingerabdruck
+
+    # Prüfen, ob es sich um einen RSS-Feed handelt (hat ein 'channel'-Element)
+    if root.find('channel') is not None:
+        channel = root.find('channel')
+        # RSS Feed Parsing
+        feed_data['name'] = channel.find('title').text if channel.find('title') is not None else 'Unbekannter Podcast'
+
+        # Homepage URL: Verbesserte Priorisierung
+        homepage_url = None
+
+        # Priorität 1: Standard <link> Tag im <channel>
+        link_element = channel.find('link')
+        if link_element is not None:
+            # Prüfe den Textinhalt zuerst
+            if link_element.text and (link_element.text.startswith('http://') or link_element.text.startswith('https://')):
+                homepage_url = link_element.text.strip()
+            # Wenn Textinhalt nicht valide, prüfe 'href' Attribut (weniger üblich für channel/link, aber möglich)
+            elif 'href' in link_element.attrib and (link_element.attrib['href'].startswith('http://') or link_element.attrib['href'].startswith('https://')):
+                homepage_url = link_element.attrib['href'].strip()
+
+        # Priorität 2: itunes:new-feed-url (falls noch keine Homepage gefunden)
+        if homepage_url is None:
+            itunes_new_feed_url = channel.find('itunes:new-feed-url', namespaces)
+            if itunes_new_feed_url is not None and itunes_new_feed_url.text and \
+               (itunes_new_feed_url.text.startswith('http://') or itunes_new_feed_url.text.startswith('https://')):
+                homepage_url = itunes_new_feed_url.text.strip()
+
+        # Priorität 3: atom:link rel="alternate" (falls noch keine Homepage gefunden)
+        if homepage_url is None:
+            atom_alternate_link = channel.find('atom:link[@rel="alternate"]', namespaces)
+            if atom_alternate_link is not None and 'href' in atom_alternate_link.attrib and \
+               (atom_alternate_link.attrib['href'].startswith('http://') or atom_alternate_link.attrib['href'].startswith('https://')):
+                homepage_url = atom_alternate_link.attrib['href'].strip()
+
+        # Priorität 4 (Fallback): Ableitung von atom:link rel="self"
+        if homepage_url is None:
+            atom_self_link = channel.find('atom:link[@rel="self"]', namespaces)
+            if atom_self_link is not None and 'href' in atom_self_link.attrib:
+                feed_base_url = atom_self_link.attrib['href'].strip()
+                # Heuristik: Entferne bekannte Feed-Pfade, um zur Basis-URL zu kommen
+                if '/feed/mp3' in feed_base_url:
+                    homepage_url = feed_base_url.replace('/feed/mp3', '')
+                elif '/rss' in feed_base_url:
+                    homepage_url = feed_base_url.replace('/rss', '')
+                # Wenn nichts entfernt wurde, bedeutet dies, dass es sich möglicherweise um eine Basis-URL handelt
+                # oder dass keine weitere Ableitung möglich ist.
+                if homepage_url == feed_base_url: 
+                     homepage_url = None # Setze es auf None, wenn keine sinnvolle Ableitung möglich war
+
+
+        # Letzte Validierung der gefundenen Homepage URL
+        if homepage_url and not (homepage_url.startswith('http://') or homepage_url.startswith('https://')):
+            homepage_url = None # Setze ungültige URLs auf None
+
+        feed_data['homepage_url'] = homepage_url
+
+        # Den Topic aus verschiedenen möglichen Tags lesen
+        topic = None
+        category_elem = channel.find('category')
+        if category_elem is not None and category_elem.text:
+            topic = category_elem.text
+        else:
+            itunes_category_elem = channel.find('itunes:category', namespaces)
+            if itunes_category_elem is not None:
+                topic = itunes_category_elem.attrib.get('text')
+        feed_data['topic'] = topic
+
+        # WebSub: Hub und kanonische Feed-URL (Topic)
+        hub_link = channel.find('atom:link[@rel="hub"]', namespaces)
+        self_link = channel.find('atom:link[@rel="self"]', namespaces)
+        feed_data['hub_url'] = hub_link.attrib.get('href') if hub_link is not None else None
+        feed_data['self_url'] = self_link.attrib.get('href') if self_link is not None else None
+
+        items = channel.findall('item')
+        if incremental:
+            items = _newest_first(items, 'pubDate')
+
+        for item in items:
+            title_elem = item.find('title')
+            description_elem = item.find('description')
+            pub_date_elem = item.find('pubDate')
+            url_elem = item.find('enclosure') # enclosure-Tag für die Mediendatei-URL
+
+            # Alternative: direkter Link aus dem item
+            if url_elem is None:
+                url_elem = item.find('link') 
+
+            episode_url = None
+            if url_elem is not None:
+                if 'url' in url_elem.attrib: # Für <enclosure url="...">
+                    episode_url = url_elem.attrib['url']
+                elif url_elem.text and (url_elem.text.startswith('http://') or url_elem.text.startswith('https://')): # Für <link>text</link>
+                    episode_url = url_elem.text # Korrigiert: url_elem.text statt url.text
+
+            # Überprüfe, ob episode_url ein valider Link ist (kann auch nur ein HTML-Link sein)
+            if episode_url and not (episode_url.startswith('http://') or episode_url.startswith('https://')):
+                episode_url = None # Setze ungültige URLs auf None
+
+            title = title_elem.text if title_elem is not None else 'Unbekannter Titel'
+            pub_date = parse_date(pub_date_elem.text) if pub_date_elem is not None else datetime.now()
+            if incremental and _reached_known_boundary(episode_url, title, pub_date, known_keys, newer_than):
+                break
+
+            # KORREKTUR: Host/Author Parsing verbessert
+            host_text = 'Unbekannter Host' # Default value
+
+            # Priority 1: item-level iTunes author
+            itunes_author_item = item.find('itunes:author', namespaces)
+            if itunes_author_item is not None and itunes_author_item.text:
+                host_text = itunes_author_item.text.strip()
+            else:
+                # Priority 2: item-level generic author
+                author_item = item.find('author')
+                if author_item is not None:
+                    # Some <author> tags might contain <name> sub-element
+                    name_in_author = author_item.find('name')
+                    if name_in_author is not None and name_in_author.text:
+                        host_text = name_in_author.text.strip()
+                    elif author_item.text: # Direct text in <author> tag
+                        host_text = author_item.text.strip()
                 else:
-                    # Priority 2: item-level generic author
-                    author_item = item.find('author')
-                    if author_item is not None:
-                        # Some <author> tags might contain <name> sub-element
-                        name_in_author = author_item.find('name')
-                        if name_in_author is not None and name_in_author.text:
-                            host_text = name_in_author.text.strip()
-                        elif author_item.text: # Direct text in <author> tag
-                            host_text = author_item.text.strip()
+                    # Priority 3: item-level Dublin Core creator
+                    dc_creator_item = item.find('dc:creator', namespaces)
+                    if dc_creator_item is not None and dc_creator_item.text:
+                        host_text = dc_creator_item.text.strip()
                     else:
-                        # Priority 3: item-level Dublin Core creator
-                        dc_creator_item = item.find('dc:creator', namespaces)
-                        if dc_creator_item is not None and dc_creator_item.text:
-                            host_text = dc_creator_item.text.strip()
+                        # Priority 4: channel-level iTunes owner/author (common for entire podcast)
+                        itunes_owner_name = channel.find('itunes:owner/itunes:name', namespaces)
+                        if itunes_owner_name is not None and itunes_owner_name.text:
+                            host_text = itunes_owner_name.text.strip()
                         else:
-                            # Priority 4: channel-level iTunes owner/author (common for entire podcast)
-                            itunes_owner_name = channel.find('itunes:owner/itunes:name', namespaces)
-                            if itunes_owner_name is not None and itunes_owner_name.text:
-                                host_text = itunes_owner_name.text.strip()
+                            itunes_author_channel = channel.find('itunes:author', namespaces)
+                            if itunes_author_channel is not None and itunes_author_channel.text:
+                                host_text = itunes_author_channel.text.strip()
                             else:
-                                itunes_author_channel = channel.find('itunes:author', namespaces)
-                                if itunes_author_channel is not None and itunes_author_channel.text:
-                                    host_text = itunes_author_channel.text.strip()
-                                else:
-                                    # Priority 5: channel-level generic author
-                                    author_channel = channel.find('author')
-                                    if author_channel is not None and author_channel.text:
-                                        host_text = author_channel.text.strip()
+                                # Priority 5: channel-level generic author
+                                author_channel = channel.find('author')
+                                if author_channel is not None and author_channel.text:
+                                    host_text = author_channel.text.strip()
 
-                
-                episode_url = None
-                if url_elem is not None:
-                    if 'url' in url_elem.attrib: # Für <enclosure url="...">
-                        episode_url = url_elem.attrib['url']
-                    elif url_elem.text and (url_elem.text.startswith('http://') or url_elem.text.startswith('https://')): # Für <link>text</link>
-                        episode_url = url_elem.text # Korrigiert: url_elem.text statt url.text
-
-                # Überprüfe, ob episode_url ein valider Link ist (kann auch nur ein HTML-Link sein)
-                if episode_url and not (episode_url.startswith('http://') or episode_url.startswith('https://')):
-                    episode_url = None # Setze ungültige URLs auf None
-
-                episodes.append({
-                    'title': title_elem.text if title_elem is not None else 'Unbekannter Titel',
-                    'description': description_elem.text if description_elem is not None else '',
-                    'pub_date': parse_date(pub_date_elem.text) if pub_date_elem is not None else datetime.now(),
-                    'url': episode_url,
-                    'host': host_text # Use the determined host_text
-                })
-        
-        # Prüfen, ob es sich um einen Atom-Feed handelt (hat ein 'feed'-Element als root)
-        elif root.tag == '{http://www.w3.org/2005/Atom}feed':
-            # Atom Feed
-            feed_data['name'] = root.find('{http://www.w3.org/2005/Atom}title', namespaces).text if root.find('{http://www.w3.org/2005/Atom}title', namespaces) is not None else 'Unbekannter Atom Feed'
-            feed_data['homepage_url'] = root.find('{http://www.w3.org/2005/Atom}link[@rel="alternate"]', namespaces).attrib['href'] if root.find('{http://www.w3.org/2005/Atom}link[@rel="alternate"]', namespaces) is not None else None
-            feed_data['topic'] = None # Atom hat kein direktes "topic" Feld
-
-            for item in root.findall('{http://www.w3.org/2005/Atom}entry', namespaces):
-                title_elem = item.find('{http://www.w3.org/2005/Atom}title', namespaces)
-                description_elem = item.find('{http://www.w3.org/2005/Atom}summary', namespaces) or item.find('{http://www.w3.org/2005/Atom}content', namespaces)
-                pub_date_elem = item.find('{http://www.w3.org/2005/Atom}published', namespaces)
-                url_elem = item.find('{http://www.w3.org/2005/Atom}link[@rel="enclosure"]', namespaces) or item.find('{http://www.w3.org/2005/Atom}link', namespaces)
-                
-                # KORREKTUR: Host/Author Parsing verbessert für Atom
-                host_text = 'Unbekannter Host'
-                author_elem = item.find('{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name', namespaces)
-                if author_elem is not None and author_elem.text:
-                    host_text = author_elem.text.strip()
-                else:
-                    channel_author_elem = root.find('{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name', namespaces)
-                    if channel_author_elem is not None and channel_author_elem.text:
-                        host_text = channel_author_elem.text.strip()
 
+            episodes.append({
+                'title': title,
+                'description': description_elem.text if description_elem is not None else '',
+                'pub_date': pub_date,
+                'url': episode_url,
+                'host': host_text # Use the determined host_text
+            })
+            identities.append((pub_date, (item.findtext('guid') or '').strip() or episode_url or title))
 
-                episode_url = url_elem.attrib['href'] if url_elem is not None and 'href' in url_elem.attrib else None
-                
-                if episode_url and not (episode_url.startswith('http://') or episode_url.startswith('https://')):
-                    episode_url = None # Setze ungültige URLs auf None
-
-                episodes.append({
-                    'title': title_elem.text if title_elem is not None else 'Unbekannter Titel',
-                    'description': description_elem.text if description_elem is not None else '',
-                    'pub_date': parse_date(pub_date_elem.text) if pub_date_elem is not None else datetime.now(),
-                    'url': episode_url,
-                    'host': host_text
-                })
-        else:
-            raise ValueError("Ungültiges Feed-Format: Weder RSS-Channel noch Atom-Feed gefunden.")
+    # Prüfen, ob es sich um einen Atom-Feed handelt (hat ein 'feed'-Element als root)
+    elif root.tag == '{http://www.w3.org/2005/Atom}feed':
+        # Atom Feed
+        feed_data['name'] = root.find('{http://www.w3.org/2005/Atom}title', namespaces).text if root.find('{http://www.w3.org/2005/Atom}title', namespaces) is not None else 'Unbekannter Atom Feed'
+        feed_data['homepage_url'] = root.find('{http://www.w3.org/2005/Atom}link[@rel="alternate"]', namespaces).attrib['href'] if root.find('{http://www.w3.org/2005/Atom}link[@rel="alternate"]', namespaces) is not None else None
+        feed_data['topic'] = None # Atom hat kein direktes "topic" Feld
+
+        hub_link = root.find('{http://www.w3.org/2005/Atom}link[@rel="hub"]', namespaces)
+        self_link = root.find('{http://www.w3.org/2005/Atom}link[@rel="self"]', namespaces)
+        feed_data['hub_url'] = hub_link.attrib.get('href') if hub_link is not None else None
+        feed_data['self_url'] = self_link.attrib.get('href') if self_link is not None else None
+
+        entries = root.findall('{http://www.w3.org/2005/Atom}entry', namespaces)
+        if incremental:
+            entries = _newest_first(entries, '{http://www.w3.org/2005/Atom}published', namespaces)
+
+        for item in entries:
+            title_elem = item.find('{http://www.w3.org/2005/Atom}title', namespaces)
+            description_elem = item.find('{http://www.w3.org/2005/Atom}summary', namespaces) or item.find('{http://www.w3.org/2005/Atom}content', namespaces)
+            pub_date_elem = item.find('{http://www.w3.org/2005/Atom}published', namespaces)
+            url_elem = item.find('{http://www.w3.org/2005/Atom}link[@rel="enclosure"]', namespaces) or item.find('{http://www.w3.org/2005/Atom}link', namespaces)
+
+            episode_url = url_elem.attrib['href'] if url_elem is not None and 'href' in url_elem.attrib else None
+
+            if episode_url and not (episode_url.startswith('http://') or episode_url.startswith('https://')):
+                episode_url = None # Setze ungültige URLs auf None
+
+            title = title_elem.text if title_elem is not None else 'Unbekannter Titel'
+            pub_date = parse_date(pub_date_elem.text) if pub_date_elem is not None else datetime.now()
+            if incremental and _reached_known_boundary(episode_url, title, pub_date, known_keys, newer_than):
+                break
 
+            # KORREKTUR: Host/Author Parsing verbessert für Atom
+            host_text = 'Unbekannter Host'
+            author_elem = item.find('{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name', namespaces)
+            if author_elem is not None and author_elem.text:
+                host_text = author_elem.text.strip()
+            else:
+                channel_author_elem = root.find('{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name', namespaces)
+                if channel_author_elem is not None and channel_author_elem.text:
+                    host_text = channel_author_elem.text.strip()
+
+
+            episodes.append({
+                'title': title,
+                'description': description_elem.text if description_elem is not None else '',
+                'pub_date': pub_date,
+                'url': episode_url,
+                'host': host_text
+            })
+            identities.append((pub_date, (item.findtext('{http://www.w3.org/2005/Atom}id') or '').strip() or episode_url or title))
+    else:
+        raise ValueError("Ungültiges Feed-Format: Weder RSS-Channel noch Atom-Feed gefunden.")
+
+    if not incremental:
+        # Nur ein vollständiger Parse sieht alle Items
+        feed_data['content_fingerprint'] = feed_content_fingerprint(feed_data.get('name'), identities)
+    return feed_data, episodes
+
+def parse_rss_feed(feed_url, known_keys=None, newer_than=None):
+    """
+    Lädt und parst einen RSS- oder Atom-Feed und gibt Feed- und Episodendaten zurück (bei Fehlern (None, None)).
+    Der geladene Inhalt wird im Feed-Archiv abgelegt; sein Hash steht in feed_data['content_hash'].
+    """
+    import requests
+    import xml.etree.ElementTree as ET
+    try:
+        response = requests.get(feed_url, timeout=10) # Timeout hinzugefügt
+        response.raise_for_status() # Löst HTTPError für schlechte Antworten (4xx oder 5xx) aus
+
+        feed_data, episodes = parse_feed_content(response.content, known_keys, newer_than)
+        feed_data['content_hash'] = archive_feed_content(response.content)
+        # Ziel nach Weiterleitungen (z.B. Feedburner oder Hosterwechsel) für die Duplikaterkennung
+        feed_data['final_url'] = response.url
         return feed_data, episodes
 
     except requests.exceptions.RequestException as e:
@@ -322,15 +2072,15 @@ def parse_rss_feed(feed_url):
         print(f"Ein unerwarteter Fehler ist aufgetreten beim Parsen von {feed_url}: {e}")
         return None, None
 
-
 def check_itunes_availability(podcast_name):
     """
     Prüft, ob ein Podcast auf iTunes/Apple Podcasts verfügbar ist
     """
+    import requests
     try:
         # Einfache Suche über iTunes Search API (kostenlos)
         search_query = podcast_name.replace(" ", "+")
-        itunes_api_url = f"https://itunes.apple.com/search?term={search_query}&media=podcast&limit=5"
+        itunes_api_url = f"{app.config['ITUNES_API_BASE_URL']}/search?term={search_query}&media=podcast&limit=5"
         
         response = requests.get(itunes_api_url, timeout=10)
         if response.status_code == 200:
@@ -355,6 +2105,7 @@ def check_youtube_availability(podcast_name):
     Prüft, ob ein Podcast auf YouTube verfügbar ist
     Verbesserte Heuristik basierend auf YouTube-Suche
     """
+    import requests
     try:
         # YouTube-Suche simulieren (ohne API-Key)
         search_query = f"{podcast_name} podcast".replace(" ", "+")
@@ -429,6 +2180,126 @@ def check_youtube_availability(podcast_name):
         return None
 
 
+# Direkte Episodenlinks (Apple Podcasts)
+def normalize_episode_title(title):
+    """
+    Titel für den Abgleich mit iTunes: Kleinbuchstaben, ohne Satzzeichen und mehrfache Leerzeichen.
+    """
+    return ' '.join(re.sub(r'[^\w\s]', ' ', (title or '').lower()).split())
+
+def find_itunes_collection(feed_name, feed_url):
+    """
+    Sucht die Apple-Podcasts-ID eines Feeds: bevorzugt der Treffer mit gleicher (kanonischer) Feed-URL, sonst mit
+    gleichem Namen. Gibt None zurück, wenn nichts passt; Netzwerkfehler werden weitergereicht.
+    """
+    import requests
+    response = requests.get(f"{app.config['ITUNES_API_BASE_URL']}/search", timeout=10,
+                            params={'term': feed_name, 'media': 'podcast', 'entity': 'podcast', 'limit': 10})
+    response.raise_for_status()
+    results = response.json().get('results', [])
+    canonical_url = canonicalize_feed_url(feed_url)
+    for result in results:
+        if result.get('feedUrl') and canonicalize_feed_url(result['feedUrl']) == canonical_url:
+            return result.get('collectionId')
+    name = normalize_episode_title(feed_name)
+    for result in results:
+        if normalize_episode_title(result.get('collectionName')) == name:
+            return result.get('collectionId')
+    return None
+
+def fetch_itunes_episodes(collection_id):
+    """
+    Lädt mit einem Lookup die neuesten Episoden einer Sendung. Gibt Dicts mit title, pub_date (naiv, UTC),
+    media_url und url (direkter Link) zurück.
+    """
+    import requests
+    response = requests.get(f"{app.config['ITUNES_API_BASE_URL']}/lookup", timeout=10,
+                            params={'id': collection_id, 'entity': 'podcastEpisode', 'limit': app.config['EPISODE_LINK_LOOKUP_LIMIT']})
+    response.raise_for_status()
+    episodes = []
+    for result in response.json().get('results', []):
+        if result.get('wrapperType') != 'podcastEpisode' or not result.get('trackViewUrl'):
+            continue
+        try:
+            pub_date = datetime.fromisoformat(result['releaseDate'].replace('Z', '+00:00')).astimezone(timezone.utc).replace(tzinfo=None)
+        except (KeyError, TypeError, ValueError):
+            pub_date = None
+        episodes.append({'title': result.get('trackName'), 'pub_date': pub_date,
+                         'media_url': result.get('episodeUrl'), 'url': result['trackViewUrl']})
+    return episodes
+
+def match_itunes_episodes(feed_id, itunes_episodes):
+    """
+    Ordnet iTunes-Episoden den gespeicherten Episoden eines Feeds zu: über die Medien-URL, sonst über den
+    normalisierten Titel mit Veröffentlichungsdatum innerhalb von EPISODE_LINK_MATCH_DAYS. Gibt {episode_id: url} zurück.
+    """
+    if not itunes_episodes:
+        return {}
+    tolerance = timedelta(days=app.config['EPISODE_LINK_MATCH_DAYS'])
+    query = db.session.query(Episode.id, Episode.title, Episode.pub_date, Episode.url).filter_by(feed_id=feed_id)
+    dates = [item['pub_date'] for item in itunes_episodes if item['pub_date'] is not None]
+    if len(dates) == len(itunes_episodes):
+        # Der Lookup umfasst nur die neuesten Episoden: ältere gar nicht erst laden
+        query = query.filter(Episode.pub_date >= min(dates) - tolerance)
+    by_url = {}
+    by_title = {}
+    for episode_id, title, pub_date, url in query:
+        if url:
+            by_url[url] = episode_id
+        by_title.setdefault(normalize_episode_title(title), []).append((episode_id, pub_date))
+
+    links = {}
+    for item in itunes_episodes:
+        episode_id = by_url.get(item['media_url']) if item['media_url'] else None
+        if episode_id is None:
+            for candidate_id, pub_date in by_title.get(normalize_episode_title(item['title']), []):
+                if item['pub_date'] is None or abs(pub_date - item['pub_date']) <= tolerance:
+                    episode_id = candidate_id
+                    break
+        if episode_id is not None and episode_id not in links:
+            links[episode_id] = item['url']
+    return links
+
+def store_episode_links(feed_id, collection_id, links):
+    """
+    Speichert aufgelöste Links und den Zeitpunkt der Prüfung (ohne Commit). Gibt die Anzahl verlinkter Episoden zurück.
+    """
+    db.session.execute(db.update(PodcastFeed).where(PodcastFeed.id == feed_id)
+                       .values(itunes_collection_id=collection_id, episode_links_checked=datetime.now()))
+    if links:
+        db.session.execute(db.update(Episode), [{'id': episode_id, 'itunes_url': url} for episode_id, url in links.items()])
+    return len(links)
+
+def resolve_episode_links(feed_id):
+    """
+    Löst die Apple-Podcasts-Links der jüngsten Episoden eines Feeds mit einem einzigen Lookup auf (beim ersten Mal
+    zusätzlich eine Suche nach der Sendung). Gibt die Anzahl verlinkter Episoden zurück, None bei Fehlern.
+    """
+    import requests
+    feed_name, feed_url, collection_id = db.session.query(
+        PodcastFeed.name, PodcastFeed.url, PodcastFeed.itunes_collection_id).filter_by(id=feed_id).one()
+    try:
+        if collection_id is None:
+            collection_id = find_itunes_collection(feed_name, feed_url)
+        itunes_episodes = fetch_itunes_episodes(collection_id) if collection_id else []
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Fehler beim Auflösen der Episodenlinks für Feed {feed_id}: {e}")
+        return None
+    links = match_itunes_episodes(feed_id, itunes_episodes)
+    return run_ingest_write(store_episode_links, feed_id, collection_id, links)
+
+def episode_links_stale(checked, has_link):
+    """
+    Ob die Links eines Feeds neu aufgelöst werden sollen: nie geprüft, Prüfung älter als EPISODE_LINK_TTL_HOURS
+    oder (für Episoden ohne Link, z.B. neu erschienene) älter als EPISODE_LINK_RETRY_MINUTES.
+    """
+    if checked is None:
+        return True
+    now = datetime.now()
+    if checked < now - timedelta(hours=app.config['EPISODE_LINK_TTL_HOURS']):
+        return True
+    return not has_link and checked < now - timedelta(minutes=app.config['EPISODE_LINK_RETRY_MINUTES'])
+
 def update_feed_availability(feed_id):
     """
     Aktualisiert die Verfügbarkeitsinformationen für einen Feed
@@ -455,13 +2326,512 @@ def update_feed_availability(feed_id):
         db.session.rollback()
         return False
 
+AVAILABILITY_CHECKS = {
+    'itunes_available': check_itunes_availability,
+    'youtube_available': check_youtube_availability
+}
+
+def store_availability_results(rows):
+    """
+    Schreibt die Ergebnisse einer Sammel-Prüfung als ein gebündeltes UPDATE (ohne Commit).
+    """
+    if rows:
+        db.session.execute(db.update(PodcastFeed), rows)
+    return len(rows)
+
+def recheck_stale_availability(max_age_hours=None, limit=None, time_budget=None, concurrency=None, progress=None):
+    """
+    Prüft die Verfügbarkeit aller Feeds, deren letzte Prüfung älter als max_age_hours ist (nie geprüfte zuerst).
+    Die Einzelprüfungen laufen parallel mit höchstens 'concurrency' gleichzeitigen Anfragen. Nach 'time_budget'
+    Sekunden werden offene Prüfungen verworfen; diese Feeds kommen beim nächsten Lauf wieder an die Reihe.
+    progress(done, total) wird nach jeder abgeschlossenen Einzelprüfung aufgerufen. Gibt eine Zusammenfassung zurück.
+    """
+    max_age_hours = app.config['AVAILABILITY_MAX_AGE_HOURS'] if max_age_hours is None else max_age_hours
+    time_budget = app.config['AVAILABILITY_TIME_BUDGET_SECONDS'] if time_budget is None else time_budget
+    concurrency = concurrency or app.config['AVAILABILITY_CONCURRENCY']
+    started = time.monotonic()
+
+    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    query = db.session.query(PodcastFeed.id, PodcastFeed.name, PodcastFeed.itunes_available, PodcastFeed.youtube_available) \
+        .filter(db.or_(PodcastFeed.availability_checked.is_(None), PodcastFeed.availability_checked < cutoff)) \
+        .order_by(PodcastFeed.availability_checked.isnot(None), PodcastFeed.availability_checked)
+    if limit:
+        query = query.limit(limit)
+    feeds = {feed_id: {'id': feed_id, 'name': name, 'itunes_available': itunes, 'youtube_available': youtube}
+             for feed_id, name, itunes, youtube in query}
+
+    results = {feed_id: {} for feed_id in feeds}
+    total = len(feeds) * len(AVAILABILITY_CHECKS)
+    done = 0
+    budget_exhausted = False
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = {executor.submit(check, feed['name']): (feed_id, field)
+                   for feed_id, feed in feeds.items() for field, check in AVAILABILITY_CHECKS.items()}
+        try:
+            for future in as_completed(futures, timeout=max(0.0, time_budget - (time.monotonic() - started))):
+                feed_id, field = futures[future]
+                results[feed_id][field] = future.result()
+                done += 1
+                if progress:
+                    progress(done, total)
+        except FuturesTimeoutError:
+            budget_exhausted = True
+    finally:
+        # Laufende Anfragen enden über ihr eigenes Timeout; noch nicht gestartete werden verworfen
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    checked_at = datetime.now()
+    rows = []
+    failed = 0
+    for feed_id, checks in results.items():
+        if len(checks) < len(AVAILABILITY_CHECKS):
+            continue
+        if all(value is None for value in checks.values()):
+            # Beide Prüfungen fehlgeschlagen (z.B. Netzwerkfehler): alten Stand behalten, nächstes Mal erneut prüfen
+            failed += 1
+            continue
+        row = {'id': feed_id, 'availability_checked': checked_at}
+        for field, value in checks.items():
+            row[field] = feeds[feed_id][field] if value is None else value
+        rows.append(row)
+    updated = run_ingest_write(store_availability_results, rows)
+
+    return {
+        "selected": len(feeds),
+        "updated": updated,
+        "failed": failed,
+        "skipped": len(feeds) - updated - failed,
+        "checks_completed": done,
+        "checks_total": total,
+        "budget_exhausted": budget_exhausted,
+        "elapsed_seconds": round(time.monotonic() - started, 2)
+    }
+
+
+# WebSub (PubSubHubbub)
+def websub_enabled():
+    return bool(app.config['WEBSUB_CALLBACK_BASE_URL'])
+
+def websub_callback_url(feed_id):
+    return f"{app.config['WEBSUB_CALLBACK_BASE_URL']}/websub/callback/{feed_id}"
+
+def subscribe_websub(feed_id, hub_url, topic_url):
+    """
+    Sendet eine Abonnement-Anfrage an den Hub. Die Bestätigung erfolgt asynchron über den Callback (GET).
+    """
+    import requests
+    subscription = WebSubSubscription.query.filter_by(feed_id=feed_id).first()
+    if subscription is None:
+        subscription = WebSubSubscription(feed_id=feed_id)
+        db.session.add(subscription)
+    subscription.hub_url = hub_url
+    subscription.topic_url = topic_url
+    # Ein laufendes Abonnement behält bis zur bestätigten Verlängerung sein Secret, da der Hub bis dahin damit signiert
+    if subscription.state != 'active':
+        subscription.secret = secrets.token_hex(32)
+        subscription.state = 'pending'
+    db.session.commit()
+
+    try:
+        response = requests.post(hub_url, data={
+            'hub.mode': 'subscribe',
+            'hub.topic': topic_url,
+            'hub.callback': websub_callback_url(feed_id),
+            'hub.secret': subscription.secret,
+            'hub.lease_seconds': app.config['WEBSUB_LEASE_SECONDS']
+        }, timeout=10)
+        if response.status_code not in (202, 204):
+            raise requests.exceptions.RequestException(f"Hub antwortete mit Status {response.status_code}")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"WebSub-Abonnement für Feed {feed_id} bei {hub_url} fehlgeschlagen: {e}")
+        if subscription.state == 'pending':
+            subscription.state = 'failed'
+            db.session.commit()
+        return False
+
+def ensure_websub_subscription(feed_id, parsed_feed_data):
+    """
+    Abonniert den im Feed angegebenen Hub, falls noch kein passendes Abonnement besteht.
+    """
+    hub_url = parsed_feed_data.get('hub_url') if parsed_feed_data else None
+    if not websub_enabled() or not hub_url:
+        return
+    topic_url = parsed_feed_data.get('self_url') or db.session.query(PodcastFeed.url).filter_by(id=feed_id).scalar()
+    subscription = WebSubSubscription.query.filter_by(feed_id=feed_id).first()
+    if subscription is not None and subscription.hub_url == hub_url and subscription.topic_url == topic_url \
+            and subscription.state in ('active', 'pending', 'denied'):
+        return
+    subscribe_websub(feed_id, hub_url, topic_url)
+
+def renew_websub_subscriptions():
+    """
+    Verlängert aktive Abonnements, deren Lease innerhalb von WEBSUB_RENEW_BEFORE_HOURS abläuft.
+    """
+    if not websub_enabled():
+        return 0
+    renew_before = datetime.now() + timedelta(hours=app.config['WEBSUB_RENEW_BEFORE_HOURS'])
+    due = WebSubSubscription.query.filter(WebSubSubscription.state == 'active',
+                                          WebSubSubscription.lease_expires_at < renew_before).all()
+    return sum(1 for subscription in due if subscribe_websub(subscription.feed_id, subscription.hub_url, subscription.topic_url))
+
+def websub_pushed_feed_ids():
+    """
+    IDs der Feeds mit aktivem, nicht abgelaufenem Abonnement (werden vom Polling ausgenommen).
+    """
+    return {feed_id for (feed_id,) in db.session.query(WebSubSubscription.feed_id).filter(
+        WebSubSubscription.state == 'active', WebSubSubscription.lease_expires_at > datetime.now())}
 
 # Routen
+# Frontend-Assets: 'scripts/build_assets.py' legt gehashte, vorkomprimierte Dateien in static/dist ab und
+# schreibt static/dist/manifest.json (logischer Name -> Dateiname). Ohne Build werden die Quellen aus static/src
+# bzw. für Fremdbibliotheken das CDN verwendet.
+ASSET_DIST_DIR = os.path.join(basedir, 'static', 'dist')
+ASSET_MANIFEST_FILE = os.path.join(ASSET_DIST_DIR, 'manifest.json')
+ASSET_CDN_FALLBACKS = {
+    'vendor/xlsx.full.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js'
+}
+_asset_manifest = None
+_asset_manifest_mtime = None
+
+def asset_manifest():
+    """
+    Lädt das Asset-Manifest (neu, sobald sich die Datei ändert). Ohne Build: leeres Dict.
+    """
+    global _asset_manifest, _asset_manifest_mtime
+    try:
+        mtime = os.path.getmtime(ASSET_MANIFEST_FILE)
+    except OSError:
+        return {}
+    if mtime != _asset_manifest_mtime:
+        with open(ASSET_MANIFEST_FILE, encoding='utf-8') as f:
+            _asset_manifest = json.load(f)
+        _asset_manifest_mtime = mtime
+    return _asset_manifest
+
+def asset_built(name):
+    return name in asset_manifest()
+
+def asset_url(name):
+    built = asset_manifest().get(name)
+    if built:
+        return url_for('dist_asset', filename=built)
+    if name in ASSET_CDN_FALLBACKS:
+        return ASSET_CDN_FALLBACKS[name]
+    return url_for('static', filename=f'src/{name}')
+
+app.jinja_env.globals.update(asset_url=asset_url, asset_built=asset_built)
+
+@app.route('/static/dist/<path:filename>')
+def dist_asset(filename):
+    """
+    Liefert gebaute Assets vorkomprimiert (Brotli bzw. gzip je nach Accept-Encoding).
+    Die Dateinamen enthalten einen Inhalts-Hash, daher dürfen Browser sie unbegrenzt cachen.
+    """
+    accept_encoding = request.headers.get('Accept-Encoding', '')
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encoding in accept_encoding and os.path.isfile(os.path.join(ASSET_DIST_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIST_DIR, filename + suffix, mimetype=mimetype, max_age=31536000)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIST_DIR, filename, mimetype=mimetype, max_age=31536000)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Vorgerenderte Hauptseite (FAST_STARTUP): Das Template wird einmal mit einem Platzhalter gerendert
+# (bzw. aus APP_SHELL_CACHE_FILE gelesen) und pro Request nur der Benutzername eingesetzt
+APP_SHELL_TEMPLATE = 'podcast_tracker-DB.html'
+APP_SHELL_USERNAME_PLACEHOLDER = '__PODTRACKER_USERNAME__'
+_app_shell_html = None
+
+def render_app_shell():
+    return render_template(APP_SHELL_TEMPLATE, username=APP_SHELL_USERNAME_PLACEHOLDER)
+
+def app_shell_html():
+    global _app_shell_html
+    if _app_shell_html is None:
+        cache_file = app.config['APP_SHELL_CACHE_FILE']
+        template_file = os.path.join(basedir, APP_SHELL_TEMPLATE)
+        # Veraltet, sobald Template oder Asset-Manifest (gehashte URLs) neuer sind
+        sources_mtime = max([os.path.getmtime(template_file)] +
+                            ([os.path.getmtime(ASSET_MANIFEST_FILE)] if os.path.exists(ASSET_MANIFEST_FILE) else []))
+        if cache_file and os.path.exists(cache_file) and os.path.getmtime(cache_file) >= sources_mtime:
+            with open(cache_file, encoding='utf-8') as f:
+                _app_shell_html = f.read()
+        else:
+            _app_shell_html = render_app_shell()
+    return _app_shell_html
+
 @app.route('/')
 @login_required
 def index():
+    if app.config['FAST_STARTUP']:
+        html_page = app_shell_html().replace(APP_SHELL_USERNAME_PLACEHOLDER, str(escape(current_user.username)))
+        return Response(html_page, mimetype='text/html')
     return render_template('podcast_tracker-DB.html', username=current_user.username)
 
+@app.route('/healthz')
+def healthz():
+    """
+    Readiness-Probe (ohne Login): antwortet mit 200, sobald die Datenbank erreichbar ist, sonst mit 503.
+    """
+    try:
+        db.session.execute(db.text('SELECT 1'))
+        return jsonify({"status": "ok"}), 200
+    except Exception as e:
+        db.session.rollback()
+        # Details nur ins Log, die Probe ist ohne Login erreichbar
+        print(f"Healthcheck fehlgeschlagen: {e}")
+        return jsonify({"status": "error"}), 503
+
+def pool_metrics(engine):
+    pool = engine.pool
+    metrics = {'pool': type(pool).__name__, 'url': engine.url.render_as_string(hide_password=True)}
+    if hasattr(pool, 'checkedout'):
+        metrics.update({'size': pool.size(), 'checked_in': pool.checkedin(), 'checked_out': pool.checkedout(),
+                        'overflow': pool.overflow()})
+    return metrics
+
+@app.route('/api/db-pool', methods=['GET'])
+@admin_required
+def get_db_pool_metrics():
+    """
+    Auslastung der Verbindungspools (primäre Engine und Lese-Engine) und Anzahl der Pool-Timeouts.
+    Nur für Administratoren, da die Engine-URLs (Host, Datenbank, Benutzer) enthalten sind.
+    """
+    engines = {'primary': pool_metrics(db.engine)}
+    if READ_BIND in db.engines:
+        engines[READ_BIND] = pool_metrics(db.engines[READ_BIND])
+    return jsonify({'engines': engines, 'pool_timeouts': POOL_TIMEOUTS['total']})
+
+if app.config['PROFILING_ENABLED']:
+    import cProfile
+
+    @app.before_request
+    def start_request_profile():
+        if request.headers.get('X-Profile') != '1' and request.args.get('_profile') != '1':
+            return
+        if not is_admin(current_user):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError: # Es läuft bereits ein anderer Profiler
+            return
+        g.profiler = profiler
+        g.profile_started = time.perf_counter()
+
+    @app.after_request
+    def finish_request_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        name = f"{datetime.now():%Y%m%d-%H%M%S}-{request.endpoint or 'unbekannt'}-{secrets.token_hex(3)}.prof"
+        path = request.path
+        started = g.pop('profile_started')
+
+        def save_profile():
+            profiler.disable()
+            os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+            profiler.dump_stats(os.path.join(app.config['PROFILE_DIR'], name))
+            print(f"Profil für {path} ({(time.perf_counter() - started) * 1000:.0f} ms) gespeichert: {name}")
+
+        # Erst nach dem Senden des Bodys beenden, damit gestreamte Antworten (z.B. /episodes) mitgemessen werden
+        response.call_on_close(save_profile)
+        response.headers['X-Profile-Id'] = name
+        return response
+
+    @app.route('/admin/profiles/<name>', methods=['GET'])
+    @admin_required
+    def get_request_profile(name):
+        """
+        Liefert ein gespeichertes Profil als .prof-Datei (für pstats/snakeviz)
+        oder mit ?format=text die teuersten Funktionen nach kumulierter Zeit (Parameter: limit).
+        """
+        if request.args.get('format') != 'text':
+            return send_from_directory(app.config['PROFILE_DIR'], name, mimetype='application/octet-stream', as_attachment=True)
+        import io
+        import pstats
+        path = safe_join(app.config['PROFILE_DIR'], name)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).sort_stats('cumulative').print_stats(request.args.get('limit', 40, type=int))
+        return Response(output.getvalue(), mimetype='text/plain')
+
+if app.config['SLOW_QUERY_MS'] > 0:
+    import traceback
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._podtracker_started = time.perf_counter()
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_podtracker_started', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < app.config['SLOW_QUERY_MS']:
+            return
+        # Aufrufstelle: innerster Frame in app.py außerhalb dieses Hooks
+        call_site = next((f"{os.path.basename(frame.filename)}:{frame.lineno} ({frame.name})"
+                          for frame in reversed(traceback.extract_stack()[:-1]) if frame.filename == __file__), 'unbekannt')
+        parameters_text = repr(parameters)
+        if len(parameters_text) > 500:
+            parameters_text = parameters_text[:500] + '...'
+        print(f"Langsame Abfrage ({elapsed_ms:.0f} ms{', executemany' if executemany else ''}) in {call_site}: "
+              f"{' '.join(statement.split())} | Parameter: {parameters_text}")
+
+if app.config['TRACEMALLOC_FRAMES'] > 0:
+    import tracemalloc
+    tracemalloc.start(app.config['TRACEMALLOC_FRAMES'])
+    # Letzter Snapshot als Vergleichsbasis für ?compare=1
+    MEMORY_SNAPSHOTS = {}
+
+    @app.route('/admin/memory', methods=['GET'])
+    @admin_required
+    def get_memory_snapshot():
+        """
+        Größte Allokationen (nach Quellzeile) laut tracemalloc. Mit ?compare=1 das Wachstum seit dem vorherigen Aufruf.
+        Parameter: limit (Standard: 25)
+        """
+        limit = request.args.get('limit', 25, type=int)
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        previous = MEMORY_SNAPSHOTS.get('last')
+        MEMORY_SNAPSHOTS['last'] = snapshot
+        compare = request.args.get('compare') == '1' and previous is not None
+        if compare:
+            top = [{'location': str(stat.traceback[0]), 'size_kib': round(stat.size / 1024, 1),
+                    'size_diff_kib': round(stat.size_diff / 1024, 1), 'count': stat.count, 'count_diff': stat.count_diff}
+                   for stat in snapshot.compare_to(previous, 'lineno')[:limit]]
+        else:
+            top = [{'location': str(stat.traceback[0]), 'size_kib': round(stat.size / 1024, 1), 'count': stat.count}
+                   for stat in snapshot.statistics('lineno')[:limit]]
+        current, peak = tracemalloc.get_traced_memory()
+        return jsonify({'traced_kib': round(current / 1024, 1), 'peak_kib': round(peak / 1024, 1), 'compared': compare, 'top': top})
+
+# Analyse-Snapshots: exportierte Spalten pro Tabelle (ohne Beschreibungen und benutzerspezifische Zustände)
+SNAPSHOT_TABLES = {
+    'podcast_feed': (PodcastFeed, ('id', 'url', 'canonical_url', 'name', 'topic', 'is_active', 'last_checked', 'homepage_url',
+                                   'itunes_available', 'youtube_available', 'availability_checked', 'last_full_parse', 'updated_at')),
+    'episode': (Episode, ('id', 'feed_id', 'title', 'pub_date', 'url', 'is_favorite', 'host', 'itunes_url', 'updated_at')),
+}
+SNAPSHOT_LOCK = threading.Lock()
+
+def load_snapshot_manifest():
+    path = os.path.join(app.config['SNAPSHOT_DIR'], 'manifest.json')
+    if not os.path.exists(path):
+        return {'runs': []}
+    with open(path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+def snapshot_batches(model, columns, since, batch_size):
+    """
+    Liest die Spalten einer Tabelle mit serverseitigem Cursor in Batches (Listen von Tupeln),
+    mit since nur seitdem geänderte Zeilen.
+    """
+    table = model.__table__
+    statement = db.select(*[table.c[name] for name in columns])
+    if since is not None:
+        statement = statement.where(table.c.updated_at >= since)
+    result = read_session().execute(statement.execution_options(yield_per=batch_size))
+    for batch in result.partitions():
+        yield [tuple(row) for row in batch]
+
+def write_snapshot_part(path, file_format, model, columns, batches):
+    """
+    Schreibt die Batches nach path, als Parquet (spaltenweise, zstd, eine Row Group pro Batch) oder als gzip-CSV.
+    Gibt die Anzahl der Zeilen zurück.
+    """
+    rows = 0
+    if file_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        arrow_types = {int: pa.int64(), bool: pa.bool_(), datetime: pa.timestamp('us')}
+        schema = pa.schema([(name, arrow_types.get(model.__table__.c[name].type.python_type, pa.string())) for name in columns])
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            for batch in batches:
+                arrays = [pa.array([row[index] for row in batch], type=field.type) for index, field in enumerate(schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(batch)
+        return rows
+    import csv
+    import gzip
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows([value.isoformat() if isinstance(value, datetime) else value for value in row] for row in batch)
+            rows += len(batch)
+    return rows
+
+def run_snapshot(full=False, batch_size=None):
+    """
+    Exportiert PodcastFeed und Episode nach SNAPSHOT_DIR/<tabelle>/part-<lauf>.<format> und trägt den Lauf in
+    manifest.json ein. Nach einem ersten (oder mit full erzwungenen) vollständigen Lauf enthalten weitere Teile nur
+    Zeilen, deren updated_at seit dem Start des vorherigen Laufs liegt. Zeilen können daher in mehreren Teilen
+    vorkommen (je id gilt die neueste; Episoden behalten ihre ID auch bei vollständigen Parses, siehe
+    merge_parsed_episodes); gelöschte Zeilen bleiben bis zum nächsten vollständigen Lauf enthalten.
+    Gibt den Manifest-Eintrag des Laufs zurück.
+    """
+    import importlib.util
+    batch_size = batch_size or app.config['SNAPSHOT_BATCH_SIZE']
+    directory = app.config['SNAPSHOT_DIR']
+    manifest = load_snapshot_manifest()
+    since = None if full or not manifest['runs'] else datetime.fromisoformat(manifest['runs'][-1]['started_at'])
+    started_at = datetime.now()
+    run_id = started_at.strftime('%Y%m%dT%H%M%S%f')
+    file_format = 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'csv.gz'
+    run = {'id': run_id, 'started_at': started_at.isoformat(), 'since': since.isoformat() if since else None,
+           'full': since is None, 'format': file_format, 'files': {}, 'rows': {}}
+    for table_name, (model, columns) in SNAPSHOT_TABLES.items():
+        os.makedirs(os.path.join(directory, table_name), exist_ok=True)
+        relative_path = f"{table_name}/part-{run_id}.{file_format}"
+        path = os.path.join(directory, relative_path)
+        # Erst temporär schreiben, damit Leser nie eine halbe Datei sehen
+        run['rows'][table_name] = write_snapshot_part(path + '.tmp', file_format, model, columns,
+                                                      snapshot_batches(model, columns, since, batch_size))
+        os.replace(path + '.tmp', path)
+        run['files'][table_name] = relative_path
+    manifest['runs'].append(run)
+    manifest_path = os.path.join(directory, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return run
+
+@app.route('/admin/snapshots', methods=['GET'])
+@admin_required
+def get_snapshots():
+    """Bisherige Snapshot-Läufe (manifest.json); die Dateien liegen unter /admin/snapshots/<datei>."""
+    return jsonify(load_snapshot_manifest())
+
+@app.route('/admin/snapshots', methods=['POST'])
+@admin_required
+def create_snapshot():
+    """Erstellt einen (inkrementellen, mit ?full=1 vollständigen) Snapshot von PodcastFeed und Episode."""
+    if not SNAPSHOT_LOCK.acquire(blocking=False):
+        return jsonify({"error": "Es läuft bereits ein Snapshot."}), 409
+    try:
+        run = run_snapshot(full=request.args.get('full') == '1')
+        return jsonify(run), 201
+    except Exception as e:
+        return jsonify({"error": f"Fehler beim Erstellen des Snapshots: {str(e)}"}), 500
+    finally:
+        SNAPSHOT_LOCK.release()
+
+@app.route('/admin/snapshots/<path:filename>', methods=['GET'])
+@admin_required
+def download_snapshot_file(filename):
+    return send_from_directory(app.config['SNAPSHOT_DIR'], filename, mimetype='application/octet-stream', as_attachment=True)
+
 @app.route('/impressum')
 def impressum():
     return render_template('Impressum.html')
@@ -504,43 +2874,95 @@ def favicon():
 @app.route('/feeds', methods=['GET'])
 @login_required
 def get_feeds():
-    feeds = PodcastFeed.query.all()
-    # Füge die Anzahl der Episoden pro Feed hinzu
-    feeds_data = []
-    for feed in feeds:
-        episodes_count = Episode.query.filter_by(feed_id=feed.id).count()
-        feeds_data.append({
-            'id': feed.id,
-            'url': feed.url,
-            'name': feed.name,
-            'topic': feed.topic,
-            'is_active': feed.is_active,
-            'last_checked': feed.last_checked.isoformat(),
-            'homepage_url': feed.homepage_url,
-            'episodes_count': episodes_count,
-            'itunes_available': feed.itunes_available,
-            'youtube_available': feed.youtube_available,
-            'availability_checked': feed.availability_checked.isoformat() if feed.availability_checked else None
-        })
-    return jsonify(feeds_data)
+    # Episodenanzahl aus den vorberechneten FeedStats statt einer gruppierten Abfrage über alle Episoden;
+    # nur abonnierte Feeds, mit dem Aktiv-Status des Abonnements
+    rows = read_session().query(
+        PodcastFeed.id, PodcastFeed.url, PodcastFeed.name, PodcastFeed.topic, Subscription.is_active,
+        PodcastFeed.last_checked, PodcastFeed.homepage_url, db.func.coalesce(FeedStats.episode_count, 0),
+        PodcastFeed.itunes_available, PodcastFeed.youtube_available, PodcastFeed.availability_checked
+    ).join(Subscription, db.and_(Subscription.feed_id == PodcastFeed.id, Subscription.user_id == current_user.id)) \
+        .outerjoin(FeedStats, FeedStats.feed_id == PodcastFeed.id).all()
+    keys = ('id', 'url', 'name', 'topic', 'is_active', 'last_checked', 'homepage_url', 'episodes_count',
+            'itunes_available', 'youtube_available', 'availability_checked')
+    return Response(json_dumps([dict(zip(keys, row)) for row in rows]), mimetype='application/json')
 
 @app.route('/episodes', methods=['GET'])
 @login_required
 def get_episodes():
-    # Nur Episoden von aktiven Feeds anzeigen
-    episodes = db.session.query(Episode, PodcastFeed.name.label('podcast_name')).join(PodcastFeed).filter(PodcastFeed.is_active == True).all()
-    episodes_data = [{
-        'id': ep.Episode.id,
-        'feed_id': ep.Episode.feed_id,
-        'title': ep.Episode.title,
-        'description': ep.Episode.description,
-        'pub_date': ep.Episode.pub_date.isoformat(),
-        'url': ep.Episode.url,
-        'is_favorite': ep.Episode.is_favorite,
-        'host': ep.Episode.host,
-        'podcast_name': ep.podcast_name # Füge den Podcast-Namen hinzu
-    } for ep in episodes]
-    return jsonify(episodes_data)
+    # Nur Episoden aktiv abonnierter Feeds anzeigen, Favorit und Host mit dem Stand des Benutzers
+    # Es werden nur die benötigten Spalten als Tupel gelesen (keine ORM-Objekte, keine Beschreibung,
+    # siehe /episodes/<id>/description) und das JSON-Array blockweise gestreamt
+    statement = db.select(
+        Episode.id, Episode.feed_id, Episode.title, Episode.pub_date, Episode.url,
+        db.func.coalesce(UserEpisodeState.is_favorite, Episode.is_favorite), db.func.coalesce(UserEpisodeState.host, Episode.host),
+        PodcastFeed.name
+    ).join(PodcastFeed) \
+        .join(Subscription, db.and_(Subscription.feed_id == Episode.feed_id, Subscription.user_id == current_user.id)) \
+        .outerjoin(UserEpisodeState, db.and_(UserEpisodeState.episode_id == Episode.id, UserEpisodeState.user_id == current_user.id)) \
+        .where(Subscription.is_active == True)
+    keys = ('id', 'feed_id', 'title', 'pub_date', 'url', 'is_favorite', 'host', 'podcast_name')
+    return Response(stream_statement_json(keys, statement, app.config['LISTING_CHUNK_SIZE']), mimetype='application/json')
+
+@app.route('/episodes/<int:episode_id>/description', methods=['GET'])
+@login_required
+def get_episode_description(episode_id):
+    """
+    Liefert die Beschreibung einer einzelnen Episode (HTML und reiner Text) bei Bedarf.
+    """
+    session = read_session()
+    episode = session.get(Episode, episode_id)
+    if episode is None:
+        abort(404)
+    stored = session.get(EpisodeDescription, episode_id)
+    if stored is not None:
+        description_html = zlib.decompress(stored.html_compressed).decode('utf-8') if stored.html_compressed else ''
+        description_text = stored.plain_text
+    else:
+        # Noch nicht ausgelagert (DESCRIPTION_STORAGE='inline' oder vor compact-descriptions)
+        description_html = episode.description or ''
+        description_text = strip_html(description_html)
+    return jsonify({'id': episode.id, 'html': description_html, 'text': description_text})
+
+@app.route('/episodes/archive', methods=['GET'])
+@login_required
+def get_archived_episodes():
+    """
+    Archivierte Episoden abonnierter Feeds (nur auf ausdrückliche Anfrage, nicht Teil von /episodes).
+    Parameter: feed_id, before=<Datum>, limit (Standard 100, max. 1000), offset
+    """
+    try:
+        before = datetime.fromisoformat(request.args['before']) if request.args.get('before') else None
+    except ValueError:
+        return jsonify({"error": "'before' muss ein ISO-8601-Datum sein (z.B. 2023-12-31)."}), 400
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    query = read_session().query(
+        ArchivedEpisode.id, ArchivedEpisode.episode_id, ArchivedEpisode.feed_id, ArchivedEpisode.title, ArchivedEpisode.pub_date,
+        ArchivedEpisode.url, ArchivedEpisode.host, PodcastFeed.name, ArchivedEpisode.archived_at
+    ).join(PodcastFeed, PodcastFeed.id == ArchivedEpisode.feed_id) \
+        .join(Subscription, db.and_(Subscription.feed_id == ArchivedEpisode.feed_id, Subscription.user_id == current_user.id))
+    if request.args.get('feed_id', type=int) is not None:
+        query = query.filter(ArchivedEpisode.feed_id == request.args.get('feed_id', type=int))
+    if before is not None:
+        query = query.filter(ArchivedEpisode.pub_date < before)
+    rows = query.order_by(ArchivedEpisode.pub_date.desc()).limit(limit).offset(offset).all()
+    keys = ('id', 'episode_id', 'feed_id', 'title', 'pub_date', 'url', 'host', 'podcast_name', 'archived_at')
+    return Response(json_dumps([dict(zip(keys, row)) for row in rows]), mimetype='application/json')
+
+@app.route('/episodes/archive/<int:archived_id>/restore', methods=['POST'])
+@login_required
+def restore_episode(archived_id):
+    archived = ArchivedEpisode.query.filter(ArchivedEpisode.id == archived_id,
+                                            ArchivedEpisode.feed_id.in_(user_feed_ids_query(current_user.id))).first_or_404()
+    try:
+        episode = restore_archived_episode(archived)
+        db.session.commit()
+        flash("Episode aus dem Archiv wiederhergestellt", "success")
+        return jsonify({"message": "Episode aus dem Archiv wiederhergestellt", "id": episode.id}), 200
+    except Exception as e:
+        db.session.rollback()
+        flash(f"Fehler beim Wiederherstellen der Episode: {str(e)}", "danger")
+        return jsonify({"error": f"Fehler beim Wiederherstellen der Episode: {str(e)}"}), 500
 
 @app.route('/add_feed', methods=['POST'])
 @login_required
@@ -551,43 +2973,33 @@ def add_feed():
     if not feed_url:
         return jsonify({"error": "RSS Feed URL ist erforderlich."}), 400
 
-    # Prüfen, ob der Feed bereits existiert
-    existing_feed = PodcastFeed.query.filter_by(url=feed_url).first()
+    # Prüfen, ob der Feed bereits existiert (auch unter einer gleichwertigen URL, siehe canonicalize_feed_url)
+    existing_feed = find_feed_by_url(feed_url)
+    if existing_feed and db.session.get(Subscription, (current_user.id, existing_feed.id)) is None:
+        # Von anderen Benutzern bereits abgerufen: nur abonnieren, ohne den Feed erneut zu laden
+        try:
+            subscribe_feed(current_user.id, existing_feed.id)
+            db.session.commit()
+            flash(f"Feed '{existing_feed.name}' abonniert!", "success")
+            return jsonify({"message": f"Feed '{existing_feed.name}' abonniert!"}), 201
+        except Exception as e:
+            db.session.rollback()
+            flash(f"Fehler beim Abonnieren des Feeds: {str(e)}", "danger")
+            return jsonify({"error": f"Fehler beim Abonnieren des Feeds: {str(e)}"}), 500
     if existing_feed:
         # Wenn der Feed existiert, aktualisiere ihn stattdessen
         feed_data, episodes_data = parse_rss_feed(feed_url)
         if feed_data:
             try:
-                # KORREKTUR: Name und Topic nur aktualisieren, wenn sie nicht bereits manuell gesetzt wurden
-                if existing_feed.name == existing_feed.url or existing_feed.name == 'Unbekannter Podcast':
-                    existing_feed.name = feed_data.get('name', existing_feed.name)
-                
-                # Wenn das geparste Thema nicht None ist UND das aktuelle Thema leer ist ODER es gleich dem geparsten ist
-                if feed_data.get('topic') is not None and (existing_feed.topic is None or existing_feed.topic == feed_data['topic']):
-                    existing_feed.topic = feed_data['topic']
-
-                existing_feed.homepage_url = feed_data.get('homepage_url', existing_feed.homepage_url)
-                existing_feed.last_checked = datetime.now()
-                db.session.commit()
-
-                # Bestehende Episoden für diesen Feed löschen, um Duplikate zu vermeiden
-                Episode.query.filter_by(feed_id=existing_feed.id).delete()
-                db.session.commit() # Commit, um Löschung zu persistieren
-
-                # Neue Episoden hinzufügen
-                for ep_data in episodes_data:
-                    ep_data['feed_id'] = existing_feed.id 
-                    ep_data.setdefault('is_favorite', False)
-                    episode = Episode(**ep_data)
-                    db.session.add(episode)
-                
-                db.session.commit()
+                # Metadaten aktualisieren und Episoden über merge_parsed_episodes abgleichen (bekannte aktualisieren, neue anlegen)
+                feed_name, _ = run_ingest_write(store_parsed_feed, existing_feed.id, feed_data, episodes_data)
+                ensure_websub_subscription(existing_feed.id, feed_data)
                 
                 # Verfügbarkeits-Check für bestehenden Feed durchführen
                 update_feed_availability(existing_feed.id)
                 
-                flash(f"Feed '{existing_feed.name}' und Episoden erfolgreich aktualisiert (existierte bereits)!", "success")
-                return jsonify({"message": f"Feed '{existing_feed.name}' und Episoden erfolgreich aktualisiert (existierte bereits)!"}), 200
+                flash(f"Feed '{feed_name}' und Episoden erfolgreich aktualisiert (existierte bereits)!", "success")
+                return jsonify({"message": f"Feed '{feed_name}' und Episoden erfolgreich aktualisiert (existierte bereits)!"}), 200
             except Exception as e:
                 db.session.rollback()
                 flash(f"Fehler beim Aktualisieren des Feeds: {str(e)}", "danger")
@@ -598,32 +3010,30 @@ def add_feed():
 
     feed_data, episodes_data = parse_rss_feed(feed_url)
 
-    if feed_data:
+    duplicate_feed = find_duplicate_feed(feed_data) if feed_data else None
+    if duplicate_feed:
+        # Derselbe Podcast unter anderer URL (Weiterleitung oder gleicher Inhalt): vorhandenen Feed abonnieren
         try:
-            new_feed = PodcastFeed(
-                url=feed_url,
-                name=feed_data.get('name', 'Unbekannter Podcast'),
-                topic=feed_data.get('topic'),
-                is_active=True,
-                last_checked=datetime.now(),
-                homepage_url=feed_data.get('homepage_url')
-            )
-            db.session.add(new_feed)
+            subscribed = subscribe_feed(current_user.id, duplicate_feed.id)
             db.session.commit()
+            message = f"Feed existiert bereits als '{duplicate_feed.name}' ({duplicate_feed.url})" + (" und wurde abonniert!" if subscribed else ".")
+            flash(message, "success" if subscribed else "info")
+            return jsonify({"message": message, "id": duplicate_feed.id}), 201 if subscribed else 200
+        except Exception as e:
+            db.session.rollback()
+            flash(f"Fehler beim Abonnieren des Feeds: {str(e)}", "danger")
+            return jsonify({"error": f"Fehler beim Abonnieren des Feeds: {str(e)}"}), 500
 
-            for ep_data in episodes_data:
-                ep_data['feed_id'] = new_feed.id 
-                ep_data.setdefault('is_favorite', False)
-                episode = Episode(**ep_data)
-                db.session.add(episode)
-            
-            db.session.commit()
+    if feed_data:
+        try:
+            new_feed_id, new_feed_name = run_ingest_write(create_feed, feed_url, feed_data, episodes_data, subscriber_id=current_user.id)
+            ensure_websub_subscription(new_feed_id, feed_data)
             
             # Verfügbarkeits-Check für neuen Feed durchführen
-            update_feed_availability(new_feed.id)
+            update_feed_availability(new_feed_id)
             
-            flash(f"Feed '{new_feed.name}' und Episoden erfolgreich hinzugefügt!", "success")
-            return jsonify({"message": f"Feed '{new_feed.name}' und Episoden erfolgreich hinzugefügt!"}), 201
+            flash(f"Feed '{new_feed_name}' und Episoden erfolgreich hinzugefügt!", "success")
+            return jsonify({"message": f"Feed '{new_feed_name}' und Episoden erfolgreich hinzugefügt!"}), 201
         except Exception as e:
             db.session.rollback()
             flash(f"Fehler beim Hinzufügen des Feeds: {str(e)}", "danger")
@@ -636,48 +3046,23 @@ def add_feed():
 @app.route('/feeds/<int:feed_id>/refresh_episodes', methods=['POST'])
 @login_required
 def refresh_episodes_endpoint(feed_id): # Umbenannt von update_feed zur besseren Unterscheidung
-    feed = PodcastFeed.query.get_or_404(feed_id)
+    feed = subscribed_feed_or_404(feed_id, current_user.id)
     feed_url = feed.url
 
-    parsed_feed_data, episodes_data = parse_rss_feed(feed_url)
+    # Standardmäßig inkrementell; ?full=1 erzwingt einen vollständigen Parse
+    known_keys, newer_than = incremental_parse_args(feed_id, force_full=request.args.get('full') == '1')
+    incremental = known_keys is not None
+    parsed_feed_data, episodes_data = parse_rss_feed(feed_url, known_keys, newer_than)
 
     if parsed_feed_data:
         try:
-            # KORREKTUR: Name und Topic nur aktualisieren, wenn sie nicht bereits manuell gesetzt wurden
-            # Dies verhindert das Überschreiben manueller Edits durch den RSS-Feed
-            if feed.name == feed.url or feed.name == 'Unbekannter Podcast':
-                 feed.name = parsed_feed_data.get('name', feed.name)
-            
-            if parsed_feed_data.get('topic') is not None and (feed.topic is None or feed.topic == parsed_feed_data['topic']):
-                 feed.topic = parsed_feed_data['topic']
-
-            feed.homepage_url = parsed_feed_data.get('homepage_url', feed.homepage_url)
-            feed.last_checked = datetime.now()
-            db.session.commit()
-
-            # Alle alten Episoden löschen und neue hinzufügen, um Duplikate zu vermeiden und Aktualität zu gewährleisten
-            Episode.query.filter_by(feed_id=feed.id).delete()
-            db.session.commit()
-
-            new_episodes_count = 0
-            for ep_data in episodes_data:
-                ep_data['feed_id'] = feed.id
-                ep_data.setdefault('is_favorite', False)
-                
-                # DEBUGGING PRINT: Überprüfen, ob Host vorhanden ist, bevor er hinzugefügt wird
-                print(f"DEBUG: Preparing episode '{ep_data.get('title', 'N/A')}', Host: '{ep_data.get('host', 'N/A')}' for feed ID {feed.id}")
-                
-                episode = Episode(**ep_data)
-                db.session.add(episode)
-                new_episodes_count += 1
-            
-            db.session.commit()
-            print(f"DEBUG: Committed {new_episodes_count} new episodes for feed {feed.id}. Host values should be saved.") # DEBUG Print
-            flash(f"Feed '{feed.name}' und Episoden erfolgreich aktualisiert!", "success")
-            return jsonify({"message": f"Feed '{feed.name}' und Episoden erfolgreich aktualisiert!"}), 200
+            feed_name, _ = run_ingest_write(store_parsed_feed, feed_id, parsed_feed_data, episodes_data, incremental=incremental)
+            ensure_websub_subscription(feed_id, parsed_feed_data)
+            flash(f"Feed '{feed_name}' und Episoden erfolgreich aktualisiert!", "success")
+            return jsonify({"message": f"Feed '{feed_name}' und Episoden erfolgreich aktualisiert!"}), 200
         except Exception as e:
             db.session.rollback()
-            print(f"ERROR: Failed to update feed {feed.id} - {str(e)}") # DEBUG Print for exceptions
+            print(f"ERROR: Failed to update feed {feed_id} - {str(e)}") # DEBUG Print for exceptions
             flash(f"Fehler beim Aktualisieren des Feeds: {str(e)}", "danger")
             return jsonify({"error": f"Fehler beim Aktualisieren des Feeds: {str(e)}"}), 500
     else:
@@ -689,24 +3074,39 @@ def refresh_episodes_endpoint(feed_id): # Umbenannt von update_feed zur besseren
 @app.route('/feeds/<int:feed_id>', methods=['PUT'])
 @login_required
 def update_feed_metadata(feed_id): # Umbenannt zur besseren Unterscheidung
-    feed = PodcastFeed.query.get_or_404(feed_id)
+    feed = subscribed_feed_or_404(feed_id, current_user.id)
+    subscription = db.session.get(Subscription, (current_user.id, feed.id))
     data = request.json
     
+    if any(field in data for field in ('url', 'name', 'topic', 'homepage_url')) and feeds_shared_with_others([feed.id]):
+        return jsonify({"error": SHARED_FEED_ERROR}), 403
+    if 'url' in data:
+        other_feed = find_feed_by_url(data['url'])
+        if other_feed is not None and other_feed.id != feed.id:
+            return jsonify({"error": f"Ein Feed mit dieser URL existiert bereits: '{other_feed.name}' ({other_feed.url})"}), 409
+
     try:
         if 'url' in data: # Normalerweise nicht über PUT geändert
             feed.url = data['url']
+            feed.canonical_url = canonicalize_feed_url(data['url'])
         if 'name' in data: # Wird direkt vom Frontend geändert
             feed.name = data['name']
         if 'topic' in data: # Wird direkt vom Frontend geändert
             feed.topic = data['topic']
-        if 'is_active' in data:
-            feed.is_active = bool(data['is_active'])
+        if 'is_active' in data: # Gilt nur für das eigene Abonnement
+            subscription.is_active = bool(data['is_active'])
+            db.session.flush()
+            sync_feed_active([feed.id])
         if 'homepage_url' in data: # Normalerweise nicht über PUT geändert
             feed.homepage_url = data['homepage_url']
+        if ('name' in data or 'topic' in data) and saved_searches_exist():
+            # Name und Thema gehen in die Suchkriterien ein: Episoden dieses Feeds neu bewerten
+            db.session.flush()
+            evaluate_saved_searches([episode_id for (episode_id,) in db.session.query(Episode.id).filter_by(feed_id=feed.id)])
         
         db.session.commit()
         flash("Feed aktualisiert", "success")
-        return jsonify({"message": "Feed aktualisiert", "id": feed.id, "url": feed.url, "name": feed.name, "topic": feed.topic, "is_active": feed.is_active, "homepage_url": feed.homepage_url}), 200
+        return jsonify({"message": "Feed aktualisiert", "id": feed.id, "url": feed.url, "name": feed.name, "topic": feed.topic, "is_active": subscription.is_active, "homepage_url": feed.homepage_url}), 200
     except Exception as e:
         db.session.rollback()
         flash(f"Fehler beim Aktualisieren des Feeds: {str(e)}", "danger")
@@ -716,9 +3116,10 @@ def update_feed_metadata(feed_id): # Umbenannt zur besseren Unterscheidung
 @app.route('/delete_feed/<int:feed_id>', methods=['DELETE'])
 @login_required
 def delete_feed(feed_id):
-    feed = PodcastFeed.query.get_or_404(feed_id)
+    # Kündigt das Abonnement; der Feed selbst wird erst ohne verbleibende Abonnenten gelöscht
+    feed = subscribed_feed_or_404(feed_id, current_user.id)
     try:
-        db.session.delete(feed)
+        unsubscribe_feeds(current_user.id, [feed.id])
         db.session.commit()
         flash("Feed erfolgreich gelöscht", "success")
         return jsonify({"message": "Feed erfolgreich gelöscht"}), 204
@@ -727,27 +3128,79 @@ def delete_feed(feed_id):
         flash(f"Fehler beim Löschen des Feeds: {str(e)}", "danger")
         return jsonify({"error": f"Fehler beim Löschen des Feeds: {str(e)}"}), 500
 
+@app.route('/feeds/bulk', methods=['POST'])
+@login_required
+def bulk_update_feeds():
+    """
+    Deaktiviert, aktiviert oder löscht (kündigt) mehrere Abonnements des Benutzers in einem Request.
+    Feeds ohne verbleibende Abonnenten werden gelöscht; ihre Episoden entfernt die Datenbank per ON DELETE CASCADE.
+    """
+    data = request.json or {}
+    feed_ids = data.get('feed_ids')
+    action = data.get('action')
+
+    if not isinstance(feed_ids, list) or not feed_ids:
+        return jsonify({"error": "Liste 'feed_ids' ist erforderlich."}), 400
+    if action not in ['deactivate', 'activate', 'delete']:
+        return jsonify({"error": "Ungültige Aktion. Erlaubt: deactivate, activate, delete."}), 400
+
+    try:
+        feed_ids = [int(feed_id) for feed_id in feed_ids]
+    except (TypeError, ValueError):
+        return jsonify({"error": "'feed_ids' darf nur ganze Zahlen enthalten."}), 400
+
+    try:
+        if action == 'delete':
+            affected = unsubscribe_feeds(current_user.id, feed_ids)
+            message = f"{affected} Feeds gelöscht"
+        else:
+            affected = Subscription.query.filter(Subscription.user_id == current_user.id, Subscription.feed_id.in_(feed_ids)) \
+                .update({Subscription.is_active: action == 'activate'}, synchronize_session=False)
+            sync_feed_active(feed_ids)
+            message = f"{affected} Feeds {'aktiviert' if action == 'activate' else 'deaktiviert'}"
+        db.session.commit()
+        flash(message, "success")
+        return jsonify({"message": message, "action": action, "affected": affected}), 200
+    except Exception as e:
+        db.session.rollback()
+        flash(f"Fehler bei der Sammelaktion für Feeds: {str(e)}", "danger")
+        return jsonify({"error": f"Fehler bei der Sammelaktion für Feeds: {str(e)}"}), 500
+
 @app.route('/episodes/<int:episode_id>', methods=['PUT']) # Vereinfacht von update_episode
 @login_required
 def update_episode(episode_id):
-    episode = Episode.query.get_or_404(episode_id)
+    episode = subscribed_episode_or_404(episode_id, current_user.id)
     data = request.json
+    if any(field in data for field in EDITABLE_EPISODE_FIELDS if field not in USER_EPISODE_FIELDS) \
+            and feeds_shared_with_others([episode.feed_id]):
+        return jsonify({"error": SHARED_FEED_ERROR}), 403
+    old_stats_values = (episode.pub_date, episode.is_favorite)
     
     # Aktualisiere nur die erlaubten Felder
     if 'title' in data:
         episode.title = data['title']
     if 'description' in data:
-        episode.description = data['description']
+        if app.config['DESCRIPTION_STORAGE'] == 'compressed':
+            set_episode_description(episode.id, data['description'])
+        else:
+            episode.description = data['description']
     if 'pub_date' in data:
         episode.pub_date = parse_date(data['pub_date'])
     if 'url' in data:
         episode.url = data['url']
-    if 'is_favorite' in data:
-        episode.is_favorite = data['is_favorite']
-    if 'host' in data:
-        episode.host = data['host']
 
     try:
+        # Favorit und Host gelten nur für den aktuellen Benutzer
+        set_user_episode_state(current_user.id, [episode.id], {field: data[field] for field in USER_EPISODE_FIELDS if field in data})
+        if (episode.pub_date, episode.is_favorite) != old_stats_values:
+            update_feed_stats(episode.feed_id, [old_stats_values], sign=-1)
+            update_feed_stats(episode.feed_id, [(episode.pub_date, episode.is_favorite)])
+        if any(field in data for field in SAVED_SEARCH_EPISODE_FIELDS):
+            db.session.flush()
+            evaluate_saved_searches([episode.id])
+        if any(field in data for field in EPISODE_EVENT_FIELDS if field not in USER_EPISODE_FIELDS) and webhooks_active():
+            db.session.flush()
+            record_episode_changes([episode.id])
         db.session.commit()
         flash("Episode erfolgreich aktualisiert!", "success")
         return jsonify({"message": "Episode erfolgreich aktualisiert!"}), 200
@@ -756,11 +3209,188 @@ def update_episode(episode_id):
         flash(f"Fehler beim Aktualisieren der Episode: {str(e)}", "danger")
         return jsonify({"error": f"Fehler beim Aktualisieren der Episode: {str(e)}"}), 500
 
+# Felder, die über die Episoden-Endpunkte geändert werden dürfen
+EDITABLE_EPISODE_FIELDS = ['title', 'description', 'pub_date', 'url', 'is_favorite', 'host']
+
+def _episode_changes(data):
+    """
+    Filtert ein Änderungs-Dict auf die erlaubten Episodenfelder und prüft und konvertiert die Werte (z.B. pub_date).
+    Wirft ValueError mit einer Fehlermeldung bei ungültigen Werten.
+    """
+    changes = {}
+    for field in EDITABLE_EPISODE_FIELDS:
+        if field in data:
+            value = data[field]
+            if field == 'pub_date':
+                value = parse_date(value, strict=True) if isinstance(value, str) else None
+                if value is None:
+                    raise ValueError("'pub_date' muss ein gültiges Datum sein (z.B. 2024-01-31T10:00:00).")
+            elif field == 'is_favorite':
+                value = bool(value)
+            elif field == 'title' and not isinstance(value, str):
+                raise ValueError("'title' muss ein Text sein.")
+            elif value is not None and not isinstance(value, str):
+                raise ValueError(f"'{field}' muss ein Text oder null sein.")
+            changes[field] = value
+    return changes
+
+@app.route('/episodes/batch', methods=['POST'])
+@login_required
+def batch_update_episodes():
+    """
+    Wendet viele Episoden-Änderungen in einer Transaktion als Bulk-SQL an.
+    Erwartet 'updates' (Liste von {"id": ..., <feld>: <wert>}) und/oder
+    'filter' + 'set' (z.B. {"filter": {"feed_id": 3}, "set": {"host": "Neuer Host"}}).
+    Nur Episoden abonnierter Feeds; is_favorite und host werden für den aktuellen Benutzer gespeichert.
+    """
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Erwartet wird ein JSON-Objekt mit 'updates' und/oder 'filter' und 'set'."}), 400
+    updates = data.get('updates') or []
+    filter_data = data.get('filter')
+    set_data = data.get('set')
+
+    if not updates and not filter_data:
+        return jsonify({"error": "'updates' oder 'filter' mit 'set' ist erforderlich."}), 400
+    if not isinstance(updates, list):
+        return jsonify({"error": "'updates' muss eine Liste sein."}), 400
+
+    # Gleiche Änderungen zusammenfassen, damit z.B. 200 Favoriten ein einziges UPDATE ergeben
+    grouped_ids = {}
+    for entry in updates:
+        try:
+            episode_id = int(entry['id'])
+        except (TypeError, ValueError, KeyError):
+            return jsonify({"error": f"Ungültiger Eintrag in 'updates': {entry}"}), 400
+        try:
+            changes = _episode_changes(entry)
+        except ValueError as e:
+            return jsonify({"error": f"Ungültiger Eintrag in 'updates' (ID {episode_id}): {e}"}), 400
+        if not changes:
+            continue
+        grouped_ids.setdefault(tuple(sorted(changes.items())), []).append(episode_id)
+
+    filter_changes = None
+    if filter_data:
+        if not isinstance(filter_data, dict) or not isinstance(set_data or {}, dict):
+            return jsonify({"error": "'filter' und 'set' müssen Objekte sein."}), 400
+        try:
+            filter_changes = _episode_changes(set_data or {})
+        except ValueError as e:
+            return jsonify({"error": f"Ungültiger Wert in 'set': {e}"}), 400
+        if not filter_changes:
+            return jsonify({"error": "'set' enthält keine änderbaren Felder."}), 400
+        if not any(key in filter_data for key in ['feed_id', 'ids', 'host']):
+            return jsonify({"error": "'filter' benötigt mindestens feed_id, ids oder host."}), 400
+        try:
+            filter_feed_id = int(filter_data['feed_id']) if 'feed_id' in filter_data else None
+            filter_ids = [int(episode_id) for episode_id in filter_data['ids']] if 'ids' in filter_data else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "'filter.feed_id' muss eine ganze Zahl und 'filter.ids' eine Liste ganzer Zahlen sein."}), 400
+        if 'host' in filter_data and not isinstance(filter_data['host'], str):
+            return jsonify({"error": "'filter.host' muss ein Text sein."}), 400
+        if 'description' in filter_changes and app.config['DESCRIPTION_STORAGE'] == 'compressed':
+            return jsonify({"error": "Beschreibungen können im komprimierten Modus nicht per Filter gesetzt werden."}), 400
+
+    try:
+        # Feeds, deren Statistiken nach Änderungen an pub_date oder is_favorite neu berechnet werden
+        stats_feed_ids = set()
+        # Episoden, die danach gegen die gespeicherten Suchen neu bewertet werden
+        search_episode_ids = set()
+        track_searches = saved_searches_exist()
+        # Episoden, zu denen 'changed'-Ereignisse für Webhooks geschrieben werden
+        event_episode_ids = set()
+        track_events = webhooks_active()
+        user_feed_ids = user_feed_ids_query(current_user.id)
+        updated_by_id = 0
+        for changes, episode_ids in grouped_ids.items():
+            changes = dict(changes)
+            episode_ids = [episode_id for (episode_id,) in db.session.query(Episode.id).filter(
+                Episode.id.in_(episode_ids), Episode.feed_id.in_(user_feed_ids))]
+            user_changes = {field: changes.pop(field) for field in USER_EPISODE_FIELDS if field in changes}
+            if changes and feeds_shared_with_others(feed_id for (feed_id,) in db.session.query(Episode.feed_id).filter(Episode.id.in_(episode_ids)).distinct()):
+                db.session.rollback()
+                return jsonify({"error": SHARED_FEED_ERROR}), 403
+            if user_changes:
+                set_user_episode_state(current_user.id, episode_ids, user_changes)
+                if track_searches:
+                    search_episode_ids.update(episode_ids)
+                if not changes:
+                    updated_by_id += len(episode_ids)
+                    continue
+            if 'description' in changes and app.config['DESCRIPTION_STORAGE'] == 'compressed':
+                description = changes.pop('description')
+                for episode_id in episode_ids:
+                    set_episode_description(episode_id, description)
+                if not changes:
+                    updated_by_id += len(episode_ids)
+                    continue
+            if 'pub_date' in changes:
+                stats_feed_ids.update(feed_id for (feed_id,) in db.session.query(Episode.feed_id).filter(Episode.id.in_(episode_ids)).distinct())
+            if track_searches and any(field in changes for field in SAVED_SEARCH_EPISODE_FIELDS):
+                search_episode_ids.update(episode_ids)
+            if track_events and any(field in changes for field in EPISODE_EVENT_FIELDS):
+                event_episode_ids.update(episode_ids)
+            updated_by_id += Episode.query.filter(Episode.id.in_(episode_ids)).update(changes, synchronize_session=False)
+
+        updated_by_filter = 0
+        if filter_changes:
+            filter_changes = dict(filter_changes)
+            query = Episode.query.filter(Episode.feed_id.in_(user_feed_ids))
+            if filter_feed_id is not None:
+                query = query.filter(Episode.feed_id == filter_feed_id)
+            if filter_ids is not None:
+                query = query.filter(Episode.id.in_(filter_ids))
+            if 'host' in filter_data:
+                # Filter auf den für den Benutzer wirksamen Host
+                query = query.outerjoin(UserEpisodeState, db.and_(UserEpisodeState.episode_id == Episode.id, UserEpisodeState.user_id == current_user.id)) \
+                    .filter(db.func.coalesce(UserEpisodeState.host, Episode.host) == filter_data['host'])
+            matched_ids = [episode_id for (episode_id,) in query.with_entities(Episode.id)]
+            user_changes = {field: filter_changes.pop(field) for field in USER_EPISODE_FIELDS if field in filter_changes}
+            if filter_changes and feeds_shared_with_others(feed_id for (feed_id,) in query.with_entities(Episode.feed_id).distinct()):
+                db.session.rollback()
+                return jsonify({"error": SHARED_FEED_ERROR}), 403
+            if user_changes:
+                set_user_episode_state(current_user.id, matched_ids, user_changes)
+                updated_by_filter = len(matched_ids)
+            if track_searches and (user_changes or any(field in filter_changes for field in SAVED_SEARCH_EPISODE_FIELDS)):
+                search_episode_ids.update(matched_ids)
+            if filter_changes:
+                query = Episode.query.filter(Episode.id.in_(matched_ids))
+                if 'pub_date' in filter_changes:
+                    stats_feed_ids.update(feed_id for (feed_id,) in query.with_entities(Episode.feed_id).distinct())
+                if track_events and any(field in filter_changes for field in EPISODE_EVENT_FIELDS):
+                    event_episode_ids.update(matched_ids)
+                updated_by_filter = query.update(filter_changes, synchronize_session=False)
+
+        refresh_feed_stats(stats_feed_ids)
+        evaluate_saved_searches(search_episode_ids)
+        record_episode_changes(event_episode_ids)
+        db.session.commit()
+        message = f"{updated_by_id + updated_by_filter} Episoden aktualisiert"
+        flash(message, "success")
+        return jsonify({
+            "message": message,
+            "updated_by_id": updated_by_id,
+            "updated_by_filter": updated_by_filter,
+            "statements": len(grouped_ids) + (1 if filter_data else 0)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        flash(f"Fehler beim Aktualisieren der Episoden: {str(e)}", "danger")
+        return jsonify({"error": f"Fehler beim Aktualisieren der Episoden: {str(e)}"}), 500
+
 @app.route('/delete_episode/<int:episode_id>', methods=['DELETE'])
 @login_required
 def delete_episode(episode_id):
-    episode = Episode.query.get_or_404(episode_id)
+    episode = subscribed_episode_or_404(episode_id, current_user.id)
+    if feeds_shared_with_others([episode.feed_id]):
+        return jsonify({"error": SHARED_FEED_ERROR}), 403
     try:
+        update_feed_stats(episode.feed_id, [(episode.pub_date, episode.is_favorite)], sign=-1)
+        if webhooks_active():
+            add_episode_events([('removed', episode.feed_id, episode.id, {
+                'id': episode.id, 'feed_id': episode.feed_id, 'key': episode_key(episode.url, episode.title)})])
         db.session.delete(episode)
         db.session.commit()
         flash("Episode erfolgreich gelöscht", "success")
@@ -770,12 +3400,302 @@ def delete_episode(episode_id):
         flash(f"Fehler beim Löschen der Episode: {str(e)}", "danger")
         return jsonify({"error": f"Fehler beim Löschen der Episode: {str(e)}"}), 500
 
+@app.route('/api/stats', methods=['GET'])
+@login_required
+def get_stats():
+    """
+    Facetten (Episoden und Favoriten pro Thema und Podcast) und Veröffentlichungs-Histogramme pro Feed und Thema.
+    Liest ausschließlich die vorberechneten Tabellen FeedStats und EpisodePublishBucket.
+    Parameter: granularity=week|month (Standard: month), since=<Datum>, feed_id=<ID> (Histogramm nur für diesen Feed)
+    """
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in STATS_GRANULARITIES:
+        return jsonify({"error": f"Ungültige granularity. Erlaubt: {', '.join(STATS_GRANULARITIES)}."}), 400
+    try:
+        since = datetime.fromisoformat(request.args['since']) if request.args.get('since') else None
+    except ValueError:
+        return jsonify({"error": "'since' muss ein ISO-8601-Datum sein (z.B. 2024-01-31)."}), 400
+    feed_id_filter = request.args.get('feed_id', type=int)
+
+    session = read_session()
+    # FeedStats zählt die gemeinsamen Favoriten (Episode.is_favorite); abweichende Favoriten des Benutzers als Korrektur
+    favorite_delta = dict(session.query(Episode.feed_id, db.func.sum(db.case(
+        (db.and_(UserEpisodeState.is_favorite == True, Episode.is_favorite.isnot(True)), 1),
+        (db.and_(UserEpisodeState.is_favorite == False, Episode.is_favorite == True), -1), else_=0))
+    ).join(Episode, Episode.id == UserEpisodeState.episode_id).filter(
+        UserEpisodeState.user_id == current_user.id, UserEpisodeState.is_favorite.isnot(None)).group_by(Episode.feed_id))
+    podcasts = {}
+    topics = {}
+    for feed_id, name, topic, is_active, episode_count, favorite_count, latest_pub_date in session.query(
+            PodcastFeed.id, PodcastFeed.name, PodcastFeed.topic, Subscription.is_active,
+            db.func.coalesce(FeedStats.episode_count, 0), db.func.coalesce(FeedStats.favorite_count, 0), FeedStats.latest_pub_date
+    ).join(Subscription, db.and_(Subscription.feed_id == PodcastFeed.id, Subscription.user_id == current_user.id)) \
+            .outerjoin(FeedStats, FeedStats.feed_id == PodcastFeed.id):
+        favorite_count += favorite_delta.get(feed_id, 0)
+        podcasts[feed_id] = {'feed_id': feed_id, 'name': name, 'topic': topic, 'is_active': is_active,
+                             'episodes': episode_count, 'favorites': favorite_count,
+                             'latest_pub_date': latest_pub_date, 'timeline': []}
+        topic_entry = topics.setdefault(topic, {'topic': topic, 'feeds': 0, 'episodes': 0, 'favorites': 0, 'timeline': Counter()})
+        topic_entry['feeds'] += 1
+        topic_entry['episodes'] += episode_count
+        topic_entry['favorites'] += favorite_count
+
+    buckets = session.query(EpisodePublishBucket.feed_id, EpisodePublishBucket.bucket_start, EpisodePublishBucket.episode_count) \
+        .filter(EpisodePublishBucket.granularity == granularity)
+    if since is not None:
+        buckets = buckets.filter(EpisodePublishBucket.bucket_start >= publish_bucket_start(since, granularity))
+    if feed_id_filter is not None:
+        buckets = buckets.filter(EpisodePublishBucket.feed_id == feed_id_filter)
+    buckets = buckets.filter(EpisodePublishBucket.feed_id.in_(list(podcasts)))
+    for feed_id, bucket_start, episode_count in buckets.order_by(EpisodePublishBucket.bucket_start):
+        podcast = podcasts.get(feed_id)
+        if podcast is None:
+            continue
+        podcast['timeline'].append([bucket_start.isoformat(), episode_count])
+        topics[podcast['topic']]['timeline'][bucket_start] += episode_count
+
+    for topic_entry in topics.values():
+        topic_entry['timeline'] = [[bucket_start.isoformat(), count] for bucket_start, count in sorted(topic_entry['timeline'].items())]
+
+    return Response(json_dumps({
+        'granularity': granularity,
+        'episodes': sum(podcast['episodes'] for podcast in podcasts.values()),
+        'favorites': sum(podcast['favorites'] for podcast in podcasts.values()),
+        'topics': sorted(topics.values(), key=lambda entry: -entry['episodes']),
+        'podcasts': sorted(podcasts.values(), key=lambda entry: -entry['episodes'])
+    }), mimetype='application/json')
+
+SAVED_SEARCH_FIELDS = ('name', 'topic', 'feed_id', 'search_term', 'is_favorite', 'max_age_days')
+
+def saved_search_to_dict(search, unread_count=0):
+    return {
+        'id': search.id, 'name': search.name, 'topic': search.topic, 'feed_id': search.feed_id,
+        'search_term': search.search_term, 'is_favorite': search.is_favorite, 'max_age_days': search.max_age_days,
+        'created_at': search.created_at.isoformat() if search.created_at else None, 'unread_count': unread_count
+    }
+
+def _apply_saved_search_fields(search, data):
+    """
+    Übernimmt die Kriterien aus einem Request-Dict. Gibt eine Fehlermeldung zurück oder None.
+    """
+    for field in SAVED_SEARCH_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        if value == '':
+            value = None
+        try:
+            if field in ('feed_id', 'max_age_days') and value is not None:
+                value = int(value)
+        except (TypeError, ValueError):
+            return f"'{field}' muss eine ganze Zahl sein."
+        if field == 'is_favorite' and value is not None:
+            value = bool(value)
+        setattr(search, field, value)
+    if not search.name:
+        return "'name' ist erforderlich."
+    return None
+
+def _unread_counts(search_ids):
+    if not search_ids:
+        return {}
+    return dict(db.session.query(SavedSearchEpisode.saved_search_id, db.func.count()).filter(
+        SavedSearchEpisode.saved_search_id.in_(search_ids), SavedSearchEpisode.is_read.is_(False)
+    ).group_by(SavedSearchEpisode.saved_search_id).all())
+
+@app.route('/saved_searches', methods=['GET'])
+@login_required
+def get_saved_searches():
+    searches = SavedSearch.query.filter_by(user_id=current_user.id).order_by(SavedSearch.name).all()
+    unread = _unread_counts([search.id for search in searches])
+    return jsonify([saved_search_to_dict(search, unread.get(search.id, 0)) for search in searches])
+
+@app.route('/saved_searches/unread_counts', methods=['GET'])
+@login_required
+def get_saved_search_unread_counts():
+    """
+    Anzahl ungelesener Treffer je gespeicherter Suche des Benutzers ({"<id>": <Anzahl>}).
+    """
+    search_ids = [search_id for (search_id,) in db.session.query(SavedSearch.id).filter_by(user_id=current_user.id)]
+    unread = _unread_counts(search_ids)
+    return jsonify({str(search_id): unread.get(search_id, 0) for search_id in search_ids})
+
+@app.route('/saved_searches', methods=['POST'])
+@login_required
+def create_saved_search():
+    search = SavedSearch(user_id=current_user.id)
+    error = _apply_saved_search_fields(search, request.json or {})
+    if error:
+        return jsonify({"error": error}), 400
+    try:
+        db.session.add(search)
+        db.session.flush()
+        rebuild_saved_search(search)
+        db.session.commit()
+        flash(f"Gespeicherte Suche '{search.name}' angelegt", "success")
+        return jsonify(saved_search_to_dict(search, _unread_counts([search.id]).get(search.id, 0))), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Anlegen der gespeicherten Suche: {str(e)}"}), 500
+
+@app.route('/saved_searches/<int:search_id>', methods=['PUT'])
+@login_required
+def update_saved_search(search_id):
+    search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first_or_404()
+    error = _apply_saved_search_fields(search, request.json or {})
+    if error:
+        db.session.rollback()
+        return jsonify({"error": error}), 400
+    try:
+        db.session.flush()
+        rebuild_saved_search(search)
+        db.session.commit()
+        return jsonify(saved_search_to_dict(search, _unread_counts([search.id]).get(search.id, 0))), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Aktualisieren der gespeicherten Suche: {str(e)}"}), 500
+
+@app.route('/saved_searches/<int:search_id>', methods=['DELETE'])
+@login_required
+def delete_saved_search(search_id):
+    search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first_or_404()
+    try:
+        db.session.delete(search)
+        db.session.commit()
+        return jsonify({"message": "Gespeicherte Suche gelöscht"}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Löschen der gespeicherten Suche: {str(e)}"}), 500
+
+@app.route('/saved_searches/<int:search_id>/episodes', methods=['GET'])
+@login_required
+def get_saved_search_episodes(search_id):
+    """
+    Treffer einer gespeicherten Suche: Lookup über den Primärschlüssel von SavedSearchEpisode, ohne erneutes Filtern.
+    Parameter: unread=1 (nur ungelesene)
+    """
+    search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first_or_404()
+    statement = db.select(
+        Episode.id, Episode.feed_id, Episode.title, Episode.pub_date, Episode.url,
+        db.func.coalesce(UserEpisodeState.is_favorite, Episode.is_favorite), db.func.coalesce(UserEpisodeState.host, Episode.host),
+        PodcastFeed.name, SavedSearchEpisode.is_read
+    ).join(SavedSearchEpisode, SavedSearchEpisode.episode_id == Episode.id) \
+        .join(PodcastFeed, PodcastFeed.id == Episode.feed_id) \
+        .outerjoin(UserEpisodeState, db.and_(UserEpisodeState.episode_id == Episode.id, UserEpisodeState.user_id == current_user.id)) \
+        .where(SavedSearchEpisode.saved_search_id == search.id)
+    if search.max_age_days:
+        statement = statement.where(Episode.pub_date >= datetime.now() - timedelta(days=search.max_age_days))
+    if request.args.get('unread') == '1':
+        statement = statement.where(SavedSearchEpisode.is_read.is_(False))
+    keys = ('id', 'feed_id', 'title', 'pub_date', 'url', 'is_favorite', 'host', 'podcast_name', 'is_read')
+    return Response(stream_statement_json(keys, statement.order_by(Episode.pub_date.desc()), app.config['LISTING_CHUNK_SIZE']),
+                    mimetype='application/json')
+
+@app.route('/saved_searches/<int:search_id>/read', methods=['POST'])
+@login_required
+def mark_saved_search_read(search_id):
+    """
+    Markiert Treffer als gelesen: die übergebenen 'episode_ids' oder (ohne Angabe) alle.
+    """
+    search = SavedSearch.query.filter_by(id=search_id, user_id=current_user.id).first_or_404()
+    data = request.get_json(silent=True) or {}
+    try:
+        query = SavedSearchEpisode.query.filter_by(saved_search_id=search.id, is_read=False)
+        if data.get('episode_ids') is not None:
+            query = query.filter(SavedSearchEpisode.episode_id.in_([int(episode_id) for episode_id in data['episode_ids']]))
+        marked = query.update({SavedSearchEpisode.is_read: True}, synchronize_session=False)
+        db.session.commit()
+        return jsonify({"marked": marked, "unread_count": _unread_counts([search.id]).get(search.id, 0)}), 200
+    except (TypeError, ValueError):
+        db.session.rollback()
+        return jsonify({"error": "'episode_ids' muss eine Liste ganzer Zahlen sein."}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Markieren als gelesen: {str(e)}"}), 500
+
+def webhook_to_dict(endpoint):
+    return {
+        'id': endpoint.id, 'url': endpoint.url, 'is_active': endpoint.is_active, 'last_event_id': endpoint.last_event_id,
+        'failure_count': endpoint.failure_count, 'next_attempt_at': endpoint.next_attempt_at,
+        'last_error': endpoint.last_error, 'last_delivered_at': endpoint.last_delivered_at
+    }
+
+def create_webhook(url, secret=None):
+    """
+    Legt einen Webhook an (ohne Commit). Er erhält nur Ereignisse ab jetzt, nicht den Rückstand der Outbox.
+    """
+    endpoint = WebhookEndpoint(url=url, secret=secret or secrets.token_hex(32),
+                               last_event_id=db.session.query(db.func.coalesce(db.func.max(EpisodeEvent.id), 0)).scalar())
+    db.session.add(endpoint)
+    return endpoint
+
+@app.route('/webhooks', methods=['GET'])
+@admin_required
+def get_webhooks():
+    pending = dict(db.session.query(WebhookEndpoint.id, db.func.count(EpisodeEvent.id))
+                   .outerjoin(EpisodeEvent, EpisodeEvent.id > WebhookEndpoint.last_event_id).group_by(WebhookEndpoint.id).all())
+    return Response(json_dumps([dict(webhook_to_dict(endpoint), pending_events=pending.get(endpoint.id, 0))
+                                for endpoint in WebhookEndpoint.query.order_by(WebhookEndpoint.id)]), mimetype='application/json')
+
+@app.route('/webhooks', methods=['POST'])
+@admin_required
+def add_webhook():
+    """
+    Registriert einen Webhook. Das Secret (angegeben oder generiert) wird nur in dieser Antwort zurückgegeben.
+    """
+    data = request.json or {}
+    url = (data.get('url') or '').strip()
+    if not url.startswith(('http://', 'https://')):
+        return jsonify({"error": "'url' muss eine http(s)-URL sein."}), 400
+    if WebhookEndpoint.query.filter_by(url=url).first():
+        return jsonify({"error": "Dieser Webhook existiert bereits."}), 409
+    try:
+        endpoint = create_webhook(url, data.get('secret'))
+        db.session.commit()
+        return Response(json_dumps(dict(webhook_to_dict(endpoint), secret=endpoint.secret)), status=201, mimetype='application/json')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Anlegen des Webhooks: {str(e)}"}), 500
+
+@app.route('/webhooks/<int:webhook_id>', methods=['PUT'])
+@admin_required
+def update_webhook(webhook_id):
+    """
+    Aktiviert/deaktiviert einen Webhook ('is_active') oder setzt den Backoff zurück ('retry_now').
+    """
+    endpoint = WebhookEndpoint.query.get_or_404(webhook_id)
+    data = request.json or {}
+    try:
+        if 'is_active' in data:
+            endpoint.is_active = bool(data['is_active'])
+        if data.get('retry_now'):
+            endpoint.next_attempt_at = None
+        db.session.commit()
+        return Response(json_dumps(webhook_to_dict(endpoint)), mimetype='application/json')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Aktualisieren des Webhooks: {str(e)}"}), 500
+
+@app.route('/webhooks/<int:webhook_id>', methods=['DELETE'])
+@admin_required
+def delete_webhook(webhook_id):
+    endpoint = WebhookEndpoint.query.get_or_404(webhook_id)
+    try:
+        db.session.delete(endpoint)
+        db.session.commit()
+        return jsonify({"message": "Webhook gelöscht"}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Fehler beim Löschen des Webhooks: {str(e)}"}), 500
+
 @app.route('/import_feeds_xlsx', methods=['POST'])
 @login_required
 def import_feeds_xlsx():
     data = request.json
     imported_count = 0
     errors = []
+    pending = []
+    pending_urls = set() # Kanonische URLs der in diesem Import neu angelegten Feeds
 
     for feed_data_entry in data:
         feed_url = feed_data_entry.get('url')
@@ -783,7 +3703,18 @@ def import_feeds_xlsx():
             errors.append(f"Skipping entry due to missing URL: {feed_data_entry}")
             continue
 
-        existing_feed = PodcastFeed.query.filter_by(url=feed_url).first()
+        existing_feed = find_feed_by_url(feed_url)
+        if existing_feed is None and canonicalize_feed_url(feed_url) in pending_urls:
+            errors.append(f"Skipping duplicate URL in import: {feed_url}")
+            continue
+
+        if existing_feed and db.session.get(Subscription, (current_user.id, existing_feed.id)) is None:
+            # Bereits von anderen Benutzern abgerufen: nur abonnieren, ohne den Feed erneut zu laden
+            subscribe_feed(current_user.id, existing_feed.id, feed_data_entry.get('is_active', True))
+            db.session.commit()
+            imported_count += 1
+            print(f"Import success: Feed '{existing_feed.name}' (URL: {feed_url}) abonniert.")
+            continue
 
         # Versuche, den Feed zu parsen, auch wenn er schon existiert, um aktuelle Daten zu bekommen
         parsed_feed_data, episodes_data = parse_rss_feed(feed_url)
@@ -792,52 +3723,39 @@ def import_feeds_xlsx():
             errors.append(f"Failed to parse RSS feed or invalid URL for {feed_url}")
             continue
 
-        try:
-            if existing_feed:
-                # KORREKTUR: Name und Topic nur aktualisieren, wenn sie nicht bereits manuell gesetzt wurden
-                if existing_feed.name == existing_feed.url or existing_feed.name == 'Unbekannter Podcast':
-                    existing_feed.name = parsed_feed_data.get('name', existing_feed.name)
-                
-                if parsed_feed_data.get('topic') is not None and (existing_feed.topic is None or existing_feed.topic == parsed_feed_data['topic']):
-                    existing_feed.topic = parsed_feed_data['topic']
+        duplicate_feed = None if existing_feed else find_duplicate_feed(parsed_feed_data)
+        if duplicate_feed:
+            # Derselbe Podcast unter anderer URL: vorhandenen Feed abonnieren statt ihn doppelt anzulegen
+            subscribe_feed(current_user.id, duplicate_feed.id, feed_data_entry.get('is_active', True))
+            db.session.commit()
+            imported_count += 1
+            print(f"Import success: {feed_url} ist ein Duplikat von Feed '{duplicate_feed.name}' (URL: {duplicate_feed.url}), abonniert.")
+            continue
 
-                existing_feed.is_active = feed_data_entry.get('is_active', existing_feed.is_active)
-                existing_feed.last_checked = datetime.now()
-                existing_feed.homepage_url = parsed_feed_data.get('homepage_url', existing_feed.homepage_url)
-                db.session.commit()
+        # Schreibjobs werden abgegeben, während bereits der nächste Feed geladen wird
+        if existing_feed:
+            future = submit_ingest_write(store_parsed_feed, existing_feed.id, parsed_feed_data, episodes_data)
+            pending.append((future, feed_url, 'aktualisiert', existing_feed.id, feed_data_entry.get('is_active')))
+        else:
+            # Verwende Parsed-Namen, sonst URL
+            future = submit_ingest_write(create_feed, feed_url, parsed_feed_data, episodes_data, default_name=feed_url,
+                                         is_active=feed_data_entry.get('is_active', True), subscriber_id=current_user.id)
+            pending_urls.add(canonicalize_feed_url(feed_url))
+            pending.append((future, feed_url, 'hinzugefügt', None, feed_data_entry.get('is_active')))
 
-                # Delete old episodes for this feed to avoid duplicates during import
-                Episode.query.filter_by(feed_id=existing_feed.id).delete()
+    for future, feed_url, action, feed_id, is_active in pending:
+        try:
+            result = future.result()
+            if action == 'aktualisiert':
+                feed_name = result[0]
+                # Aktiv-Status aus der Importdatei gilt für das Abonnement des importierenden Benutzers
+                # (neue Feeds abonniert create_feed bereits im Schreibjob)
+                subscribe_feed(current_user.id, feed_id, is_active)
                 db.session.commit()
-
-                current_feed = existing_feed
-                message = f"Feed '{current_feed.name}' (URL: {feed_url}) aktualisiert."
             else:
-                # Add new feed
-                new_feed = PodcastFeed(
-                    url=feed_url,
-                    name=parsed_feed_data.get('name', feed_url), # Verwende Parsed-Namen, sonst URL
-                    topic=parsed_feed_data.get('topic'),
-                    is_active=feed_data_entry.get('is_active', True),
-                    last_checked=datetime.now(),
-                    homepage_url=parsed_feed_data.get('homepage_url')
-                )
-                db.session.add(new_feed)
-                db.session.commit()
-                current_feed = new_feed
-                message = f"Feed '{current_feed.name}' (URL: {feed_url}) hinzugefügt."
-            
+                feed_name = result[1]
             imported_count += 1
-            print(f"Import success: {message}")
-
-            # Add episodes for the current feed
-            for ep_data in episodes_data:
-                ep_data['feed_id'] = current_feed.id
-                ep_data.setdefault('is_favorite', False)
-                episode = Episode(**ep_data)
-                db.session.add(episode)
-            db.session.commit()
-
+            print(f"Import success: Feed '{feed_name}' (URL: {feed_url}) {action}.")
         except Exception as e:
             db.session.rollback()
             errors.append(f"Database error for {feed_url}: {str(e)}")
@@ -850,7 +3768,7 @@ def import_feeds_xlsx():
 @app.route('/export_feeds_xlsx', methods=['GET'])
 @login_required
 def export_feeds_xlsx():
-    feeds = PodcastFeed.query.all()
+    feeds = PodcastFeed.query.filter(PodcastFeed.id.in_(user_feed_ids_query(current_user.id))).all()
     # Daten für XLSX aufbereiten (Beispielstruktur)
     data = []
     for feed in feeds:
@@ -872,12 +3790,13 @@ def export_feeds_xlsx():
 @login_required
 def check_availability(feed_id):
     """
-    Prüft die Verfügbarkeit eines Feeds auf iTunes und YouTube
+    Prüft die Verfügbarkeit eines abonnierten Feeds auf iTunes und YouTube
     """
+    subscribed_feed_or_404(feed_id, current_user.id)
     try:
         success = update_feed_availability(feed_id)
         if success:
-            feed = PodcastFeed.query.get(feed_id)
+            feed = db.session.get(PodcastFeed, feed_id)
             return jsonify({
                 "success": True,
                 "itunes_available": feed.itunes_available,
@@ -899,27 +3818,73 @@ def check_availability(feed_id):
         }), 500
 
 
+@app.route('/api/check-availability', methods=['POST'])
+@login_required
+def check_availability_bulk():
+    """
+    Prüft die Verfügbarkeit aller Feeds mit veralteter Prüfung parallel (siehe recheck_stale_availability).
+    Optionale Parameter (JSON): max_age_hours, limit, time_budget, concurrency
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        options = {key: (float(data[key]) if key in ('max_age_hours', 'time_budget') else int(data[key]))
+                   for key in ('max_age_hours', 'limit', 'time_budget', 'concurrency') if data.get(key) is not None}
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Ungültige Parameter: max_age_hours, limit, time_budget und concurrency müssen Zahlen sein."}), 400
+
+    try:
+        summary = recheck_stale_availability(**options)
+        message = f"Verfügbarkeit für {summary['updated']} von {summary['selected']} Feeds aktualisiert"
+        if summary['budget_exhausted']:
+            message += " (Zeitbudget erschöpft, restliche Feeds beim nächsten Lauf)"
+        flash(message, "success")
+        return jsonify({"success": True, "message": message, **summary}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Fehler bei der Sammel-Verfügbarkeitsprüfung: {str(e)}")
+        return jsonify({"success": False, "error": f"Fehler bei der Verfügbarkeitsprüfung: {str(e)}"}), 500
+
+def subscribed_episode_link_row(episode_id):
+    """
+    Liest alles für einen Plattform-Link einer abonnierten Episode mit einer Abfrage (404, wenn nicht abonniert).
+    """
+    row = db.session.query(Episode.feed_id, Episode.title, Episode.itunes_url, PodcastFeed.name, PodcastFeed.episode_links_checked) \
+        .join(PodcastFeed, PodcastFeed.id == Episode.feed_id) \
+        .join(Subscription, db.and_(Subscription.feed_id == Episode.feed_id, Subscription.user_id == current_user.id)) \
+        .filter(Episode.id == episode_id).first()
+    if row is None:
+        abort(404)
+    return row
+
 @app.route('/api/search-itunes/<int:episode_id>', methods=['POST'])
 @login_required
 def search_itunes(episode_id):
     """
-    Sucht eine Episode auf iTunes basierend auf Podcast-Name und Episode-Titel
+    Liefert den direkten Apple-Podcasts-Link einer Episode aus der Datenbank. Ist die letzte Prüfung des Feeds
+    abgelaufen (siehe episode_links_stale), werden die Links des ganzen Feeds mit einem Lookup neu aufgelöst;
+    ohne Treffer bleibt es bei der iTunes-Suche nach Podcast-Name und Episoden-Titel.
     """
+    feed_id, episode_title, itunes_url, podcast_name, links_checked = subscribed_episode_link_row(episode_id)
     try:
-        episode = Episode.query.get_or_404(episode_id)
-        feed = PodcastFeed.query.get_or_404(episode.feed_id)
-        
-        # Erstelle iTunes-Suchquery
-        podcast_name = feed.name or "Unknown Podcast"
-        episode_title = episode.title or "Unknown Episode"
-        
+        if episode_links_stale(links_checked, itunes_url is not None) and resolve_episode_links(feed_id) is not None:
+            itunes_url = db.session.query(Episode.itunes_url).filter_by(id=episode_id).scalar()
+
+        if itunes_url:
+            return jsonify({
+                "success": True,
+                "url": itunes_url,
+                "direct": True,
+                "message": f"Apple-Podcasts-Link für '{episode_title}' gefunden"
+            }), 200
+
         # iTunes-Suchquery zusammenstellen
-        search_query = f"{podcast_name} {episode_title}".replace(" ", "+")
+        search_query = f"{podcast_name or 'Unknown Podcast'} {episode_title or 'Unknown Episode'}".replace(" ", "+")
         itunes_search_url = f"https://podcasts.apple.com/search?term={search_query}"
         
         return jsonify({
             "success": True,
             "url": itunes_search_url,
+            "direct": False,
             "message": f"iTunes-Suche für '{episode_title}' gestartet"
         }), 200
         
@@ -936,17 +3901,12 @@ def search_itunes(episode_id):
 def search_youtube(episode_id):
     """
     Sucht eine Episode auf YouTube basierend auf Podcast-Name und Episode-Titel
+    (YouTube bietet keinen schlüssellosen Lookup pro Sendung; es bleibt bei der Suche)
     """
+    _, episode_title, _, podcast_name, _ = subscribed_episode_link_row(episode_id)
     try:
-        episode = Episode.query.get_or_404(episode_id)
-        feed = PodcastFeed.query.get_or_404(episode.feed_id)
-        
-        # Erstelle YouTube-Suchquery
-        podcast_name = feed.name or "Unknown Podcast"
-        episode_title = episode.title or "Unknown Episode"
-        
         # YouTube-Suchquery zusammenstellen
-        search_query = f"{podcast_name} {episode_title}".replace(" ", "+")
+        search_query = f"{podcast_name or 'Unknown Podcast'} {episode_title or 'Unknown Episode'}".replace(" ", "+")
         youtube_search_url = f"https://www.youtube.com/results?search_query={search_query}"
         
         return jsonify({
@@ -963,12 +3923,71 @@ def search_youtube(episode_id):
         }), 500
 
 
+@app.route('/websub/callback/<int:feed_id>', methods=['GET'])
+def websub_verify(feed_id):
+    """
+    WebSub-Verifizierung: Der Hub bestätigt (Un-)Abonnements mit einer Challenge, die zurückgegeben werden muss.
+    """
+    subscription = WebSubSubscription.query.filter_by(feed_id=feed_id).first()
+    mode = request.args.get('hub.mode')
+    if subscription is None or request.args.get('hub.topic') != subscription.topic_url:
+        return "Unbekanntes Abonnement", 404
+
+    if mode == 'denied':
+        subscription.state = 'denied'
+        db.session.commit()
+        print(f"WebSub-Abonnement für Feed {feed_id} abgelehnt: {request.args.get('hub.reason')}")
+        return "", 200
+    if mode != 'subscribe' or subscription.state not in ('pending', 'active'):
+        return "Unerwarteter Modus", 404
+
+    lease_seconds = request.args.get('hub.lease_seconds', type=int) or app.config['WEBSUB_LEASE_SECONDS']
+    subscription.state = 'active'
+    subscription.lease_expires_at = datetime.now() + timedelta(seconds=lease_seconds)
+    db.session.commit()
+    return Response(request.args.get('hub.challenge', ''), mimetype='text/plain')
+
+@app.route('/websub/callback/<int:feed_id>', methods=['POST'])
+def websub_receive(feed_id):
+    """
+    Empfängt vom Hub gepushte Feed-Inhalte (mit HMAC-Signatur) und übernimmt neue Episoden direkt.
+    """
+    subscription = WebSubSubscription.query.filter_by(feed_id=feed_id, state='active').first()
+    if subscription is None:
+        return "Unbekanntes Abonnement", 410
+
+    body = request.get_data()
+    signature = request.headers.get('X-Hub-Signature', '')
+    algorithm, _, received_digest = signature.partition('=')
+    if algorithm not in ('sha1', 'sha256', 'sha384', 'sha512') or not hmac.compare_digest(
+            hmac.new(subscription.secret.encode('utf-8'), body, algorithm).hexdigest(), received_digest):
+        # Laut Spezifikation trotzdem 2xx antworten, den Inhalt aber verwerfen
+        print(f"WebSub-Push für Feed {feed_id} mit ungültiger Signatur verworfen.")
+        return "", 202
+
+    try:
+        # Gepushte Inhalte enthalten oft nur die neuesten Einträge: immer nur neue Episoden anhängen
+        known_keys, newer_than = known_episode_keys(feed_id)
+        feed_data, episodes_data = parse_feed_content(body, known_keys, newer_than)
+        _, new_episodes_count = run_ingest_write(store_parsed_feed, feed_id, feed_data, episodes_data, incremental=True)
+        subscription.last_push_at = datetime.now()
+        db.session.commit()
+        print(f"WebSub-Push für Feed {feed_id}: {new_episodes_count} neue Episoden.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Fehler beim Verarbeiten des WebSub-Pushs für Feed {feed_id}: {e}")
+    return "", 202
+
 @app.route('/update_availability/<int:feed_id>', methods=['POST'])
 @login_required
 def update_availability(feed_id):
     """
-    Aktualisiert die Verfügbarkeitsinformationen für einen Feed manuell
+    Aktualisiert die Verfügbarkeitsinformationen für einen abonnierten Feed manuell
+    (gemeinsame Feed-Daten, bei weiteren Abonnenten nur für Administratoren)
     """
+    feed = subscribed_feed_or_404(feed_id, current_user.id)
+    if feeds_shared_with_others([feed.id]):
+        return jsonify({'success': False, 'message': SHARED_FEED_ERROR}), 403
     try:
         data = request.get_json()
         platform = data.get('platform')
@@ -977,17 +3996,13 @@ def update_availability(feed_id):
         if platform not in ['itunes', 'youtube']:
             return jsonify({'success': False, 'message': 'Ungültige Plattform'}), 400
         
-        feed = db.session.get(PodcastFeed, feed_id)
-        if not feed:
-            return jsonify({'success': False, 'message': 'Feed nicht gefunden'}), 404
-        
         # Verfügbarkeit aktualisieren
         if platform == 'itunes':
             feed.itunes_available = available
         elif platform == 'youtube':
             feed.youtube_available = available
         
-        feed.availability_checked = datetime.now(timezone.utc)
+        feed.availability_checked = datetime.now()
         db.session.commit()
         
         return jsonify({
@@ -1011,49 +4026,38 @@ def update_all_feeds():
     Aktualisiert alle aktiven Feeds und führt Verfügbarkeits-Check durch
     """
     try:
-        feeds = PodcastFeed.query.filter_by(is_active=True).all()
+        renew_websub_subscriptions()
+        # Feeds mit aktivem WebSub-Abonnement werden gepusht und hier nicht gepollt
+        pushed_feed_ids = websub_pushed_feed_ids()
+        feeds = [(feed_id, feed_url) for feed_id, feed_url in
+                 db.session.query(PodcastFeed.id, PodcastFeed.url).filter_by(is_active=True) if feed_id not in pushed_feed_ids]
         updated_count = 0
         error_count = 0
+        pending = []
         
-        for feed in feeds:
+        force_full = request.args.get('full') == '1'
+        
+        for feed_id, feed_url in feeds:
+            # RSS-Feed (inkrementell) parsen; das Schreiben übernimmt pro Feed ein eigener Ingest-Job
+            known_keys, newer_than = incremental_parse_args(feed_id, force_full)
+            feed_data, episodes_data = parse_rss_feed(feed_url, known_keys, newer_than)
+            
+            if feed_data:
+                # Verfügbarkeits-Check NICHT durchführen (nur einmalig beim Hinzufügen)
+                pending.append((feed_id, feed_url, feed_data, submit_ingest_write(store_parsed_feed, feed_id, feed_data, episodes_data,
+                                                                                  incremental=known_keys is not None)))
+            else:
+                error_count += 1
+                print(f"Fehler beim Parsen von Feed: {feed_url}")
+        
+        for feed_id, feed_url, feed_data, future in pending:
             try:
-                # RSS-Feed parsen und aktualisieren
-                feed_data, episodes_data = parse_rss_feed(feed.url)
-                
-                if feed_data:
-                    # Feed-Daten aktualisieren
-                    if feed.name == feed.url or feed.name == 'Unbekannter Podcast':
-                        feed.name = feed_data.get('name', feed.name)
-                    
-                    if feed_data.get('topic') is not None and (feed.topic is None or feed.topic == feed_data['topic']):
-                        feed.topic = feed_data['topic']
-                    
-                    feed.homepage_url = feed_data.get('homepage_url', feed.homepage_url)
-                    feed.last_checked = datetime.now()
-                    
-                    # Bestehende Episoden löschen und neue hinzufügen
-                    Episode.query.filter_by(feed_id=feed.id).delete()
-                    
-                    for ep_data in episodes_data:
-                        ep_data['feed_id'] = feed.id
-                        ep_data.setdefault('is_favorite', False)
-                        episode = Episode(**ep_data)
-                        db.session.add(episode)
-                    
-                    # Verfügbarkeits-Check NICHT durchführen (nur einmalig beim Hinzufügen)
-                    # update_feed_availability(feed.id)
-                    
-                    updated_count += 1
-                else:
-                    error_count += 1
-                    print(f"Fehler beim Parsen von Feed: {feed.url}")
-                    
+                future.result()
+                updated_count += 1
+                ensure_websub_subscription(feed_id, feed_data)
             except Exception as e:
                 error_count += 1
-                print(f"Fehler beim Aktualisieren von Feed {feed.url}: {str(e)}")
-                continue
-        
-        db.session.commit()
+                print(f"Fehler beim Aktualisieren von Feed {feed_url}: {str(e)}")
         
         message = f"Aktualisierung abgeschlossen: {updated_count} Feeds erfolgreich aktualisiert"
         if error_count > 0:
@@ -1080,6 +4084,338 @@ def update_all_feeds():
 
 
 
+# Zustandslose JSON-API (v2): dieselben Views wie oben, aber ohne Session-Schreibzugriffe
+# (siehe ApiAwareSessionInterface) und mit JSON-Fehlern statt Redirects/HTML
+api_v2 = Blueprint('api_v2', __name__, url_prefix='/api/v2')
+
+@api_v2.errorhandler(HTTPException)
+def api_v2_http_error(e):
+    return jsonify({"error": e.description}), e.code
+
+api_v2.add_url_rule('/feeds', 'get_feeds', get_feeds, methods=['GET'])
+api_v2.add_url_rule('/feeds', 'add_feed', add_feed, methods=['POST'])
+api_v2.add_url_rule('/feeds/bulk', 'bulk_update_feeds', bulk_update_feeds, methods=['POST'])
+api_v2.add_url_rule('/feeds/refresh', 'update_all_feeds', update_all_feeds, methods=['POST'])
+api_v2.add_url_rule('/feeds/<int:feed_id>', 'update_feed_metadata', update_feed_metadata, methods=['PUT'])
+api_v2.add_url_rule('/feeds/<int:feed_id>', 'delete_feed', delete_feed, methods=['DELETE'])
+api_v2.add_url_rule('/feeds/<int:feed_id>/refresh', 'refresh_feed', refresh_episodes_endpoint, methods=['POST'])
+api_v2.add_url_rule('/feeds/<int:feed_id>/availability', 'check_availability', check_availability, methods=['POST'])
+api_v2.add_url_rule('/feeds/availability', 'check_availability_bulk', check_availability_bulk, methods=['POST'])
+api_v2.add_url_rule('/feeds/import', 'import_feeds', import_feeds_xlsx, methods=['POST'])
+api_v2.add_url_rule('/episodes', 'get_episodes', get_episodes, methods=['GET'])
+api_v2.add_url_rule('/episodes/batch', 'batch_update_episodes', batch_update_episodes, methods=['POST'])
+api_v2.add_url_rule('/episodes/<int:episode_id>', 'update_episode', update_episode, methods=['PUT'])
+api_v2.add_url_rule('/episodes/<int:episode_id>', 'delete_episode', delete_episode, methods=['DELETE'])
+api_v2.add_url_rule('/episodes/<int:episode_id>/description', 'get_episode_description', get_episode_description, methods=['GET'])
+api_v2.add_url_rule('/stats', 'get_stats', get_stats, methods=['GET'])
+api_v2.add_url_rule('/episodes/archive', 'get_archived_episodes', get_archived_episodes, methods=['GET'])
+api_v2.add_url_rule('/episodes/archive/<int:archived_id>/restore', 'restore_episode', restore_episode, methods=['POST'])
+api_v2.add_url_rule('/db/pool', 'get_db_pool_metrics', get_db_pool_metrics, methods=['GET'])
+api_v2.add_url_rule('/webhooks', 'get_webhooks', get_webhooks, methods=['GET'])
+api_v2.add_url_rule('/webhooks', 'add_webhook', add_webhook, methods=['POST'])
+api_v2.add_url_rule('/webhooks/<int:webhook_id>', 'update_webhook', update_webhook, methods=['PUT'])
+api_v2.add_url_rule('/webhooks/<int:webhook_id>', 'delete_webhook', delete_webhook, methods=['DELETE'])
+api_v2.add_url_rule('/saved_searches', 'get_saved_searches', get_saved_searches, methods=['GET'])
+api_v2.add_url_rule('/saved_searches', 'create_saved_search', create_saved_search, methods=['POST'])
+api_v2.add_url_rule('/saved_searches/unread_counts', 'get_saved_search_unread_counts', get_saved_search_unread_counts, methods=['GET'])
+api_v2.add_url_rule('/saved_searches/<int:search_id>', 'update_saved_search', update_saved_search, methods=['PUT'])
+api_v2.add_url_rule('/saved_searches/<int:search_id>', 'delete_saved_search', delete_saved_search, methods=['DELETE'])
+api_v2.add_url_rule('/saved_searches/<int:search_id>/episodes', 'get_saved_search_episodes', get_saved_search_episodes, methods=['GET'])
+api_v2.add_url_rule('/saved_searches/<int:search_id>/read', 'mark_saved_search_read', mark_saved_search_read, methods=['POST'])
+
+app.register_blueprint(api_v2)
+
+
+def upgrade_schema():
+    """
+    Ergänzt fehlende Spalten und Indizes in bestehenden Tabellen, da db.create_all() nur neue Tabellen anlegt.
+    Neue Spalten werden ohne NOT NULL/Default angelegt (alle nachträglichen Spalten sind nullable).
+    """
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as connection:
+        quote = connection.dialect.identifier_preparer.quote
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=connection.dialect)
+                    connection.execute(db.text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"))
+                    print(f"Spalte {table.name}.{column.name} hinzugefügt.")
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    print(f"Index {index.name} angelegt.")
+
+# CLI-Befehle
+@app.cli.command('init-db')
+def init_db_command():
+    """Erstellt fehlende Datenbanktabellen, Spalten und Indizes (idempotent)."""
+    db.create_all()
+    upgrade_schema()
+    ensure_default_user()
+    # Bestehende Datenbanken: Statistiken einmalig aus den vorhandenen Episoden aufbauen
+    if FeedStats.query.first() is None and Episode.query.first() is not None:
+        rebuild_stats()
+    # Bestehende Datenbanken: vorhandene Benutzer behalten alle bisherigen Feeds als Abonnements
+    if Subscription.query.first() is None and PodcastFeed.query.first() is not None:
+        backfill_subscriptions()
+    # Bestehende Datenbanken: kanonische URLs nachtragen; Duplikate bleiben bis zum Zusammenführen leer
+    if PodcastFeed.query.filter(PodcastFeed.canonical_url == None).first() is not None:
+        duplicates = backfill_canonical_urls()
+        if duplicates:
+            print(f"{duplicates} Feeds mit doppelter URL gefunden: 'flask merge-duplicate-feeds' führt sie zusammen.")
+    print("Datenbanktabellen erstellt oder existieren bereits.")
+
+def rebuild_stats(batch_size=100):
+    feed_ids = [feed_id for (feed_id,) in db.session.query(PodcastFeed.id).order_by(PodcastFeed.id)]
+    for start in range(0, len(feed_ids), batch_size):
+        refresh_feed_stats(feed_ids[start:start + batch_size])
+        db.session.commit()
+    print(f"Statistiken für {len(feed_ids)} Feeds neu berechnet.")
+
+@app.cli.command('check-availability')
+@click.option('--max-age-hours', type=float, default=None, help='Nur Feeds, deren letzte Prüfung älter ist (Standard: AVAILABILITY_MAX_AGE_HOURS).')
+@click.option('--limit', type=int, default=None, help='Höchstens so viele Feeds prüfen.')
+@click.option('--time-budget', type=float, default=None, help='Maximale Laufzeit in Sekunden (Standard: AVAILABILITY_TIME_BUDGET_SECONDS).')
+@click.option('--concurrency', type=int, default=None, help='Maximale Anzahl gleichzeitiger Anfragen (Standard: AVAILABILITY_CONCURRENCY).')
+def check_availability_command(max_age_hours, limit, time_budget, concurrency):
+    """Prüft die iTunes/YouTube-Verfügbarkeit aller Feeds mit veralteter Prüfung parallel."""
+    step = {'next': 0}
+
+    def progress(done, total):
+        # Fortschritt in 10%-Schritten ausgeben
+        if done * 10 >= step['next'] * total:
+            print(f"  {done}/{total} Prüfungen abgeschlossen")
+            step['next'] = done * 10 // total + 1
+
+    summary = recheck_stale_availability(max_age_hours, limit, time_budget, concurrency, progress=progress)
+    print(f"{summary['updated']} von {summary['selected']} Feeds aktualisiert, {summary['failed']} fehlgeschlagen, "
+          f"{summary['skipped']} offen in {summary['elapsed_seconds']}s"
+          + (" (Zeitbudget erschöpft)" if summary['budget_exhausted'] else ""))
+
+@app.cli.command('prerender-shell')
+def prerender_shell_command():
+    """Rendert die Hauptseite für FAST_STARTUP vor (benötigt keine Datenbank, z.B. beim Image-Build)."""
+    cache_file = app.config['APP_SHELL_CACHE_FILE']
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with app.test_request_context():
+        html_page = render_app_shell()
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        f.write(html_page)
+    print(f"Hauptseite nach {cache_file} vorgerendert.")
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Berechnet FeedStats und Veröffentlichungs-Histogramme aller Feeds aus den Episoden neu."""
+    rebuild_stats()
+
+def _parse_archived_feed(job):
+    """
+    Worker für 'flask reingest' (läuft in einem eigenen Prozess): lädt einen archivierten Inhalt und parst ihn.
+    """
+    feed_id, content_hash = job
+    try:
+        feed_data, episodes = parse_feed_content(load_archived_feed_content(content_hash))
+        return feed_id, feed_data, episodes, None
+    except Exception as e:
+        return feed_id, None, None, str(e)
+
+@app.cli.command('reingest')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='Anzahl paralleler Parser-Prozesse.')
+@click.option('--feed-id', 'feed_ids', type=int, multiple=True, help='Nur diese Feeds neu verarbeiten (mehrfach angebbar).')
+def reingest_command(workers, feed_ids):
+    """Parst alle Feeds erneut aus dem lokalen Archiv (ohne Netzwerkzugriff) und gleicht ihre Episoden ab (siehe merge_parsed_episodes)."""
+    started = time.perf_counter()
+    query = db.session.query(PodcastFeed.id, PodcastFeed.url)
+    if feed_ids:
+        query = query.filter(PodcastFeed.id.in_(feed_ids))
+
+    jobs = []
+    missing = 0
+    for feed_id, feed_url in query.all():
+        content_hash = db.session.query(FeedArchiveEntry.content_hash).filter_by(feed_url=feed_url) \
+            .order_by(FeedArchiveEntry.fetched_at.desc(), FeedArchiveEntry.id.desc()).limit(1).scalar()
+        if content_hash and os.path.exists(archive_path(content_hash)):
+            jobs.append((feed_id, content_hash))
+        else:
+            missing += 1
+    print(f"{len(jobs)} Feeds im Archiv, {missing} ohne archivierten Inhalt. Parse mit {workers} Prozessen...")
+
+    from concurrent.futures import ProcessPoolExecutor
+    reingested = 0
+    errors = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Parsen parallel, Schreiben seriell im Hauptprozess (ein Commit pro Feed)
+        for feed_id, feed_data, episodes, error in executor.map(_parse_archived_feed, jobs, chunksize=4):
+            if error:
+                errors += 1
+                print(f"Fehler beim Parsen von Feed {feed_id} aus dem Archiv: {error}")
+                continue
+            try:
+                store_parsed_feed(feed_id, feed_data, episodes)
+                db.session.commit()
+                reingested += 1
+            except Exception as e:
+                db.session.rollback()
+                errors += 1
+                print(f"Fehler beim Speichern von Feed {feed_id}: {e}")
+    print(f"Fertig: {reingested} Feeds neu verarbeitet, {errors} Fehler, {time.perf_counter() - started:.1f} s.")
+
+@app.cli.command('websub-renew')
+def websub_renew_command():
+    """Verlängert bald ablaufende WebSub-Abonnements (z.B. per Cron aufrufen)."""
+    if not websub_enabled():
+        raise click.ClickException("WEBSUB_CALLBACK_BASE_URL ist nicht gesetzt.")
+    print(f"{renew_websub_subscriptions()} WebSub-Abonnements verlängert.")
+
+@app.cli.command('webhook-add')
+@click.argument('url')
+@click.option('--secret', default=None, help='HMAC-Secret (Standard: zufällig generiert).')
+def webhook_add_command(url, secret):
+    """Registriert einen Webhook für Episoden-Ereignisse und gibt dessen Secret aus."""
+    endpoint = create_webhook(url, secret)
+    db.session.commit()
+    print(f"Webhook {endpoint.id} für {url} angelegt. Secret (nur jetzt sichtbar): {endpoint.secret}")
+
+@app.cli.command('deliver-webhooks')
+@click.option('--loop', is_flag=True, help='Dauerhaft laufen und alle --interval Sekunden zustellen.')
+@click.option('--interval', default=5.0, show_default=True, help='Wartezeit zwischen zwei Läufen mit --loop.')
+def deliver_webhooks_command(loop, interval):
+    """Stellt ausstehende Episoden-Ereignisse an alle fälligen Webhooks zu."""
+    while True:
+        summary = deliver_webhooks()
+        if summary['batches'] or summary['failures'] or not loop:
+            print(f"{summary['events']} Ereignisse in {summary['batches']} Batches an {summary['endpoints']} Endpunkte zugestellt, "
+                  f"{summary['failures']} fehlgeschlagen")
+        if not loop:
+            break
+        time.sleep(interval)
+
+@app.cli.command('create-user')
+@click.argument('username')
+@click.password_option(help='Passwort des neuen Benutzers.')
+def create_user_command(username, password):
+    """Legt einen weiteren Benutzer an (eigene Abonnements und Favoriten, gemeinsam abgerufene Feeds)."""
+    if User.query.filter_by(username=username).first():
+        print(f"Benutzer '{username}' existiert bereits.")
+        return
+    user = User(username=username)
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    print(f"Benutzer '{username}' angelegt.")
+
+@app.cli.command('archive-episodes')
+@click.option('--months', type=int, default=None, help='Episoden älter als so viele Monate archivieren (Standard: RETENTION_MONTHS).')
+@click.option('--batch-size', type=int, default=None, help='Episoden pro Commit (Standard: RETENTION_BATCH_SIZE).')
+@click.option('--max-episodes', type=int, default=None, help='Höchstens so viele Episoden pro Lauf (Standard: RETENTION_MAX_PER_RUN, 0 = unbegrenzt).')
+@click.option('--dry-run', is_flag=True, help='Nur die Anzahl der Kandidaten ausgeben.')
+def archive_episodes_command(months, batch_size, max_episodes, dry_run):
+    """Verschiebt alte, nicht favorisierte Episoden in das Episodenarchiv (für Cron oder einen Hintergrundjob)."""
+    months = app.config['RETENTION_MONTHS'] if months is None else months
+    if months <= 0:
+        print("Keine Aufbewahrungsfrist gesetzt (RETENTION_MONTHS oder --months).")
+        return
+    max_episodes = app.config['RETENTION_MAX_PER_RUN'] if max_episodes is None else max_episodes
+    count = archive_old_episodes(months, batch_size, max_episodes or None, dry_run=dry_run)
+    print(f"{count} Episoden älter als {months} Monate {'würden archiviert' if dry_run else 'archiviert'}.")
+
+@app.cli.command('merge-duplicate-feeds')
+@click.option('--dry-run', is_flag=True, help='Nur die gefundenen Duplikate ausgeben.')
+@click.option('--url-only', is_flag=True, help='Nur über die kanonische URL zusammenführen, nicht über den Inhalts-Fingerabdruck.')
+def merge_duplicate_feeds_command(dry_run, url_only):
+    """Führt doppelte Feeds (gleiche kanonische URL oder gleicher Inhalt) zusammen und behält Abonnements und Favoriten."""
+    if not url_only:
+        count = backfill_feed_fingerprints()
+        if count:
+            print(f"{count} Fingerabdrücke aus dem Feed-Archiv berechnet.")
+    groups = find_duplicate_feed_groups(use_fingerprint=not url_only)
+    names = dict(db.session.query(PodcastFeed.id, PodcastFeed.url))
+    for target_id, *duplicate_ids in groups:
+        print(f"{names[target_id]} <- {', '.join(names[duplicate_id] for duplicate_id in duplicate_ids)}")
+        if dry_run:
+            continue
+        moved = sum(run_ingest_write(merge_feeds, target_id, duplicate_id) for duplicate_id in duplicate_ids)
+        print(f"  {len(duplicate_ids)} Duplikate zusammengeführt, {moved} Episoden übernommen.")
+    if not groups:
+        print("Keine doppelten Feeds gefunden.")
+    elif dry_run:
+        print(f"{len(groups)} Gruppen doppelter Feeds gefunden (--dry-run: nichts geändert).")
+    elif PodcastFeed.query.filter(PodcastFeed.canonical_url == None).first() is not None:
+        backfill_canonical_urls()
+
+@app.cli.command('resolve-episode-links')
+@click.option('--feed-id', type=int, default=None, help='Nur diesen Feed auflösen (unabhängig vom Alter der letzten Prüfung).')
+@click.option('--limit', type=int, default=None, help='Höchstens so viele Feeds.')
+def resolve_episode_links_command(feed_id, limit):
+    """Löst die Apple-Podcasts-Links der Episoden aktiver Feeds mit abgelaufener Prüfung auf (ein Lookup pro Feed)."""
+    if feed_id is not None:
+        feed_ids = [feed_id]
+    else:
+        cutoff = datetime.now() - timedelta(hours=app.config['EPISODE_LINK_TTL_HOURS'])
+        query = db.session.query(PodcastFeed.id).filter(
+            PodcastFeed.is_active == True,
+            db.or_(PodcastFeed.episode_links_checked.is_(None), PodcastFeed.episode_links_checked < cutoff)) \
+            .order_by(PodcastFeed.episode_links_checked.isnot(None), PodcastFeed.episode_links_checked)
+        if limit:
+            query = query.limit(limit)
+        feed_ids = [feed_id for (feed_id,) in query]
+    linked = 0
+    failed = 0
+    for current_feed_id in feed_ids:
+        count = resolve_episode_links(current_feed_id)
+        if count is None:
+            failed += 1
+        else:
+            linked += count
+    print(f"{len(feed_ids)} Feeds geprüft, {linked} Episoden verlinkt, {failed} Fehler.")
+
+@app.cli.command('snapshot')
+@click.option('--full', is_flag=True, help='Vollständigen Snapshot erstellen statt nur die Änderungen seit dem letzten Lauf.')
+@click.option('--batch-size', type=int, default=None, help='Zeilen pro Batch (Standard: SNAPSHOT_BATCH_SIZE).')
+def snapshot_command(full, batch_size):
+    """Exportiert PodcastFeed und Episode spaltenweise nach SNAPSHOT_DIR für Offline-Analysen."""
+    with SNAPSHOT_LOCK:
+        run = run_snapshot(full=full, batch_size=batch_size)
+    for table_name, relative_path in run['files'].items():
+        print(f"{table_name}: {run['rows'][table_name]} Zeilen -> {os.path.join(app.config['SNAPSHOT_DIR'], relative_path)}")
+    print(f"Snapshot {run['id']} ({'vollständig' if run['full'] else 'Änderungen seit ' + run['since']}, {run['format']}).")
+
+@app.cli.command('create-api-token')
+@click.argument('username')
+@click.option('--name', default=None, help='Bezeichnung des Tokens, z.B. der nutzende Dienst.')
+def create_api_token_command(username, name):
+    """Erzeugt ein API-Token für /api/v2 und gibt es einmalig aus."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"Benutzer '{username}' nicht gefunden.")
+    token = secrets.token_urlsafe(32)
+    db.session.add(ApiToken(user_id=user.id, name=name, token_hash=hash_api_token(token)))
+    db.session.commit()
+    print(f"API-Token für '{username}' (wird nicht erneut angezeigt): {token}")
+
+@app.cli.command('compact-descriptions')
+@click.option('--batch-size', default=500, show_default=True, help='Episoden pro Commit.')
+def compact_descriptions_command(batch_size):
+    """Verschiebt vorhandene Inline-Beschreibungen komprimiert nach EpisodeDescription."""
+    db.create_all()
+    moved = 0
+    while True:
+        rows = db.session.query(Episode.id, Episode.description).filter(Episode.description.isnot(None)).limit(batch_size).all()
+        if not rows:
+            break
+        for episode_id, description in rows:
+            db.session.merge(build_episode_description(episode_id, description))
+        Episode.query.filter(Episode.id.in_([episode_id for episode_id, _ in rows])).update({Episode.description: None}, synchronize_session=False)
+        db.session.commit()
+        moved += len(rows)
+        print(f"{moved} Beschreibungen ausgelagert...")
+    print(f"Fertig: {moved} Beschreibungen komprimiert gespeichert. Setze DESCRIPTION_STORAGE=compressed für neue Episoden.")
+
+
 if __name__ == '__main__':
     with app.app_context():
         print("DEBUG: SQLALCHEMY_DATABASE_URI wird verwendet:", app.config['SQLALCHEMY_DATABASE_URI'])
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark für die Listen-Serialisierung von /episodes.
+
+Vergleicht den alten Weg (ORM-Objekte, Dict pro Zeile, isoformat(), eine große Liste für jsonify)
+mit der Spaltenprojektion als Tupel und dem blockweise gestreamten JSON-Array.
+Gemessen werden Laufzeit und Spitzen-Speicher (tracemalloc) gegen eine temporäre SQLite-Datenbank.
+
+Aufruf: python scripts/bench_listing.py --episodes 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Temporäre Datenbank setzen, bevor app importiert wird
+TMP_DIR = tempfile.mkdtemp(prefix='podtracker-bench-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TMP_DIR, 'bench.db')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as podtracker  # noqa: E402
+from app import app, db, PodcastFeed, Episode  # noqa: E402
+
+
+def seed(feed_count, episode_count):
+    db.create_all()
+    feeds = [{'id': i + 1, 'url': f'http://bench.local/{i}.xml', 'name': f'Bench Podcast {i}', 'topic': f'Topic {i % 12}',
+              'is_active': True, 'last_checked': datetime.now()} for i in range(feed_count)]
+    db.session.execute(db.insert(PodcastFeed), feeds)
+    start = datetime(2020, 1, 1)
+    description = '<p>' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 8 + '</p>'
+    batch = []
+    for i in range(episode_count):
+        batch.append({'feed_id': i % feed_count + 1, 'title': f'Episode {i}: Ein Titel mittlerer Länge', 'description': description,
+                      'pub_date': start + timedelta(hours=i), 'url': f'http://bench.local/media/{i}.mp3',
+                      'is_favorite': i % 50 == 0, 'host': f'Host {i % 300}'})
+        if len(batch) == 10000:
+            db.session.execute(db.insert(Episode), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(Episode), batch)
+    db.session.commit()
+
+
+def legacy_listing():
+    # Entspricht dem früheren get_episodes(): ORM-Objekte inkl. Beschreibung, Liste von Dicts, json.dumps
+    episodes = db.session.query(Episode, PodcastFeed.name.label('podcast_name')).join(PodcastFeed).filter(PodcastFeed.is_active == True).all()
+    episodes_data = [{
+        'id': ep.Episode.id,
+        'feed_id': ep.Episode.feed_id,
+        'title': ep.Episode.title,
+        'description': ep.Episode.description,
+        'pub_date': ep.Episode.pub_date.isoformat(),
+        'url': ep.Episode.url,
+        'is_favorite': ep.Episode.is_favorite,
+        'host': ep.Episode.host,
+        'podcast_name': ep.podcast_name
+    } for ep in episodes]
+    return len(json.dumps(episodes_data).encode('utf-8'))
+
+
+def _projected_rows(chunk_size):
+    return db.session.query(
+        Episode.id, Episode.feed_id, Episode.title, Episode.pub_date, Episode.url,
+        Episode.is_favorite, Episode.host, PodcastFeed.name
+    ).join(PodcastFeed).filter(PodcastFeed.is_active == True).yield_per(chunk_size)
+
+
+KEYS = ('id', 'feed_id', 'title', 'pub_date', 'url', 'is_favorite', 'host', 'podcast_name')
+
+
+def projected_listing(chunk_size):
+    # Spaltenprojektion, aber komplettes Array im Speicher
+    return len(podtracker.json_dumps([dict(zip(KEYS, row)) for row in _projected_rows(chunk_size)]))
+
+
+def streamed_listing(chunk_size):
+    # Weg des aktuellen get_episodes(): Spaltenprojektion und blockweises Streaming
+    return sum(len(part) for part in podtracker.stream_json_array(KEYS, _projected_rows(chunk_size), chunk_size))
+
+
+def measure(label, func, *args):
+    db.session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.rollback()
+    print(f"{label:<32} {elapsed:8.2f} s {peak / 1024 / 1024:10.1f} MiB {size / 1024 / 1024:10.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--episodes', type=int, default=100000)
+    parser.add_argument('--feeds', type=int, default=200)
+    parser.add_argument('--chunk-size', type=int, default=app.config['LISTING_CHUNK_SIZE'])
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(f"Erzeuge {args.episodes} Episoden in {args.feeds} Feeds ({TMP_DIR}) ...")
+        seed(args.feeds, args.episodes)
+        print(f"JSON-Backend: {'orjson' if podtracker.orjson is not None else 'json (Standardbibliothek)'}")
+        print(f"{'Variante':<32} {'Zeit':>10} {'Peak-Speicher':>14} {'Payload':>10}")
+        measure('ORM + jsonify (alt)', legacy_listing)
+        measure('Spaltenprojektion, Liste', projected_listing, args.chunk_size)
+        measure('Spaltenprojektion, gestreamt', streamed_listing, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
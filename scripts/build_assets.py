@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Baut die Frontend-Assets nach static/dist.
+
+- CSS und JS aus static/src werden mit Inhalts-Hash im Dateinamen abgelegt (z.B. js/podcast_tracker.3f2a9c1b0d4e.js)
+- Tailwind wird mit der Tailwind-CLI (falls vorhanden) auf die tatsächlich verwendeten Klassen reduziert;
+  ohne CLI verwendet die Seite weiterhin das Tailwind-CDN (nur für die Entwicklung, siehe --production)
+- SheetJS wird selbst ausgeliefert (die Seite lädt es erst für Import/Export): aus static/src/vendor oder aus
+  dem per package.json fest versionierten npm-Paket 'xlsx', nie zur Build-Zeit von einem CDN
+- Zu jeder Datei werden .gz und (mit dem Paket 'brotli') .br vorkomprimiert
+- static/dist/manifest.json ordnet logische Namen den gehashten Dateien zu (siehe asset_url in app.py)
+
+Aufruf: python scripts/build_assets.py [--tailwind-cli PFAD] [--production]
+
+Mit --production (Docker-Image) bricht der Build ab, statt auf ein CDN zurückzufallen.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(REPO_DIR, 'static', 'src')
+DIST_DIR = os.path.join(REPO_DIR, 'static', 'dist')
+
+# Logische Namen relativ zu static/src
+SOURCE_ASSETS = ['css/podcast_tracker.css', 'js/podcast_tracker.js', 'js/xlsx_io.js']
+XLSX_ASSET = 'vendor/xlsx.full.min.js'
+# Version siehe package.json
+XLSX_NPM_PATH = os.path.join(REPO_DIR, 'node_modules', 'xlsx', 'dist', 'xlsx.full.min.js')
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def write_asset(name, content):
+    """
+    Schreibt content (bytes) gehasht und vorkomprimiert nach static/dist und gibt den Dateinamen zurück.
+    """
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    built_name = f'{stem}.{digest}{ext}'
+    path = os.path.join(DIST_DIR, built_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    with open(path + '.gz', 'wb') as f:
+        # mtime=0: gleiche Eingabe ergibt byte-identische Ausgabe
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(content, quality=11))
+    print(f"{name:<28} -> {built_name} ({len(content) / 1024:.1f} KiB)")
+    return built_name
+
+
+def find_tailwind_cli(explicit):
+    if explicit:
+        return [explicit]
+    local_cli = os.path.join(REPO_DIR, 'node_modules', '.bin', 'tailwindcss')
+    if os.path.exists(local_cli):
+        return [local_cli]
+    if shutil.which('tailwindcss'):
+        return ['tailwindcss']
+    return None
+
+
+def build_tailwind(cli):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'tailwind.css')
+        subprocess.run(cli + ['-c', os.path.join(REPO_DIR, 'tailwind.config.js'),
+                              '-i', os.path.join(SRC_DIR, 'css', 'tailwind.css'), '-o', output, '--minify'],
+                       cwd=REPO_DIR, check=True)
+        with open(output, 'rb') as f:
+            return f.read()
+
+
+def load_xlsx():
+    for path in (os.path.join(SRC_DIR, XLSX_ASSET), XLSX_NPM_PATH):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tailwind-cli', help="Pfad zur Tailwind-CLI (Standard: node_modules/.bin oder PATH)")
+    parser.add_argument('--production', action='store_true',
+                        help="Abbrechen, wenn Tailwind-CSS oder SheetJS nicht gebaut werden können (kein CDN-Fallback)")
+    args = parser.parse_args()
+
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+
+    for name in SOURCE_ASSETS:
+        with open(os.path.join(SRC_DIR, name), 'rb') as f:
+            content = f.read()
+        if name.endswith('.css'):
+            content = minify_css(content.decode('utf-8')).encode('utf-8')
+        manifest[name] = write_asset(name, content)
+
+    cli = find_tailwind_cli(args.tailwind_cli)
+    if cli:
+        manifest['css/tailwind.css'] = write_asset('css/tailwind.css', build_tailwind(cli))
+    elif args.production:
+        sys.exit("Tailwind-CLI nicht gefunden (npm install oder --tailwind-cli): css/tailwind.css kann nicht gebaut werden.")
+    else:
+        print("Tailwind-CLI nicht gefunden: die Seite verwendet weiterhin das Tailwind-CDN.")
+
+    xlsx = load_xlsx()
+    if xlsx:
+        manifest[XLSX_ASSET] = write_asset(XLSX_ASSET, xlsx)
+    elif args.production:
+        sys.exit(f"SheetJS nicht gefunden (static/src/{XLSX_ASSET} oder npm install).")
+    else:
+        print("SheetJS nicht gefunden: die Seite lädt es weiterhin vom CDN.")
+
+    with open(os.path.join(DIST_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"{len(manifest)} Assets nach {DIST_DIR} geschrieben.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Minimaler lokaler Stub der iTunes Search/Lookup API zum Testen der Episodenlinks (resolve_episode_links).
+
+Lädt die angegebenen RSS-Feeds (URL oder Datei) und bietet sie als Sendungen an:
+  GET /search?term=...&entity=podcast         -> Sendungen, deren Name alle Suchwörter enthält (mit feedUrl)
+  GET /lookup?id=<collectionId>&entity=podcastEpisode&limit=N
+                                              -> die Sendung und ihre N neuesten Episoden mit trackViewUrl
+Jede Anfrage wird protokolliert, so lässt sich prüfen, dass pro Feed nur ein Lookup erfolgt.
+
+Ablauf:
+  1. python scripts/itunes_stub_api.py --port 8091 --feed https://example.com/feed.xml
+  2. PodTracker mit ITUNES_API_BASE_URL=http://localhost:8091 starten (oder 'flask resolve-episode-links')
+"""
+
+import argparse
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# collectionId -> {'name', 'feed_url', 'episodes'}
+COLLECTIONS = {}
+
+
+def load_feed(source, collection_id, with_media_urls):
+    if os.path.exists(source):
+        with open(source, 'rb') as f:
+            content = f.read()
+    else:
+        response = requests.get(source, timeout=30)
+        response.raise_for_status()
+        content = response.content
+    channel = ET.fromstring(content).find('channel')
+    episodes = []
+    for track_no, item in enumerate(channel.findall('item'), start=1):
+        try:
+            release_date = parsedate_to_datetime(item.findtext('pubDate')).astimezone(timezone.utc)
+        except (TypeError, ValueError):
+            continue
+        enclosure = item.find('enclosure')
+        episodes.append({
+            'wrapperType': 'podcastEpisode',
+            'kind': 'podcast-episode',
+            'collectionId': collection_id,
+            'trackId': collection_id * 100000 + track_no,
+            'trackName': item.findtext('title'),
+            'releaseDate': release_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'episodeGuid': item.findtext('guid'),
+            'episodeUrl': enclosure.attrib.get('url') if with_media_urls and enclosure is not None else None,
+            'trackViewUrl': f'https://podcasts.apple.com/podcast/id{collection_id}?i={collection_id * 100000 + track_no}',
+        })
+    episodes.sort(key=lambda episode: episode['releaseDate'], reverse=True)
+    COLLECTIONS[collection_id] = {'name': channel.findtext('title') or source, 'feed_url': source, 'episodes': episodes}
+    print(f"Sendung {collection_id}: {COLLECTIONS[collection_id]['name']} ({len(episodes)} Episoden)")
+
+
+def collection_result(collection_id):
+    collection = COLLECTIONS[collection_id]
+    return {'wrapperType': 'track', 'kind': 'podcast', 'collectionId': collection_id, 'trackId': collection_id,
+            'collectionName': collection['name'], 'feedUrl': collection['feed_url'],
+            'collectionViewUrl': f'https://podcasts.apple.com/podcast/id{collection_id}'}
+
+
+class ItunesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        if parsed.path == '/search':
+            words = params.get('term', '').lower().split()
+            results = [collection_result(collection_id) for collection_id, collection in COLLECTIONS.items()
+                       if all(word in collection['name'].lower() for word in words)]
+            results = results[:int(params.get('limit', 50))]
+        elif parsed.path == '/lookup':
+            try:
+                collection_id = int(params.get('id', ''))
+            except ValueError:
+                collection_id = None
+            if collection_id not in COLLECTIONS:
+                results = []
+            else:
+                results = [collection_result(collection_id)]
+                if params.get('entity') == 'podcastEpisode':
+                    results += COLLECTIONS[collection_id]['episodes'][:int(params.get('limit', 50))]
+        else:
+            self.send_error(404)
+            return
+        body = json.dumps({'resultCount': len(results), 'results': results}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--feed', action='append', required=True, help="RSS-Feed (URL oder Datei), mehrfach möglich")
+    parser.add_argument('--no-media-urls', action='store_true',
+                        help="Keine episodeUrl ausliefern (Zuordnung nur über Titel und Datum testen)")
+    args = parser.parse_args()
+    for index, source in enumerate(args.feed, start=1):
+        load_feed(source, 1000 + index, not args.no_media_urls)
+    print(f"iTunes-Stub läuft auf http://localhost:{args.port}/")
+    ThreadingHTTPServer(('', args.port), ItunesHandler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
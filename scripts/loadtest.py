@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Lasttest mit gemischter Last: Lesen während großer Aktualisierungen und Importe.
+
+Startet lokale Stub-Feed-Server und die App (flask oder gunicorn) gegen eine frisch befüllte Datenbank
+(standardmäßig temporäres SQLite, mit --database-url z.B. Postgres) und erzeugt gleichzeitig:
+- Lesezugriffe: /feeds, /episodes, gespeicherte Suche (Trefferliste), /stats
+- Schreibzugriffe: Aktualisierung aller Feeds, PUT /episodes/<id>, Batch-Änderungen, Importe neuer Feeds
+Ausgegeben werden pro Endpunkt Durchsatz, p50/p95/p99-Latenz und Fehlerquote. Es werden keine externen
+Dienste angesprochen: jeder Abruf eines Stub-Feeds liefert eine neue Episode, sodass jede Aktualisierung schreibt.
+
+Aufruf: python scripts/loadtest.py --feeds 100 --episodes-per-feed 200 --readers 8 --duration 60 \\
+        --server gunicorn --workers 1 --threads 8
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+API = '/api/v2'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class StubFeedHandler(BaseHTTPRequestHandler):
+    """
+    Liefert /feeds/<n>.xml als RSS mit episodes_per_feed Episoden plus einer weiteren Episode pro bisherigem Abruf.
+    """
+    episodes_per_feed = 100
+    delay = 0.0
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        match = re.fullmatch(r'/feeds/(\d+)\.xml', self.path)
+        if not match:
+            self.send_error(404)
+            return
+        feed_no = int(match.group(1))
+        with self.lock:
+            hits = self.hits[feed_no] = self.hits.get(feed_no, -1) + 1
+        if self.delay:
+            time.sleep(self.delay)
+        body = self.render_feed(feed_no, self.episodes_per_feed + hits).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def render_feed(self, feed_no, episode_count):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        items = []
+        for i in range(episode_count - 1, -1, -1):
+            items.append(f"<item><title>Folge {i} von Lasttest {feed_no}</title>"
+                         f"<description>Beschreibung der Folge {i}: Gast {i % 40}, Thema {i % 7}.</description>"
+                         f"<pubDate>{format_datetime(start + timedelta(days=i, hours=feed_no % 24))}</pubDate>"
+                         f"<guid>lasttest-{feed_no}-{i}</guid>"
+                         f"<enclosure url=\"http://media.invalid/{feed_no}/{i}.mp3\" type=\"audio/mpeg\" length=\"1\"/></item>")
+        return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+                f"<title>Lasttest {feed_no}</title><link>http://stub.invalid/{feed_no}</link>"
+                f"<description>Stub-Feed {feed_no}</description>{''.join(items)}</channel></rss>")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(episodes_per_feed, delay):
+    StubFeedHandler.episodes_per_feed = episodes_per_feed
+    StubFeedHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', free_port()), StubFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def flask_cli(env, *args):
+    result = subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', *args], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def server_command(args, port):
+    if args.server == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(args.workers),
+                '--threads', str(args.threads), '--timeout', '0', 'app:app']
+    return [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--no-reload', '--with-threads']
+
+
+def wait_until_ready(base_url, process, timeout=60):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Serverprozess beendet mit Code {process.returncode}")
+        try:
+            if requests.get(base_url + '/healthz', timeout=2).status_code < 500:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server unter {base_url} nicht innerhalb von {timeout}s bereit")
+
+
+class Recorder:
+    """
+    Sammelt Latenzen und Fehler pro Endpunkt (threadsicher).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, elapsed, ok):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, duration):
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            errors = self.errors.get(name, 0)
+            rows.append({'endpoint': name, 'requests': len(values), 'rps': len(values) / duration,
+                         'p50_ms': percentile(values, 50) * 1000, 'p95_ms': percentile(values, 95) * 1000,
+                         'p99_ms': percentile(values, 99) * 1000, 'max_ms': values[-1] * 1000,
+                         'errors': errors, 'error_rate': errors / len(values)})
+        return rows
+
+
+def percentile(sorted_values, pct):
+    # Nearest-Rank-Verfahren
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class LoadTest:
+    def __init__(self, args, base_url, token, stub_url):
+        self.args = args
+        self.base_url = base_url + API
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.stub_url = stub_url
+        self.recorder = Recorder()
+        self.stop = threading.Event()
+        self.episode_ids = []
+        self.saved_search_id = None
+        self.next_import = args.feeds
+        self.import_lock = threading.Lock()
+
+    def call(self, session, name, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, self.base_url + path, headers=self.headers, timeout=self.args.request_timeout, **kwargs)
+            # Streaming-Antworten vollständig lesen, damit die Latenz die gesamte Übertragung umfasst
+            content = response.content
+            ok = response.status_code < 400
+        except requests.exceptions.RequestException:
+            content, ok = None, False
+        self.recorder.record(name, time.perf_counter() - started, ok)
+        return content if ok else None
+
+    def seed(self):
+        session = requests.Session()
+        feeds = [{'url': f'{self.stub_url}/feeds/{i}.xml'} for i in range(self.args.feeds)]
+        for start in range(0, len(feeds), 50):
+            response = session.post(self.base_url + '/feeds/import', json=feeds[start:start + 50], headers=self.headers, timeout=600)
+            response.raise_for_status()
+        response = session.post(self.base_url + '/saved_searches', json={'name': 'Lasttest', 'search_term': 'Folge 1'},
+                                headers=self.headers, timeout=600)
+        response.raise_for_status()
+        self.saved_search_id = response.json()['id']
+        episodes = session.get(self.base_url + '/episodes', headers=self.headers, timeout=600).json()
+        self.episode_ids = [episode['id'] for episode in episodes]
+        print(f"Befüllt: {len(feeds)} Feeds, {len(self.episode_ids)} Episoden")
+
+    def reader(self):
+        session = requests.Session()
+        operations = [
+            ('GET /feeds', 'GET', '/feeds'),
+            ('GET /episodes', 'GET', '/episodes'),
+            ('GET /saved_searches/<id>/episodes', 'GET', f'/saved_searches/{self.saved_search_id}/episodes'),
+            ('GET /stats', 'GET', '/stats'),
+        ]
+        while not self.stop.is_set():
+            name, method, path = random.choice(operations)
+            self.call(session, name, method, path)
+
+    def writer(self):
+        session = requests.Session()
+        while not self.stop.is_set():
+            if random.random() < 0.7:
+                episode_id = random.choice(self.episode_ids)
+                self.call(session, 'PUT /episodes/<id>', 'PUT', f'/episodes/{episode_id}',
+                          json={'is_favorite': random.random() < 0.5, 'host': f'Host {random.randint(1, 50)}'})
+            else:
+                ids = random.sample(self.episode_ids, min(50, len(self.episode_ids)))
+                self.call(session, 'POST /episodes/batch', 'POST', '/episodes/batch',
+                          json={'updates': [{'id': episode_id, 'is_favorite': random.random() < 0.5} for episode_id in ids]})
+            time.sleep(self.args.write_pause)
+
+    def refresher(self):
+        session = requests.Session()
+        while not self.stop.is_set():
+            self.call(session, 'POST /feeds/refresh', 'POST', '/feeds/refresh')
+
+    def importer(self):
+        session = requests.Session()
+        while not self.stop.is_set():
+            with self.import_lock:
+                first = self.next_import
+                self.next_import += self.args.import_batch
+            feeds = [{'url': f'{self.stub_url}/feeds/{i}.xml'} for i in range(first, first + self.args.import_batch)]
+            self.call(session, 'POST /feeds/import', 'POST', '/feeds/import', json=feeds)
+            time.sleep(self.args.write_pause)
+
+    def run(self):
+        roles = ([self.reader] * self.args.readers + [self.writer] * self.args.writers +
+                 [self.refresher] * self.args.refreshers + [self.importer] * self.args.importers)
+        threads = [threading.Thread(target=role, daemon=True) for role in roles]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(self.args.duration)
+        self.stop.set()
+        for thread in threads:
+            thread.join(timeout=self.args.request_timeout)
+        return time.perf_counter() - started
+
+
+def print_report(rows, duration):
+    print(f"\n{'Endpunkt':<36} {'Anfragen':>9} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'Fehler':>8}")
+    for row in rows:
+        print(f"{row['endpoint']:<36} {row['requests']:>9} {row['rps']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+              f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f} {row['error_rate'] * 100:>7.1f}%")
+    total = sum(row['requests'] for row in rows)
+    print(f"Gesamt: {total} Anfragen in {duration:.1f} s ({total / duration:.1f} req/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=50, help="Anzahl der vorab importierten Stub-Feeds")
+    parser.add_argument('--episodes-per-feed', type=int, default=100)
+    parser.add_argument('--feed-delay-ms', type=float, default=0, help="Künstliche Antwortzeit der Stub-Feeds")
+    parser.add_argument('--duration', type=float, default=30.0, help="Dauer der Lastphase in Sekunden")
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2, help="Threads für PUT /episodes/<id> und Batch-Änderungen")
+    parser.add_argument('--refreshers', type=int, default=1, help="Threads, die fortlaufend alle Feeds aktualisieren")
+    parser.add_argument('--importers', type=int, default=1, help="Threads, die fortlaufend neue Feeds importieren")
+    parser.add_argument('--import-batch', type=int, default=5, help="Feeds pro Import")
+    parser.add_argument('--write-pause', type=float, default=0.05, help="Pause zwischen Schreibzugriffen in Sekunden")
+    parser.add_argument('--request-timeout', type=float, default=120.0)
+    parser.add_argument('--server', choices=['flask', 'gunicorn'], default='gunicorn')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--database-url', help="Datenbank (Standard: temporäres SQLite); wird neu befüllt!")
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=WERT',
+                        help="Zusätzliche Umgebungsvariable für die App, z.B. --env DB_POOL_SIZE=20")
+    parser.add_argument('--output', help="Ergebnisse zusätzlich als JSON speichern (zum Vergleich von Konfigurationen)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='podtracker-loadtest-')
+    env = dict(os.environ, FAST_STARTUP='1', WEBSUB_CALLBACK_BASE_URL='', RETENTION_MONTHS='0', ADMIN_USERS='user1',
+               DATABASE_URL=args.database_url or 'sqlite:///' + os.path.join(tmp_dir, 'loadtest.db'),
+               FEED_ARCHIVE_DIR=os.path.join(tmp_dir, 'feed_archive'))
+    env.update(item.split('=', 1) for item in args.env)
+
+    stub_server, stub_url = start_stub_server(args.episodes_per_feed, args.feed_delay_ms / 1000)
+    flask_cli(env, 'init-db')
+    token = re.search(r':\s*(\S+)\s*$', flask_cli(env, 'create-api-token', 'user1', '--name', 'loadtest')).group(1)
+
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    log_path = os.path.join(tmp_dir, 'server.log')
+    with open(log_path, 'wb') as log:
+        process = subprocess.Popen(server_command(args, port), cwd=REPO_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_until_ready(base_url, process)
+        load_test = LoadTest(args, base_url, token, stub_url)
+        load_test.seed()
+        print(f"Lastphase: {args.duration:.0f} s, {args.readers} Leser, {args.writers} Schreiber, "
+              f"{args.refreshers} Aktualisierer, {args.importers} Importeure ({args.server}, "
+              f"{args.workers} Worker x {args.threads} Threads)")
+        duration = load_test.run()
+        rows = load_test.recorder.summary(duration)
+        print_report(rows, duration)
+        try:
+            pool = requests.get(base_url + API + '/db/pool', headers=load_test.headers, timeout=10).json()
+            print(f"Verbindungspool: {json.dumps(pool)}")
+        except (requests.exceptions.RequestException, ValueError):
+            pool = None
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({'config': vars(args), 'duration': duration, 'endpoints': rows, 'pool': pool}, f, indent=2)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        stub_server.shutdown()
+        print(f"Serverprotokoll: {log_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Misst die Kaltstartzeit: Zeit vom Prozessstart bis zur ersten erfolgreichen HTTP-Antwort.
+
+Startet die App wiederholt als eigenen Prozess (standardmäßig 'flask run', alternativ gunicorn wie in start.sh)
+und fragt den Zielpfad in kurzen Abständen ab, bis er mit Status < 500 antwortet.
+Mit --compare werden Standardmodus und FAST_STARTUP=1 nacheinander gemessen.
+
+Aufruf: python scripts/measure_cold_start.py --runs 5 --path /healthz --compare
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(server, port):
+    if server == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', '1', '--threads', '8', 'app:app']
+    return [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--no-reload']
+
+
+def measure_once(server, path, env, timeout):
+    port = free_port()
+    url = f'http://127.0.0.1:{port}{path}'
+    start = time.perf_counter()
+    process = subprocess.Popen(server_command(server, port), cwd=REPO_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Serverprozess beendet mit Code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=2) as response:
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+                continue
+            if status < 500:
+                return time.perf_counter() - start
+            time.sleep(0.005)
+        raise RuntimeError(f"Keine Antwort von {url} innerhalb von {timeout}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def measure(label, server, path, runs, extra_env, timeout):
+    env = dict(os.environ, **extra_env)
+    timings = [measure_once(server, path, env, timeout) for _ in range(runs)]
+    print(f"{label:<14} min {min(timings) * 1000:7.1f} ms   median {statistics.median(timings) * 1000:7.1f} ms   "
+          f"max {max(timings) * 1000:7.1f} ms   ({runs} Läufe, {path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/healthz', help="Abgefragter Pfad, z.B. /healthz oder /login")
+    parser.add_argument('--server', choices=['flask', 'gunicorn'], default='flask')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--compare', action='store_true', help="Standardmodus und FAST_STARTUP=1 vergleichen")
+    args = parser.parse_args()
+
+    if args.compare:
+        measure('Standard', args.server, args.path, args.runs, {'FAST_STARTUP': '0'}, args.timeout)
+        measure('FAST_STARTUP', args.server, args.path, args.runs, {'FAST_STARTUP': '1'}, args.timeout)
+    else:
+        measure('Kaltstart', args.server, args.path, args.runs, {}, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lokaler Webhook-Empfänger zum Testen der Zustellung von Episoden-Ereignissen.
+
+Prüft die Signatur (X-PodTracker-Signature = HMAC-SHA256 über '<X-PodTracker-Timestamp>.<Body>')
+und gibt die empfangenen Ereignisse aus. Mit --fail-rate bzw. --status lassen sich Fehler und Backoff testen.
+
+Ablauf:
+  1. python scripts/webhook_receiver.py --port 8091 --secret geheim
+  2. flask webhook-add http://localhost:8091/ --secret geheim
+  3. Feed aktualisieren, dann (ohne Hintergrund-Thread) flask deliver-webhooks
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Maximal akzeptiertes Alter des Zeitstempels (Schutz vor Replays)
+MAX_SKEW_SECONDS = 300
+
+
+def verify_signature(secret, timestamp, body, signature_header):
+    expected = 'sha256=' + hmac.new(secret.encode('utf-8'), f'{timestamp}.'.encode('utf-8') + body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header or '')
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    secret = None
+    fail_rate = 0.0
+    status = 200
+    delay = 0.0
+    received = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        timestamp = self.headers.get('X-PodTracker-Timestamp', '')
+
+        if self.secret is not None:
+            if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > MAX_SKEW_SECONDS:
+                self._reply(400, "Zeitstempel fehlt oder ist zu alt\n")
+                return
+            if not verify_signature(self.secret, timestamp, body, self.headers.get('X-PodTracker-Signature')):
+                print("Ungültige Signatur, Batch abgelehnt")
+                self._reply(401, "Ungültige Signatur\n")
+                return
+
+        if self.delay:
+            time.sleep(self.delay)
+        if self.status >= 300 or random.random() < self.fail_rate:
+            status = self.status if self.status >= 300 else 503
+            print(f"Batch absichtlich mit Status {status} abgelehnt")
+            self._reply(status, "Fehler simuliert\n")
+            return
+
+        batch = json.loads(body)
+        ReceiverHandler.received += len(batch['events'])
+        for event in batch['events']:
+            data = event['data']
+            print(f"#{event['id']:<6} {event['type']:<12} Feed {event['feed_id']:<5} {data.get('title') or data.get('key') or ''}")
+        print(f"Batch bis Cursor {batch['cursor']} ({len(batch['events'])} Ereignisse, insgesamt {ReceiverHandler.received})")
+        self._reply(200, "OK\n")
+
+    def _reply(self, status, text):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--secret', default=None, help="Webhook-Secret; ohne Angabe wird die Signatur nicht geprüft")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Anteil der Batches, die mit 503 abgelehnt werden (0..1)")
+    parser.add_argument('--status', type=int, default=200, help="Feste Antwort, z.B. 429 oder 500 zum Testen des Backoffs")
+    parser.add_argument('--delay', type=float, default=0.0, help="Verzögerung pro Batch in Sekunden (langsamer Empfänger)")
+    args = parser.parse_args()
+
+    ReceiverHandler.secret = args.secret
+    ReceiverHandler.fail_rate = args.fail_rate
+    ReceiverHandler.status = args.status
+    ReceiverHandler.delay = args.delay
+    print(f"Webhook-Empfänger läuft auf http://localhost:{args.port}/")
+    ThreadingHTTPServer(('', args.port), ReceiverHandler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Minimaler lokaler WebSub-Hub zum Testen der Push-Zustellung.
+
+Nimmt Abonnements an (POST hub.mode=subscribe), verifiziert den Callback mit einer Challenge
+und stellt anschließend auf Anfrage signierte Pushes zu (X-Hub-Signature: sha256=...).
+
+Ablauf:
+  1. python scripts/websub_stub_hub.py --port 8090
+  2. Feed mit <atom:link rel="hub" href="http://localhost:8090/"/> anlegen,
+     PodTracker mit WEBSUB_CALLBACK_BASE_URL=http://localhost:5000 starten
+  3. Push auslösen: curl -X POST 'http://localhost:8090/publish?topic=<feed-url>' --data-binary @feed.xml
+"""
+
+import argparse
+import hashlib
+import hmac
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# topic -> Liste von (callback, secret)
+SUBSCRIPTIONS = {}
+LOCK = threading.Lock()
+
+
+def verify_subscription(topic, callback, secret, lease_seconds):
+    challenge = secrets.token_hex(16)
+    try:
+        response = requests.get(callback, params={'hub.mode': 'subscribe', 'hub.topic': topic,
+                                                  'hub.challenge': challenge, 'hub.lease_seconds': lease_seconds}, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"Verifizierung von {callback} fehlgeschlagen: {e}")
+        return
+    if response.status_code != 200 or response.text != challenge:
+        print(f"Verifizierung von {callback} fehlgeschlagen: Status {response.status_code}")
+        return
+    with LOCK:
+        subscribers = SUBSCRIPTIONS.setdefault(topic, [])
+        subscribers[:] = [entry for entry in subscribers if entry[0] != callback]
+        subscribers.append((callback, secret))
+    print(f"Abonnement verifiziert: {topic} -> {callback}")
+
+
+def publish(topic, body):
+    with LOCK:
+        subscribers = list(SUBSCRIPTIONS.get(topic, []))
+    for callback, secret in subscribers:
+        signature = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        try:
+            response = requests.post(callback, data=body, timeout=10,
+                                     headers={'Content-Type': 'application/rss+xml', 'X-Hub-Signature': f'sha256={signature}'})
+            print(f"Push an {callback}: Status {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            print(f"Push an {callback} fehlgeschlagen: {e}")
+    return len(subscribers)
+
+
+class HubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        if parsed.path == '/publish':
+            topic = parse_qs(parsed.query).get('topic', [''])[0]
+            count = publish(topic, body)
+            self._reply(200, f"An {count} Abonnenten zugestellt\n")
+            return
+
+        form = {key: values[0] for key, values in parse_qs(body.decode('utf-8')).items()}
+        if form.get('hub.mode') != 'subscribe' or not form.get('hub.topic') or not form.get('hub.callback'):
+            self._reply(400, "Ungültige Anfrage\n")
+            return
+        # Verifizierung asynchron wie bei echten Hubs
+        threading.Thread(target=verify_subscription, daemon=True,
+                         args=(form['hub.topic'], form['hub.callback'], form.get('hub.secret', ''),
+                               form.get('hub.lease_seconds', 864000))).start()
+        self._reply(202, "")
+
+    def _reply(self, status, text):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+    print(f"WebSub-Stub-Hub läuft auf http://localhost:{args.port}/")
+    ThreadingHTTPServer(('', args.port), HubHandler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,14 @@
 # Dies wird bei jedem Container-Start ausgeführt.
 # Es ist idempotent, d.h., es hat keine negativen Auswirkungen, wenn Tabellen bereits existieren.
 # Der 'flask init-db' Befehl handhabt den Anwendungskontext automatisch und ist robuster.
-echo "Running database migrations (init-db)..."
-flask init-db
-echo "Database migrations complete."
+# Mit FAST_STARTUP=1 entfällt dieser Schritt beim Containerstart (schnellerer Kaltstart);
+# 'flask init-db' muss dann vor dem Deployment separat ausgeführt werden (z.B. als Cloud Run Job).
+if [ "$FAST_STARTUP" != "1" ]; then
+    echo "Running database migrations (init-db)..."
+    flask init-db
+    echo "Database migrations complete."
+fi
 
 # Starte die Gunicorn-Anwendung
 echo "Starting Gunicorn server..."
-exec gunicorn --bind :$PORT --workers 1 --threads 8 --timeout 0 app:app
\ No newline at end of file
+exec gunicorn --bind :$PORT --workers 1 --threads ${GUNICORN_THREADS:-8} --timeout 0 app:app
\ No newline at end of file
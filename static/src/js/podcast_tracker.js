@@ -0,0 +1,963 @@
+let allFeeds = [];
+let allEpisodes = [];
+let filteredEpisodes = [];
+let currentSearchTerm = '';
+let feedsCollapsed = false;
+
+// Indizes für O(1)-Zugriffe statt allFeeds.find(...) pro Episode
+let feedsById = new Map();
+let episodesById = new Map();
+
+// Virtualisierte Episodentabelle: nur die sichtbaren Zeilen (plus Puffer) liegen im DOM
+const VIRTUAL_OVERSCAN = 20;
+const SEARCH_DEBOUNCE_MS = 200;
+let displayedEpisodes = [];
+let rowHeight = 37; // Schätzwert, wird nach dem ersten Rendern gemessen
+let rowHeightMeasured = false;
+let renderedRange = { start: -1, end: -1 };
+let scrollFrameRequested = false;
+let searchTimer = null;
+let highlightRegex = null;
+let highlightRegexTerm = null;
+
+// Promise-basiertes Callback für das benutzerdefinierte Modal
+let confirmActionResolve = null;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const urlInput = document.getElementById('rssUrl');
+    urlInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            addFeed();
+        }
+    });
+    loadDataFromBackend();
+
+    // Beim Scrollen nur das sichtbare Fenster der Tabelle neu rendern (höchstens einmal pro Frame)
+    document.querySelector('.table-container').addEventListener('scroll', scheduleVisibleRowsRender, { passive: true });
+    window.addEventListener('resize', scheduleVisibleRowsRender);
+
+    // NEU: Automatisches Ausblenden von Flask Flash Messages
+    document.querySelectorAll('.flash-message').forEach(function(flashMessage) {
+        // Überprüfe, ob es sich nicht um das Status-Element handelt, das von JS kontrolliert wird
+        // und ob es nicht bereits ausgeblendet ist (durch showStatus)
+        if (flashMessage.id !== 'status' && flashMessage.style.display !== 'none') {
+            setTimeout(function() {
+                flashMessage.style.transition = 'opacity 0.5s ease-out';
+                flashMessage.style.opacity = '0';
+                setTimeout(function() {
+                    flashMessage.remove(); // Entfernt das Element nach der Animation
+                }, 500); // Warte, bis die Opacity-Transition abgeschlossen ist
+            }, 5000); // 5 Sekunden, bevor das Ausblenden beginnt
+        }
+    });
+});
+
+// NEU: iTunes-Suchfunktion
+async function searchItunes(episodeId) {
+    const button = document.querySelector(`.itunes-search-btn[data-episode-id="${episodeId}"]`);
+    
+    // Immer klickbar - keine Blockierung mehr
+    
+    setButtonState(button, 'loading');
+    
+    try {
+        const response = await fetch(`/api/search-itunes/${episodeId}`, {
+            method: 'POST'
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            setButtonState(button, 'success');
+            window.open(result.url, '_blank');
+            showNotification('iTunes-Suche gestartet!', 'success');
+        } else {
+            setButtonState(button, 'failed');
+            showNotification('iTunes-Suche fehlgeschlagen', 'warning');
+        }
+    } catch (error) {
+        setButtonState(button, 'failed');
+        showNotification('Fehler bei der iTunes-Suche', 'error');
+    }
+}
+
+// NEU: YouTube-Suchfunktion
+async function searchYouTube(episodeId) {
+    const button = document.querySelector(`.youtube-search-btn[data-episode-id="${episodeId}"]`);
+    
+    // Immer klickbar - keine Blockierung mehr
+    
+    setButtonState(button, 'loading');
+    
+    try {
+        const response = await fetch(`/api/search-youtube/${episodeId}`, {
+            method: 'POST'
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            setButtonState(button, 'success');
+            window.open(result.url, '_blank');
+            showNotification('YouTube-Suche gestartet!', 'success');
+            
+            // Update der Tabelle mit YouTube-Link (falls direkter Link gefunden)
+            if (result.direct_link) {
+                updateEpisodeYouTubeLink(episodeId, result.direct_link);
+            }
+        } else {
+            setButtonState(button, 'failed');
+            showNotification('YouTube-Suche fehlgeschlagen', 'warning');
+        }
+    } catch (error) {
+        setButtonState(button, 'failed');
+        showNotification('Fehler bei der YouTube-Suche', 'error');
+    }
+}
+
+// NEU: Button-Status setzen
+function setButtonState(button, state) {
+    button.classList.remove('loading', 'success', 'failed');
+    if (state !== 'default') {
+        button.classList.add(state);
+    }
+}
+
+// NEU: Notification anzeigen
+function showNotification(message, type) {
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.textContent = message;
+    
+    document.body.appendChild(notification);
+    
+    setTimeout(() => {
+        notification.remove();
+    }, 3000);
+}
+
+// NEU: YouTube-Link in Episode aktualisieren
+function updateEpisodeYouTubeLink(episodeId, youtubeUrl) {
+    const episode = episodesById.get(episodeId);
+    if (episode) {
+        episode.youtube_url = youtubeUrl;
+        updateEpisodeRow(episodeId);
+    }
+}
+
+// Funktion zum Anzeigen des benutzerdefinierten Bestätigungsmodals
+function showConfirmationModal(message) {
+    const modal = document.getElementById('confirmationModal');
+    const modalMessage = document.getElementById('modalMessage');
+    modalMessage.textContent = message;
+    modal.classList.add('active');
+
+    return new Promise(resolve => {
+        confirmActionResolve = resolve;
+    });
+}
+
+// Funktion zum Ausblenden des Modals und Auflösen des Promises
+function hideConfirmationModal(confirmed) {
+    const modal = document.getElementById('confirmationModal');
+    modal.classList.remove('active');
+    if (confirmActionResolve) {
+        confirmActionResolve(confirmed);
+        confirmActionResolve = null; // Reset
+    }
+}
+
+async function fetchData(url, method = 'GET', data = null) {
+    const options = {
+        method: method,
+        headers: {
+            'Content-Type': 'application/json',
+        },
+    };
+    if (data) {
+        options.body = JSON.stringify(data);
+    }
+
+    try {
+        const response = await fetch(url, options);
+        if (!response.ok) {
+            const errorText = await response.text();
+            throw new Error(`HTTP error! Status: ${response.status}, Message: ${errorText}`);
+        }
+        if (method === 'DELETE') {
+            return {}; 
+        }
+        return await response.json();
+    } catch (error) {
+        console.error('Fehler beim Abrufen/Senden von Daten:', error);
+        showStatus(`Fehler: ${error.message}`, 'error');
+        return null;
+    }
+}
+
+async function loadDataFromBackend() {
+    showStatus('Lade Daten...', 'loading');
+    const feedsResponse = await fetchData('/feeds');
+    const episodesResponse = await fetchData('/episodes'); 
+
+    if (feedsResponse && episodesResponse) {
+        allFeeds = feedsResponse;
+        // Sortiere Feeds zuerst nach Thema, dann nach Podcast-Name
+        allFeeds.sort((a, b) => {
+            const topicA = (a.topic || '').toLowerCase();
+            const topicB = (b.topic || '').toLowerCase();
+            const nameA = (a.name || a.url).toLowerCase();
+            const nameB = (b.name || b.url).toLowerCase();
+
+            if (topicA < topicB) return -1;
+            if (topicA > topicB) return 1;
+            return nameA.localeCompare(nameB); // Sortiere nach Name, wenn Thema gleich ist
+        });
+
+        allEpisodes = episodesResponse;
+        buildIndexes();
+        allEpisodes.sort((a, b) => b._ts - a._ts);
+        
+        applyFilters();
+        updateFeedsList();
+        showStatus('', 'hide'); 
+    } else {
+        showStatus('Fehler beim Laden der Daten vom Backend', 'error');
+    }
+}
+
+function getEpisodeId(episode) {
+    return episode.id; 
+}
+
+// Baut die Feed-/Episoden-Indizes auf und berechnet pro Episode einmalig Zeitstempel und Suchtext
+function buildIndexes() {
+    feedsById = new Map(allFeeds.map(feed => [feed.id, feed]));
+    episodesById = new Map();
+    allEpisodes.forEach(episode => {
+        episode._ts = Date.parse(episode.pub_date);
+        indexEpisodeSearchText(episode);
+        episodesById.set(getEpisodeId(episode), episode);
+    });
+}
+
+function indexEpisodeSearchText(episode) {
+    const feed = feedsById.get(episode.feed_id);
+    const podcastName = feed ? (feed.name || feed.url) : '';
+    episode._searchText = [episode.title || '', podcastName, episode.host || ''].join('\n').toLowerCase();
+}
+
+function showStatus(message, type) {
+    const statusElement = document.getElementById('status'); 
+    if (!statusElement) {
+        console.error("Status-Element mit ID 'status' nicht gefunden!");
+        return;
+    }
+
+    if (type === 'hide') {
+        statusElement.style.transition = 'opacity 0.5s ease-out';
+        statusElement.style.opacity = '0';
+        setTimeout(() => {
+            statusElement.style.display = 'none';
+            statusElement.className = 'flash-message'; 
+        }, 500);
+        return;
+    }
+
+    statusElement.textContent = message;
+    statusElement.className = `flash-message flash-${type} rounded-lg shadow-lg text-sm p-3`;
+    statusElement.style.display = 'block';
+    statusElement.style.opacity = '1'; 
+    
+    if (type !== 'loading') { 
+        setTimeout(() => {
+            statusElement.style.transition = 'opacity 0.5s ease-out';
+            statusElement.style.opacity = '0';
+            setTimeout(() => {
+                statusElement.style.display = 'none';
+                statusElement.className = 'flash-message'; 
+            }, 500); 
+        }, 5000); 
+    }
+}
+
+async function addFeed() {
+    const urlInput = document.getElementById('rssUrl');
+    const url = urlInput.value.trim();
+    
+    if (!url) {
+        showStatus('Bitte geben Sie eine RSS-Feed-URL ein', 'error');
+        return;
+    }
+
+    if (!isValidUrl(url)) {
+        showStatus('Bitte geben Sie eine gültige URL ein', 'error');
+        return;
+    }
+
+    const existingFeed = allFeeds.find(feed => feed.url === url);
+    // KORREKTUR: Dies wird jetzt im Backend von `add_feed` behandelt
+    // if (existingFeed) {
+    //     showStatus('Dieser Feed wurde bereits hinzugefügt', 'error');
+    //     return;
+    // }
+
+    showStatus('Füge Feed hinzu...', 'loading');
+    // KORREKTUR: Endpoint von '/feeds' auf '/add_feed' geändert
+    const response = await fetchData('/add_feed', 'POST', { feed_url: url });
+
+    if (response && response.message) {
+        urlInput.value = '';
+        showStatus(response.message, 'success');
+        // KORREKTUR: Expliziter Refresh nicht mehr nötig, da Backend den add/update abwickelt
+        // await refreshFeedEpisodes(response.id); 
+        await loadDataFromBackend();
+    } else if (response && response.error) { // NEU: Fehler vom Backend anzeigen
+        showStatus(`Fehler beim Hinzufügen des Feeds: ${response.error}`, 'danger');
+    } else {
+        showStatus('Unbekannter Fehler beim Hinzufügen des Feeds', 'danger');
+    }
+}
+
+function isValidUrl(string) {
+    try {
+        new URL(string);
+        return true;
+    } catch (_) {
+        return false;
+    }
+}
+
+async function removeFeed(feedId) {
+    const feedToRemove = feedsById.get(feedId);
+    if (!feedToRemove) return;
+
+    const episodeCount = feedToRemove.episodes_count || 0;
+    let confirmationMessage = `Möchten Sie diesen Feed wirklich entfernen?`;
+    if (episodeCount > 0) {
+        confirmationMessage += `\n\nDies wird ${episodeCount} Episode(n) und alle zugehörigen Daten löschen.`;
+    }
+    
+    const userConfirmed = await showConfirmationModal(confirmationMessage);
+    if (!userConfirmed) {
+        return;
+    }
+    
+    showStatus('Entferne Feed...', 'loading');
+    // KORREKTUR: Endpoint auf '/delete_feed/:id' geändert
+    const response = await fetchData(`/delete_feed/${feedId}`, 'DELETE');
+
+    if (response !== null) {
+        showStatus(`Feed entfernt`, 'success');
+        await loadDataFromBackend();
+    } else { // NEU: Fehlerbehandlung
+        showStatus(`Fehler beim Entfernen des Feeds.`, 'danger');
+    }
+}
+
+function updateFeedsList() {
+    const feedsHeader = document.querySelector('.feeds-header');
+    const feedsContent = document.getElementById('feedsContent');
+    const feedCount = document.getElementById('feedCount');
+    
+    if (allFeeds.length === 0) {
+        feedsHeader.style.display = 'none';
+        feedsContent.innerHTML = '<p class="text-gray-600">Noch keine Podcasts hinzugefügt.</p>';
+        return;
+    }
+
+    feedsHeader.style.display = 'flex';
+    feedCount.textContent = allFeeds.length;
+
+    let feedsHtml = `
+        <div class="feed-list-header">
+            <div class="feed-header-col header-checkbox">Aktiv</div>
+            <div class="feed-header-col header-podcast-name">Podcast-Name</div>
+            <div class="feed-header-col header-rss-url">RSS-Adresse</div>
+            <div class="feed-header-col header-topic">Thema</div>
+            <div class="feed-header-col header-itunes">🎵</div>
+            <div class="feed-header-col header-youtube">📺</div>
+            <div class="feed-header-col header-actions">Aktionen</div>
+        </div>
+    `;
+
+    feedsHtml += allFeeds.map(feed => {
+        const isChecked = feed.is_active; 
+        const feedTopic = feed.topic || 'Klicken zum Bearbeiten';
+        const podcastName = feed.name || feed.url; 
+        // KORREKTUR: Homepage Link für Podcast-Name
+        const podcastLinkHtml = feed.homepage_url ? 
+            `<a href="${feed.homepage_url}" target="_blank" rel="noopener noreferrer" class="text-blue-600 hover:underline">${highlightText(podcastName, currentSearchTerm)}</a>` :
+            `${highlightText(podcastName, currentSearchTerm)}`;
+
+        // iTunes/YouTube-Verfügbarkeit
+        const itunesAvailable = feed.itunes_available;
+        const youtubeAvailable = feed.youtube_available;
+        
+        const itunesChecked = itunesAvailable === true ? 'checked' : '';
+        const itunesDisabled = ''; // Immer editierbar
+        const itunesTitle = 'iTunes-Verfügbarkeit';
+        
+        const youtubeChecked = youtubeAvailable === true ? 'checked' : '';
+        const youtubeDisabled = ''; // Immer editierbar  
+        const youtubeTitle = 'YouTube-Verfügbarkeit';
+
+        return `
+            <div class="feed-item">
+                <div class="feed-checkbox-container"> 
+                    <input type="checkbox" class="feed-checkbox" 
+                           ${isChecked ? 'checked' : ''} 
+                           onclick="toggleFeedActiveStatus(${feed.id}, this)">
+                </div>
+                <div class="feed-podcast-name" title="${podcastName}">${podcastLinkHtml}</div>
+                <div class="feed-url" title="${feed.url}">${feed.url}</div>
+                <span class="editable feed-topic" onclick="makeEditableFeedTopic(this, ${feed.id})">${highlightText(feedTopic, currentSearchTerm)}</span>
+                <div class="feed-availability-container">
+                    <input type="checkbox" class="availability-checkbox" 
+                           ${itunesChecked} ${itunesDisabled}
+                           title="${itunesTitle}"
+                           onclick="toggleAvailability(${feed.id}, 'itunes', this)">
+                </div>
+                <div class="feed-availability-container">
+                    <input type="checkbox" class="availability-checkbox" 
+                           ${youtubeChecked} ${youtubeDisabled}
+                           title="${youtubeTitle}"
+                           onclick="toggleAvailability(${feed.id}, 'youtube', this)">
+                </div>
+                <div class="flex items-center gap-2">
+                    <button class="update-single-feed icon-button" onclick="refreshFeedEpisodes(${feed.id})" title="Aktualisieren">🔄</button>
+                    <button class="remove-feed icon-button" onclick="removeFeed(${feed.id})" title="Entfernen">🗑️</button>
+                </div>
+            </div>
+        `;
+    }).join('');
+
+    feedsContent.innerHTML = feedsHtml;
+
+    if (!feedsCollapsed) {
+        feedsContent.style.maxHeight = feedsContent.scrollHeight + 'px';
+    }
+}
+
+async function toggleAvailability(feedId, platform, checkbox) {
+    try {
+        const newValue = checkbox.checked;
+        
+        // Backend-Update
+        const response = await fetchData(`/update_availability/${feedId}`, 'POST', {
+            platform: platform,
+            available: newValue
+        });
+        
+        if (response && response.success) {
+            // Lokale Daten aktualisieren
+            const feed = feedsById.get(feedId);
+            if (feed) {
+                if (platform === 'itunes') {
+                    feed.itunes_available = newValue;
+                } else if (platform === 'youtube') {
+                    feed.youtube_available = newValue;
+                }
+            }
+            
+            // WICHTIG: Feed-Liste und Episode-Icons sofort neu rendern
+            updateFeedsList();
+            refreshRenderedRows();
+            
+            showStatus(`${platform === 'itunes' ? 'iTunes' : 'YouTube'}-Verfügbarkeit aktualisiert`, 'success');
+        } else {
+            // Bei Fehler Checkbox zurücksetzen
+            checkbox.checked = !newValue;
+            const errorMsg = response?.message || 'Unbekannter Fehler';
+            showStatus(`Fehler beim Aktualisieren der ${platform === 'itunes' ? 'iTunes' : 'YouTube'}-Verfügbarkeit: ${errorMsg}`, 'danger');
+        }
+    } catch (error) {
+        // Bei Fehler Checkbox zurücksetzen
+        checkbox.checked = !checkbox.checked;
+        showStatus(`Fehler beim Aktualisieren der Verfügbarkeit: ${error.message}`, 'danger');
+    }
+}
+
+function toggleFeedsList() {
+    const feedsContent = document.getElementById('feedsContent');
+    const feedsToggle = document.getElementById('feedsToggle');
+    
+    feedsCollapsed = !feedsCollapsed;
+    
+    if (feedsCollapsed) {
+        feedsContent.style.maxHeight = '0';
+        feedsToggle.textContent = '►';
+        feedsToggle.classList.add('collapsed');
+    } else {
+        feedsContent.style.maxHeight = feedsContent.scrollHeight + 'px';
+        feedsToggle.textContent = '▼';
+        feedsToggle.classList.remove('collapsed');
+    }
+}
+
+async function toggleFeedActiveStatus(feedId, checkboxElement) {
+    const feed = feedsById.get(feedId);
+    if (!feed) return;
+
+    const newActiveStatus = checkboxElement.checked; 
+    
+    showStatus('Aktualisiere Aktiv-Status...', 'loading');
+    // KORREKTUR: Endpoint /feeds/:id mit PUT für Statusänderung
+    const response = await fetchData(`/feeds/${feedId}`, 'PUT', { is_active: newActiveStatus });
+
+    if (response) {
+        feed.is_active = newActiveStatus; 
+        showStatus(`Feed-Status aktualisiert: ${newActiveStatus ? 'Aktiv' : 'Inaktiv'}`, 'success');
+        applyFilters(); 
+    } else { // NEU: Fehlerbehandlung
+        checkboxElement.checked = !newActiveStatus; // Status im UI zurücksetzen
+        showStatus(`Fehler beim Aktualisieren des Feed-Status.`, 'danger');
+    }
+}
+
+async function refreshFeedEpisodes(feedId) {
+    showStatus('Aktualisiere Episoden...', 'loading');
+    // KORREKTUR: Endpoint /feeds/:id/refresh_episodes mit POST
+    const response = await fetchData(`/feeds/${feedId}/refresh_episodes`, 'POST');
+    if (response && response.message) {
+        showStatus(response.message, 'success');
+        await loadDataFromBackend(); // Wichtig: Daten neu laden nach Aktualisierung
+    } else if (response && response.error) { // NEU: Fehlerbehandlung
+        showStatus(`Fehler beim Aktualisieren der Episoden: ${response.error}`, 'danger');
+    } else {
+        showStatus('Unbekannter Fehler beim Aktualisieren der Episoden', 'danger');
+    }
+}
+
+async function updateAllFeeds() {
+    showStatus('Aktualisiere alle Feeds...', 'loading');
+    const response = await fetchData('/update_all_feeds', 'POST');
+    if (response && response.message) {
+        showStatus(response.message, 'success');
+        await loadDataFromBackend();
+    } else if (response && response.error) { // NEU: Fehlerbehandlung
+        showStatus(`Fehler beim Aktualisieren aller Feeds: ${response.error}`, 'danger');
+    } else {
+        showStatus('Unbekannter Fehler beim Aktualisieren aller Feeds', 'danger');
+    }
+}
+
+function applyFilters() {
+    const timeFilter = document.getElementById('timeFilter').value;
+    const countFilter = document.getElementById('countFilter').value;
+    const podcastFilter = document.getElementById('podcastFilter').value;
+    const topicFilter = document.getElementById('topicFilter').value;
+    const favoriteFilter = document.getElementById('favoriteFilter').value;
+    const activeFilter = document.getElementById('activeFilter').value;
+
+    // Start with all episodes
+    let filtered = [...allEpisodes];
+
+    // Apply time filter first
+    if (timeFilter !== 'all') {
+        const now = new Date();
+        let cutoffDate;
+        
+        switch (timeFilter) {
+            case 'week':
+                cutoffDate = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
+                break;
+            case 'month':
+                cutoffDate = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
+                break;
+            case 'quarter':
+                cutoffDate = new Date(now.getTime() - 90 * 24 * 60 * 60 * 1000);
+                break;
+            case 'year':
+                cutoffDate = new Date(now.getTime() - 365 * 24 * 60 * 60 * 1000);
+                break;
+        }
+        
+        if (cutoffDate) {
+            const cutoff = cutoffDate.getTime();
+            filtered = filtered.filter(episode => episode._ts >= cutoff);
+        }
+    }
+
+    // Apply other filters
+    filtered = filtered.filter(episode => {
+        const feed = feedsById.get(episode.feed_id);
+        if (!feed) return false;
+
+        // Podcast-Filter
+        if (podcastFilter && feed.name !== podcastFilter) return false;
+
+        // Thema-Filter
+        if (topicFilter && feed.topic !== topicFilter) return false;
+
+        // Favoriten-Filter
+        if (favoriteFilter === 'true' && !episode.is_favorite) return false;
+        if (favoriteFilter === 'false' && episode.is_favorite) return false;
+
+        // Aktiv-Filter
+        if (activeFilter === 'true' && !feed.is_active) return false;
+        if (activeFilter === 'false' && feed.is_active) return false;
+
+        return true;
+    });
+
+    // Apply count filter (after other filters)
+    if (countFilter !== 'all') {
+        const count = parseInt(countFilter);
+        filtered = filtered.slice(0, count);
+    }
+
+    filteredEpisodes = filtered;
+    document.querySelector('.table-container').scrollTop = 0;
+    searchEpisodes();
+    updateFilterOptions();
+}
+
+function updateFilterOptions() {
+    const podcastFilter = document.getElementById('podcastFilter');
+    const topicFilter = document.getElementById('topicFilter');
+
+    // Podcast-Optionen aktualisieren
+    const currentPodcast = podcastFilter.value;
+    podcastFilter.innerHTML = '<option value="">Alle Podcasts</option>';
+    const uniquePodcasts = [...new Set(allFeeds.map(feed => feed.name).filter(name => name))];
+    uniquePodcasts.sort().forEach(name => {
+        const option = document.createElement('option');
+        option.value = name;
+        option.textContent = name;
+        if (name === currentPodcast) option.selected = true;
+        podcastFilter.appendChild(option);
+    });
+
+    // Thema-Optionen aktualisieren
+    const currentTopic = topicFilter.value;
+    topicFilter.innerHTML = '<option value="">Alle Themen</option>';
+    const uniqueTopics = [...new Set(allFeeds.map(feed => feed.topic).filter(topic => topic))];
+    uniqueTopics.sort().forEach(topic => {
+        const option = document.createElement('option');
+        option.value = topic;
+        option.textContent = topic;
+        if (topic === currentTopic) option.selected = true;
+        topicFilter.appendChild(option);
+    });
+}
+
+// Sucheingaben entprellen: gefiltert wird erst, wenn der Nutzer kurz nicht tippt
+function scheduleSearch() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(searchEpisodes, SEARCH_DEBOUNCE_MS);
+}
+
+function searchEpisodes() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    if (searchTerm !== currentSearchTerm) {
+        document.querySelector('.table-container').scrollTop = 0;
+    }
+    currentSearchTerm = searchTerm;
+
+    let episodesToShow = filteredEpisodes;
+
+    if (searchTerm) {
+        // Titel, Podcast-Name und Host sind in episode._searchText vorberechnet (siehe buildIndexes)
+        episodesToShow = filteredEpisodes.filter(episode => episode._searchText.includes(searchTerm));
+    }
+
+    updateEpisodeTable(episodesToShow);
+}
+
+function clearSearch() {
+    clearTimeout(searchTimer);
+    document.getElementById('searchInput').value = '';
+    searchEpisodes();
+}
+
+function updateEpisodeTable(episodes) {
+    const tableBody = document.getElementById('episodeTableBody');
+    displayedEpisodes = episodes;
+    renderedRange = { start: -1, end: -1 };
+    
+    if (episodes.length === 0) {
+        tableBody.innerHTML = `
+            <tr>
+                <td colspan="7" class="no-results">
+                    <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9.172 16.172a4 4 0 015.656 0M9 12h6m-6-4h6m2 5.291A7.962 7.962 0 0112 15c-2.34 0-4.47-.881-6.08-2.33"/>
+                    </svg>
+                    <h3>Keine Episoden gefunden</h3>
+                    <p>Versuchen Sie andere Suchbegriffe oder Filter</p>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+
+    renderVisibleRows();
+}
+
+function scheduleVisibleRowsRender() {
+    if (scrollFrameRequested) return;
+    scrollFrameRequested = true;
+    requestAnimationFrame(() => {
+        scrollFrameRequested = false;
+        if (displayedEpisodes.length > 0) {
+            renderVisibleRows();
+        }
+    });
+}
+
+// Rendert nur die Zeilen im sichtbaren Bereich; Platzhalterzeilen halten die Gesamthöhe (Scrollbalken) korrekt
+function renderVisibleRows() {
+    const container = document.querySelector('.table-container');
+    const tableBody = document.getElementById('episodeTableBody');
+    const headerHeight = document.querySelector('#episodeTable thead').offsetHeight;
+    const viewportRows = Math.ceil(Math.max(container.clientHeight, window.innerHeight) / rowHeight);
+    const total = displayedEpisodes.length;
+
+    let start = Math.floor(Math.max(0, container.scrollTop - headerHeight) / rowHeight) - VIRTUAL_OVERSCAN;
+    start = Math.max(0, Math.min(start, total - viewportRows - VIRTUAL_OVERSCAN));
+    const end = Math.min(total, start + viewportRows + 2 * VIRTUAL_OVERSCAN);
+    if (start === renderedRange.start && end === renderedRange.end) return;
+    renderedRange = { start, end };
+
+    tableBody.innerHTML =
+        renderSpacerRow(start * rowHeight) +
+        displayedEpisodes.slice(start, end).map(renderEpisodeRow).join('') +
+        renderSpacerRow((total - end) * rowHeight);
+
+    // Tatsächliche Zeilenhöhe einmalig messen und das Fenster damit neu berechnen
+    if (!rowHeightMeasured) {
+        const firstRow = tableBody.querySelector('tr[data-episode-id]');
+        if (firstRow && firstRow.offsetHeight > 0) {
+            rowHeightMeasured = true;
+            if (firstRow.offsetHeight !== rowHeight) {
+                rowHeight = firstRow.offsetHeight;
+                renderedRange = { start: -1, end: -1 };
+                renderVisibleRows();
+            }
+        }
+    }
+}
+
+function renderSpacerRow(height) {
+    return height > 0 ? `<tr class="virtual-spacer" style="height: ${height}px"><td colspan="7"></td></tr>` : '';
+}
+
+// Nach Änderungen an Feeds (z.B. Verfügbarkeit), die viele Zeilen betreffen: nur das sichtbare Fenster neu rendern
+function refreshRenderedRows() {
+    renderedRange = { start: -1, end: -1 };
+    if (displayedEpisodes.length > 0) {
+        renderVisibleRows();
+    }
+}
+
+// Ersetzt nur die Zeile einer geänderten Episode, falls sie gerade gerendert ist
+function updateEpisodeRow(episodeId) {
+    const episode = episodesById.get(episodeId);
+    const row = document.querySelector(`#episodeTableBody tr[data-episode-id="${episodeId}"]`);
+    if (episode && row) {
+        row.outerHTML = renderEpisodeRow(episode);
+    }
+}
+
+function renderEpisodeRow(episode) {
+    const feed = feedsById.get(episode.feed_id);
+    const podcastName = feed ? (feed.name || feed.url) : 'Unbekannt';
+    const episodeId = getEpisodeId(episode);
+    
+    // Verfügbarkeitsstatus bestimmen
+    const itunesAvailable = feed ? feed.itunes_available : null;
+    const youtubeAvailable = feed ? feed.youtube_available : null;
+    
+    // iTunes Button-Styling basierend auf Verfügbarkeit
+    const itunesButtonClass = itunesAvailable === true ? 'itunes-search-btn available' : 
+                             itunesAvailable === false ? 'itunes-search-btn unavailable' : 
+                             'itunes-search-btn unknown';
+    const itunesTitle = itunesAvailable === true ? 'auf iTunes suchen' :
+                       itunesAvailable === false ? 'Vermutlich keine Episode verfügbar. Dennoch suchen? Klicken.' :
+                       'auf iTunes suchen (Verfügbarkeit unbekannt)';
+    const itunesDisabled = ''; // Immer klickbar
+    
+    // YouTube Button-Styling basierend auf Verfügbarkeit
+    const youtubeButtonClass = youtubeAvailable === true ? 'youtube-search-btn available' : 
+                              youtubeAvailable === false ? 'youtube-search-btn unavailable' : 
+                              'youtube-search-btn unknown';
+    const youtubeTitle = youtubeAvailable === true ? 'YouTube suchen' :
+                        youtubeAvailable === false ? 'Vermutlich keine Episode verfügbar. Dennoch suchen? Klicken.' :
+                        'YouTube suchen (Verfügbarkeit unbekannt)';
+    const youtubeDisabled = ''; // Immer klickbar
+    
+    // KORREKTUR: Homepage Link für Podcast-Name
+    const podcastLinkHtml = feed && feed.homepage_url ? 
+        `<a href="${feed.homepage_url}" target="_blank" rel="noopener noreferrer" class="podcast-name">${highlightText(podcastName, currentSearchTerm)}</a>` :
+        `<span class="podcast-name">${highlightText(podcastName, currentSearchTerm)}</span>`;
+
+    return `
+        <tr data-episode-id="${episodeId}">
+            <td title="${podcastName}">${podcastLinkHtml}</td>
+            <td>
+                <div class="episode-title" title="${episode.title}">
+                    ${episode.url ? 
+                        `<a href="${episode.url}" target="_blank" rel="noopener noreferrer" class="text-blue-600 hover:underline">${highlightText(episode.title, currentSearchTerm)}</a>` :
+                        highlightText(episode.title, currentSearchTerm)
+                    }
+                </div>
+            </td>
+            <td class="date">${formatDate(episode.pub_date)}</td>
+            <td>
+                <span class="editable host" onclick="makeEditableHost(this, ${episodeId})" title="${episode.host || 'Klicken zum Bearbeiten'}">${highlightText(episode.host || 'Klicken zum Bearbeiten', currentSearchTerm)}</span>
+            </td>
+            <td class="itunes-search-cell">
+                <button class="${itunesButtonClass}" 
+                        data-episode-id="${episodeId}" 
+                        title="${itunesTitle}"
+                        onclick="searchItunes(${episodeId})"
+                        ${itunesDisabled}>
+                    🎵
+                </button>
+            </td>
+            <td class="youtube-search-cell">
+                <button class="${youtubeButtonClass}" 
+                        data-episode-id="${episodeId}" 
+                        title="${youtubeTitle}"
+                        onclick="searchYouTube(${episodeId})"
+                        ${youtubeDisabled}>
+                    📺
+                </button>
+            </td>
+            <td>
+                <span class="favorite-star ${episode.is_favorite ? 'active' : 'inactive'}" 
+                      onclick="toggleFavorite(${episodeId})" 
+                      title="${episode.is_favorite ? 'Aus Favoriten entfernen' : 'Zu Favoriten hinzufügen'}">
+                    ${episode.is_favorite ? '★' : '☆'}
+                </span>
+            </td>
+        </tr>
+    `;
+}
+
+function highlightText(text, searchTerm) {
+    if (!searchTerm || !text) return text;
+    
+    // Regex nur bei geändertem Suchbegriff neu bauen; Sonderzeichen im Suchbegriff maskieren
+    if (searchTerm !== highlightRegexTerm) {
+        highlightRegex = new RegExp(`(${searchTerm.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')})`, 'gi');
+        highlightRegexTerm = searchTerm;
+    }
+    return text.replace(highlightRegex, '<span class="highlight">$1</span>');
+}
+
+function formatDate(dateString) {
+    const date = new Date(dateString);
+    return date.toLocaleDateString('de-DE', {
+        year: 'numeric',
+        month: '2-digit',
+        day: '2-digit'
+    });
+}
+
+async function toggleFavorite(episodeId) {
+    const episode = episodesById.get(episodeId);
+    if (!episode) return;
+
+    const newFavoriteStatus = !episode.is_favorite;
+    
+    // KORREKTUR: Endpoint /episodes/:id mit PUT für Favoriten-Status
+    const response = await fetchData(`/episodes/${episodeId}`, 'PUT', { is_favorite: newFavoriteStatus });
+
+    if (response) {
+        episode.is_favorite = newFavoriteStatus;
+        if (document.getElementById('favoriteFilter').value) {
+            applyFilters(); // Episode fällt ggf. aus dem Favoriten-Filter
+        } else {
+            updateEpisodeRow(episodeId); // Nur die geänderte Zeile neu rendern
+        }
+    } else { // NEU: Fehlerbehandlung
+        showStatus(`Fehler beim Aktualisieren des Favoriten-Status.`, 'danger');
+    }
+}
+
+function makeEditableHost(element, episodeId) {
+    if (element.classList.contains('editing')) return;
+
+    const currentText = element.textContent === 'Klicken zum Bearbeiten' ? '' : element.textContent;
+    const input = document.createElement('input');
+    input.type = 'text';
+    input.value = currentText;
+    input.className = 'w-full';
+
+    element.textContent = '';
+    element.appendChild(input);
+    element.classList.add('editing');
+    input.focus();
+    input.select();
+
+    async function saveHost() {
+        const newHost = input.value.trim();
+        element.classList.remove('editing');
+        
+        // KORREKTUR: Endpoint /episodes/:id mit PUT für Host-Update
+        const response = await fetchData(`/episodes/${episodeId}`, 'PUT', { host: newHost });
+
+        if (response) {
+            const episode = episodesById.get(episodeId);
+            if (episode) {
+                episode.host = newHost;
+                indexEpisodeSearchText(episode);
+            }
+            element.textContent = newHost || 'Klicken zum Bearbeiten';
+            element.title = newHost || 'Klicken zum Bearbeiten';
+        } else { // NEU: Fehlerbehandlung
+            element.textContent = currentText || 'Klicken zum Bearbeiten';
+            showStatus(`Fehler beim Aktualisieren des Hosts.`, 'danger');
+        }
+    }
+
+    input.addEventListener('blur', saveHost);
+    input.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            saveHost();
+        }
+    });
+}
+
+function makeEditableFeedTopic(element, feedId) {
+    if (element.classList.contains('editing')) return;
+
+    const currentText = element.textContent === 'Klicken zum Bearbeiten' ? '' : element.textContent;
+    const input = document.createElement('input');
+    input.type = 'text';
+    input.value = currentText;
+
+    element.textContent = '';
+    element.appendChild(input);
+    element.classList.add('editing');
+    input.focus();
+    input.select();
+
+    async function saveTopic() {
+        const newTopic = input.value.trim();
+        element.classList.remove('editing');
+        
+        // KORREKTUR: Endpoint /feeds/:id mit PUT für Topic-Update
+        const response = await fetchData(`/feeds/${feedId}`, 'PUT', { topic: newTopic });
+
+        if (response) {
+            const feed = feedsById.get(feedId);
+            if (feed) {
+                feed.topic = newTopic;
+            }
+            element.textContent = newTopic || 'Klicken zum Bearbeiten';
+            updateFilterOptions(); // Filter-Optionen aktualisieren
+        } else { // NEU: Fehlerbehandlung
+            element.textContent = currentText || 'Klicken zum Bearbeiten';
+            showStatus(`Fehler beim Aktualisieren des Themas.`, 'danger');
+        }
+    }
+
+    input.addEventListener('blur', saveTopic);
+    input.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            saveTopic();
+        }
+    });
+}
@@ -0,0 +1,152 @@
+// XLSX-Import und -Export. SheetJS (~900 KB) wird erst beim ersten Aufruf nachgeladen.
+let xlsxLoading = null;
+
+function loadXlsx() {
+    if (window.XLSX) {
+        return Promise.resolve(window.XLSX);
+    }
+    if (!xlsxLoading) {
+        xlsxLoading = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = window.PODTRACKER_ASSETS.xlsx;
+            script.onload = () => resolve(window.XLSX);
+            script.onerror = () => {
+                xlsxLoading = null; // Erneuter Versuch beim nächsten Aufruf
+                reject(new Error('SheetJS konnte nicht geladen werden'));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return xlsxLoading;
+}
+
+async function exportToXLSX() {
+    if (filteredEpisodes.length === 0) {
+        showStatus('Keine Episoden zum Exportieren vorhanden', 'warning');
+        return;
+    }
+
+    showStatus('Exportiere Episoden...', 'loading');
+
+    let XLSX;
+    try {
+        XLSX = await loadXlsx();
+    } catch (error) {
+        showStatus(`Fehler beim Exportieren: ${error.message}`, 'error');
+        return;
+    }
+
+    const episodesToExport = filteredEpisodes.map(episode => {
+        const feed = feedsById.get(episode.feed_id);
+        const podcastName = feed ? (feed.name || feed.url) : 'Unbekannt';
+        
+        return {
+            'Podcast-Name': podcastName,
+            'Episode': episode.title,
+            'Datum': formatDate(episode.pub_date),
+            'Host': episode.host || '',
+            'Thema': feed ? (feed.topic || '') : '',
+            'Favorit': episode.is_favorite ? 'Ja' : 'Nein'
+        };
+    });
+
+    const ws = XLSX.utils.json_to_sheet(episodesToExport);
+    const wb = XLSX.utils.book_new();
+    
+    const colWidths = [
+        { wch: 32 }, // Podcast-Name
+        { wch: 50 }, // Episode
+        { wch: 12 }, // Datum
+        { wch: 20 }, // Host
+        { wch: 30 }, // Thema
+        { wch: 10 }  // Favorit
+    ];
+    ws['!cols'] = colWidths;
+    
+    XLSX.utils.book_append_sheet(wb, ws, 'Podcast Episodes');
+    
+    const fileName = `podcast_episodes_${new Date().toISOString().split('T')[0]}.xlsx`;
+    
+    XLSX.writeFile(wb, fileName);
+
+    showStatus(`${episodesToExport.length} Episoden als XLSX exportiert`, 'success');
+}
+
+async function importFeedsFromXLSX(event) {
+    const file = event.target.files[0];
+    if (!file) {
+        showStatus('Keine Datei ausgewählt.', 'error');
+        return;
+    }
+
+    showStatus('Importiere Feeds aus XLSX...', 'loading');
+
+    const reader = new FileReader();
+    reader.onload = async function(e) {
+        try {
+            const XLSX = await loadXlsx();
+            const data = new Uint8Array(e.target.result);
+            const workbook = XLSX.read(data, { type: 'array' });
+            const sheetName = workbook.SheetNames[0];
+            const worksheet = workbook.Sheets[sheetName];
+            // NEU: header: 1, um die erste Zeile als Header zu verwenden
+            const json = XLSX.utils.sheet_to_json(worksheet, { header: 1 }); 
+
+            // NEU: Annahme, dass die erste Zeile die Header sind
+            const headers = json[0];
+            const rows = json.slice(1); // Die eigentlichen Datenzeilen
+
+            const feedsToImport = [];
+            rows.forEach(rowArray => {
+                const row = {};
+                headers.forEach((header, index) => {
+                    row[header] = rowArray[index];
+                });
+
+                // Sicherstellen, dass die Spaltennamen korrekt sind und die Daten sauber extrahiert werden
+                // Zugriff über die tatsächlichen Spaltennamen aus der XLSX-Datei
+                const rssUrl = row['RSS-Adresse']; 
+                const podcastName = row['Podcast-Name'] || null; 
+                const podcastTopic = row['Thema'] || null; 
+                // Konvertierung von 'aktiv' Spalte: Excel kann TRUE/FALSE oder 1/0 zurückgeben
+                // Oder ein leerer String, wenn die Zelle leer ist.
+                const isActive = (row['aktiv'] === true || String(row['aktiv']).toUpperCase() === 'TRUE' || row['aktiv'] === 1); 
+
+                if (rssUrl && isValidUrl(rssUrl)) {
+                    feedsToImport.push({
+                        url: rssUrl,
+                        name: podcastName,
+                        topic: podcastTopic,
+                        is_active: isActive 
+                    });
+                } else {
+                    console.warn('Ungültige RSS-Adresse in XLSX übersprungen:', rssUrl);
+                }
+            });
+
+            if (feedsToImport.length === 0) {
+                showStatus('Keine gültigen Feeds in der XLSX-Datei gefunden.', 'error');
+                return;
+            }
+
+            // KORREKTUR: Endpoint zu `/import_feeds_xlsx` geändert
+            const response = await fetchData('/import_feeds_xlsx', 'POST', feedsToImport);
+
+            if (response && response.message) {
+                showStatus(response.message, 'success');
+                await loadDataFromBackend(); 
+            } else {
+                // NEU: Zeige detailliertere Fehlermeldungen vom Backend
+                showStatus(`Fehler beim Importieren der XLSX-Feeds: ${response.error || 'Unbekannter Fehler'}`, 'error');
+                if (response && response.errors) {
+                    response.errors.forEach(err => console.error("Import Fehler:", err));
+                }
+            }
+
+        } catch (error) {
+            console.error('Fehler beim Importieren der XLSX-Feeds:', error);
+            showStatus(`Fehler beim Importieren der XLSX-Feeds: ${error.message}`, 'error');
+        }
+    };
+    reader.readAsArrayBuffer(file);
+}
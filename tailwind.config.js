@@ -0,0 +1,8 @@
+/** Tailwind-Konfiguration für scripts/build_assets.py: nur die hier verwendeten Klassen landen im CSS. */
+module.exports = {
+  content: ['./podcast_tracker-DB.html', './static/src/js/**/*.js'],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
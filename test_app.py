@@ -6,11 +6,119 @@ Test-Skript für die Podcast-Tracker-Applikation mit neuen Suchfunktionen
 import requests
 import json
 import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 
 # Konfiguration
 BASE_URL = "http://localhost:5000"  # Ändern Sie dies für Ihre Deployment-URL
 TEST_EPISODE_ID = 1  # Ändern Sie dies zu einer gültigen Episode-ID
+API_TOKEN = os.getenv("PODTRACKER_API_TOKEN")  # Erzeugen mit: flask create-api-token <username>
+
+_LOCAL_APP = None
+
+def local_app():
+    """Importiert die Applikation einmalig mit einer temporären SQLite-Datenbank (Lese-Engine auf dieselbe Datei)"""
+    global _LOCAL_APP
+    if _LOCAL_APP is None:
+        tmp_dir = tempfile.mkdtemp(prefix='podtracker-test-')
+        database_url = 'sqlite:///' + os.path.join(tmp_dir, 'podcast_tracker.db')
+        os.environ['DATABASE_URL'] = database_url
+        os.environ['DATABASE_READ_URL'] = database_url
+        os.environ['FEED_ARCHIVE_DIR'] = os.path.join(tmp_dir, 'feed_archive')
+        os.environ['SNAPSHOT_DIR'] = os.path.join(tmp_dir, 'snapshots')
+        os.environ['WEBHOOK_WORKER_ENABLED'] = '0'
+        os.environ['WEBSUB_CALLBACK_BASE_URL'] = ''
+        import app as podtracker
+        podtracker.app.config['TESTING'] = True
+        with podtracker.app.app_context():
+            podtracker.db.create_all()
+            user = podtracker.User(username='tester')
+            user.set_password('tester-pw')
+            podtracker.db.session.add(user)
+            podtracker.db.session.commit()
+        _LOCAL_APP = podtracker
+    return _LOCAL_APP
+
+def local_client():
+    """Angemeldeter Test-Client der lokalen Applikation"""
+    client = local_app().app.test_client()
+    client.post('/login', data={'username': 'tester', 'password': 'tester-pw'})
+    return client
+
+def local_feed_content(count, title='Testpodcast'):
+    """RSS-Feed mit count Episoden (neueste zuerst)"""
+    items = ''.join(
+        f"<item><title>Folge {number}</title><description>Beschreibung {number}</description>"
+        f"<pubDate>{datetime(2024, 1, number, 10):%a, %d %b %Y %H:%M:%S} +0000</pubDate><enclosure url='https://example.com/{number}.mp3'/></item>"
+        for number in range(count, 0, -1))
+    return f"<?xml version='1.0'?><rss><channel><title>{title}</title>{items}</channel></rss>".encode('utf-8')
+
+def local_feed(podtracker, feed_url, count):
+    """Legt einen vom Test-Benutzer abonnierten Feed mit count Episoden an und gibt seine ID zurück"""
+    with podtracker.app.app_context():
+        feed = podtracker.PodcastFeed(url=feed_url, name=feed_url)
+        podtracker.db.session.add(feed)
+        podtracker.db.session.flush()
+        podtracker.subscribe_feed(podtracker.User.query.filter_by(username='tester').one().id, feed.id)
+        podtracker.db.session.commit()
+        feed_id = feed.id
+    local_refresh(podtracker, feed_id, count)
+    return feed_id
+
+def local_refresh(podtracker, feed_id, count):
+    """Vollständiger Refresh eines lokalen Feeds mit count Episoden"""
+    with podtracker.app.app_context():
+        feed_data, episodes_data = podtracker.parse_feed_content(local_feed_content(count))
+        podtracker.store_parsed_feed(feed_id, feed_data, episodes_data)
+        podtracker.db.session.commit()
+
+class LocalFeedResponse:
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+@contextmanager
+def local_feed_urls(feeds):
+    """Beantwortet requests.get für die URLs aus feeds ({URL: Inhalt}) lokal, alle anderen Abrufe schlagen fehl"""
+    original_get = requests.get
+
+    def local_get(url, *args, **kwargs):
+        if url in feeds:
+            return LocalFeedResponse(url, feeds[url])
+        raise requests.exceptions.ConnectionError(f"Offline-Test: {url}")
+
+    requests.get = local_get
+    try:
+        yield
+    finally:
+        requests.get = original_get
+
+@contextmanager
+def local_sqlite_tuned(podtracker):
+    """Aktiviert vorübergehend das SQLite-Produktionsprofil (WAL, busy_timeout, Schreib-Thread)"""
+    def reconnect():
+        with podtracker.app.app_context():
+            for engine in podtracker.db.engines.values():
+                engine.dispose()
+
+    podtracker.app.config['SQLITE_TUNED'] = True
+    reconnect()
+    try:
+        yield
+    finally:
+        podtracker.app.config['SQLITE_TUNED'] = False
+        reconnect()
+
+def checked_out_connections(podtracker):
+    """Anzahl ausgeliehener Verbindungen über alle Engines (primär und Lese-Engine)"""
+    with podtracker.app.app_context():
+        return sum(engine.pool.checkedout() for engine in podtracker.db.engines.values())
 
 def test_transcript_search():
     """Testet die Transkript-Suchfunktion"""
@@ -100,6 +208,393 @@ def test_episodes_api():
     
     print("-" * 50)
 
+def test_api_v2_stateless():
+    """Testet, dass die v2-API ohne Session-Cookie antwortet"""
+    print("🔑 Teste zustandslose API v2...")
+    
+    if not API_TOKEN:
+        print("⚠️ PODTRACKER_API_TOKEN nicht gesetzt, Test übersprungen")
+        print("-" * 50)
+        return
+    
+    url = f"{BASE_URL}/api/v2/episodes/{TEST_EPISODE_ID}"
+    
+    try:
+        response = requests.put(url, json={}, headers={"Authorization": f"Bearer {API_TOKEN}"}, timeout=10)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            print(f"✅ Antwort: {response.json().get('message')}")
+            if 'Set-Cookie' in response.headers:
+                print(f"❌ Unerwarteter Set-Cookie-Header: {response.headers['Set-Cookie'][:60]}...")
+            else:
+                print("✅ Kein Set-Cookie-Header")
+        else:
+            print(f"❌ Fehler: {response.text}")
+            
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Netzwerkfehler: {e}")
+    
+    print("-" * 50)
+
+def test_stats_api():
+    """Testet die vorberechneten Statistiken über die v2-API"""
+    print("📊 Teste Statistik-API...")
+    
+    if not API_TOKEN:
+        print("⚠️ PODTRACKER_API_TOKEN nicht gesetzt, Test übersprungen")
+        print("-" * 50)
+        return
+    
+    url = f"{BASE_URL}/api/v2/stats"
+    
+    try:
+        response = requests.get(url, params={"granularity": "week"}, headers={"Authorization": f"Bearer {API_TOKEN}"}, timeout=10)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✅ {data['episodes']} Episoden, {data['favorites']} Favoriten, {len(data['topics'])} Themen")
+        else:
+            print(f"❌ Fehler: {response.text}")
+            
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Netzwerkfehler: {e}")
+    
+    print("-" * 50)
+
+def test_saved_search_unread_counts():
+    """Testet die ungelesenen Treffer der gespeicherten Suchen über die v2-API"""
+    print("🔖 Teste gespeicherte Suchen...")
+    
+    if not API_TOKEN:
+        print("⚠️ PODTRACKER_API_TOKEN nicht gesetzt, Test übersprungen")
+        print("-" * 50)
+        return
+    
+    url = f"{BASE_URL}/api/v2/saved_searches/unread_counts"
+    
+    try:
+        response = requests.get(url, headers={"Authorization": f"Bearer {API_TOKEN}"}, timeout=10)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✅ {len(data)} gespeicherte Suchen, {sum(data.values())} ungelesene Treffer")
+        else:
+            print(f"❌ Fehler: {response.text}")
+            
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Netzwerkfehler: {e}")
+    
+    print("-" * 50)
+
+def test_streamed_episodes_release_connections():
+    """Gestreamte Episodenliste gibt ihre Datenbankverbindung nach dem Ausliefern zurück (lokal, ohne Server)"""
+    print("🔌 Teste Verbindungsfreigabe der gestreamten Episodenliste...")
+    podtracker = local_app()
+    client = local_client()
+    for _ in range(3):
+        response = client.get('/episodes')
+        assert response.status_code == 200
+        assert isinstance(json.loads(response.get_data()), list)
+        response.close()
+    assert checked_out_connections(podtracker) == 0
+    print("✅ Keine ausgeliehenen Verbindungen nach dem Streaming")
+    print("-" * 50)
+
+def test_streamed_saved_search_episodes_release_connections():
+    """Gestreamte Treffer einer gespeicherten Suche geben ihre Verbindung zurück (lokal, ohne Server)"""
+    print("🔌 Teste Verbindungsfreigabe der Treffer gespeicherter Suchen...")
+    podtracker = local_app()
+    client = local_client()
+    search_id = client.post('/saved_searches', json={'name': 'Alle'}).get_json()['id']
+    for params in ('', '?unread=1'):
+        response = client.get(f'/saved_searches/{search_id}/episodes{params}')
+        assert response.status_code == 200
+        assert isinstance(json.loads(response.get_data()), list)
+        response.close()
+    assert checked_out_connections(podtracker) == 0
+    print("✅ Keine ausgeliehenen Verbindungen nach dem Streaming")
+    print("-" * 50)
+
+def test_webhook_event_ids_after_prune():
+    """Nach dem Leeren der Outbox liegen neue Ereignis-IDs über dem Cursor der Webhooks (lokal, ohne Server)"""
+    print("🪝 Teste Ereignis-IDs nach dem Aufräumen der Outbox...")
+    podtracker = local_app()
+    with podtracker.app.app_context():
+        endpoint = podtracker.create_webhook('http://localhost:9/hook')
+        podtracker.add_episode_events([('added', 1, episode_id, {'id': episode_id}) for episode_id in range(1, 4)])
+        podtracker.db.session.commit()
+        # Alle Ereignisse als zugestellt markieren und aufräumen
+        endpoint.last_event_id = podtracker.db.session.query(podtracker.db.func.max(podtracker.EpisodeEvent.id)).scalar()
+        podtracker.db.session.commit()
+        podtracker.prune_delivered_events()
+        assert podtracker.EpisodeEvent.query.filter(podtracker.EpisodeEvent.id <= endpoint.last_event_id).count() <= 1
+
+        podtracker.add_episode_events([('removed', 1, 4, {'id': 4})])
+        podtracker.db.session.commit()
+        pending = podtracker.EpisodeEvent.query.filter(podtracker.EpisodeEvent.id > endpoint.last_event_id).all()
+        assert [event.episode_id for event in pending] == [4]
+        # Ein neuer Webhook beginnt hinter dem neuesten Ereignis
+        assert podtracker.create_webhook('http://localhost:9/other').last_event_id == pending[0].id
+        podtracker.db.session.rollback()
+        podtracker.WebhookEndpoint.query.delete()
+        podtracker.db.session.commit()
+    print("✅ Neue Ereignisse werden nach dem Aufräumen weiter zugestellt")
+    print("-" * 50)
+
+def test_full_refresh_keeps_saved_search_read_state():
+    """Gelesen-Markierungen gespeicherter Suchen überstehen einen vollständigen Refresh (lokal, ohne Server)"""
+    print("📖 Teste Gelesen-Status nach vollständigem Refresh...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/read-state.xml', 3)
+    search_id = client.post('/saved_searches', json={'name': 'Lesestatus', 'feed_id': feed_id}).get_json()['id']
+    assert client.post(f'/saved_searches/{search_id}/read').get_json()['unread_count'] == 0
+
+    local_refresh(podtracker, feed_id, 4)
+    unread = client.get(f'/saved_searches/{search_id}/episodes?unread=1').get_json()
+    assert [episode['title'] for episode in unread] == ['Folge 4']
+    print("✅ Nur die neue Episode ist ungelesen")
+    print("-" * 50)
+
+def test_full_refresh_keeps_favorite_saved_search_matches():
+    """Eigene Favoriten bleiben nach einem vollständigen Refresh Treffer einer Nur-Favoriten-Suche (lokal, ohne Server)"""
+    print("⭐ Teste Favoriten-Suche nach vollständigem Refresh...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/favorites.xml', 3)
+    with podtracker.app.app_context():
+        episode_id = podtracker.Episode.query.filter_by(feed_id=feed_id, title='Folge 2').one().id
+    assert client.put(f'/episodes/{episode_id}', json={'is_favorite': True}).status_code == 200
+    search_id = client.post('/saved_searches', json={'name': 'Favoriten', 'feed_id': feed_id, 'is_favorite': True}).get_json()['id']
+
+    local_refresh(podtracker, feed_id, 4)
+    matches = client.get(f'/saved_searches/{search_id}/episodes').get_json()
+    assert [(episode['title'], episode['is_favorite']) for episode in matches] == [('Folge 2', True)]
+    print("✅ Favorit weiterhin Treffer der gespeicherten Suche")
+    print("-" * 50)
+
+def test_full_refresh_keeps_episode_ids():
+    """Ein vollständiger Refresh gleicht Episoden ab statt sie neu anzulegen (lokal, ohne Server)"""
+    print("🔁 Teste Abgleich der Episoden beim vollständigen Refresh...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/upsert.xml', 3)
+
+    def stored_episodes():
+        with podtracker.app.app_context():
+            return {title: (episode_id, updated_at) for episode_id, title, updated_at in podtracker.db.session.query(
+                podtracker.Episode.id, podtracker.Episode.title, podtracker.Episode.updated_at).filter_by(feed_id=feed_id)}
+
+    before = stored_episodes()
+    local_refresh(podtracker, feed_id, 3)
+    assert stored_episodes() == before  # gleiche IDs, updated_at unverändert (keine Zeilen im inkrementellen Snapshot)
+    local_refresh(podtracker, feed_id, 4)
+    after = stored_episodes()
+    assert set(after) == {'Folge 1', 'Folge 2', 'Folge 3', 'Folge 4'}
+    assert {title: after[title] for title in before} == before
+    local_refresh(podtracker, feed_id, 2)
+    assert stored_episodes() == {title: before[title] for title in ('Folge 1', 'Folge 2')}
+    feeds = {feed['id']: feed for feed in client.get('/feeds').get_json()}
+    assert feeds[feed_id]['episodes_count'] == 2
+    print("✅ IDs stabil, entfallene Episoden entfernt, Statistik aktuell")
+    print("-" * 50)
+
+def test_batch_update_rejects_invalid_values():
+    """Ungültige Werte in /episodes/batch ergeben 400 statt eines Serverfehlers (lokal, ohne Server)"""
+    print("🧾 Teste Validierung der Sammeländerungen...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/batch.xml', 2)
+    with podtracker.app.app_context():
+        episode_id = podtracker.Episode.query.filter_by(feed_id=feed_id, title='Folge 1').one().id
+    invalid_requests = [
+        {'updates': [{'id': episode_id, 'pub_date': 20240131}]},
+        {'updates': [{'id': episode_id, 'pub_date': 'gestern'}]},
+        {'updates': [{'id': episode_id, 'title': ['Liste']}]},
+        {'updates': [{'id': episode_id, 'host': {'name': 'Objekt'}}]},
+        {'updates': [{'id': episode_id, 'title': None}]},
+        {'filter': {'feed_id': 'abc'}, 'set': {'host': 'x'}},
+        {'filter': {'ids': ['x']}, 'set': {'host': 'x'}},
+        {'filter': {'ids': 5}, 'set': {'host': 'x'}},
+        {'filter': {'feed_id': feed_id}, 'set': {'url': 42}},
+        [episode_id],
+    ]
+    for payload in invalid_requests:
+        response = client.post('/episodes/batch', json=payload)
+        assert response.status_code == 400, (payload, response.status_code)
+        assert 'error' in response.get_json()
+
+    response = client.post('/episodes/batch', json={'updates': [{'id': episode_id, 'pub_date': '2024-02-01T08:00:00', 'host': None}]})
+    assert response.status_code == 200
+    with podtracker.app.app_context():
+        assert podtracker.db.session.get(podtracker.Episode, episode_id).pub_date == datetime(2024, 2, 1, 8)
+    print("✅ Ungültige Werte abgewiesen, gültige übernommen")
+    print("-" * 50)
+
+def test_shared_feed_requires_admin():
+    """Gemeinsame Feed- und Episodendaten ändert bei mehreren Abonnenten nur ein Administrator (lokal, ohne Server)"""
+    print("🔒 Teste Schutz gemeinsam abonnierter Feeds...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/shared.xml', 2)
+    with podtracker.app.app_context():
+        episode_id = podtracker.Episode.query.filter_by(feed_id=feed_id).first().id
+    # Als einziger Abonnent darf der Benutzer umbenennen
+    assert client.put(f'/feeds/{feed_id}', json={'name': 'Mein Name'}).status_code == 200
+
+    with podtracker.app.app_context():
+        other = podtracker.User(username='mitleser')
+        other.set_password('mitleser-pw')
+        podtracker.db.session.add(other)
+        podtracker.db.session.flush()
+        podtracker.subscribe_feed(other.id, feed_id)
+        podtracker.db.session.commit()
+    assert client.put(f'/feeds/{feed_id}', json={'name': 'Fremder Name'}).status_code == 403
+    assert client.put(f'/episodes/{episode_id}', json={'title': 'Fremder Titel'}).status_code == 403
+    assert client.post('/episodes/batch', json={'filter': {'feed_id': feed_id}, 'set': {'title': 'x'}}).status_code == 403
+    assert client.delete(f'/delete_episode/{episode_id}').status_code == 403
+    assert client.post(f'/update_availability/{feed_id}', json={'platform': 'itunes', 'available': False}).status_code == 403
+    # Nicht abonnierte Feeds sind weder prüf- noch änderbar
+    with podtracker.app.app_context():
+        foreign = podtracker.PodcastFeed(url='https://example.com/foreign.xml', name='Fremd')
+        podtracker.db.session.add(foreign)
+        podtracker.db.session.commit()
+        foreign_id = foreign.id
+    assert client.post(f'/api/check-availability/{foreign_id}').status_code == 404
+    assert client.post(f'/update_availability/{foreign_id}', json={'platform': 'itunes', 'available': True}).status_code == 404
+    # Eigener Stand und eigenes Abonnement bleiben änderbar
+    assert client.put(f'/episodes/{episode_id}', json={'is_favorite': True}).status_code == 200
+    assert client.put(f'/feeds/{feed_id}', json={'is_active': False}).status_code == 200
+    with podtracker.app.app_context():
+        assert podtracker.db.session.get(podtracker.PodcastFeed, feed_id).name == 'Mein Name'
+        assert podtracker.db.session.get(podtracker.Episode, episode_id) is not None
+    print("✅ Gemeinsame Daten geschützt, eigener Stand änderbar")
+    print("-" * 50)
+
+def test_writes_under_sqlite_tuned():
+    """Feed anlegen und Episode bearbeiten im SQLite-Produktionsprofil (lokal, ohne Server)"""
+    print("🗄️ Teste Schreibzugriffe im SQLite-Produktionsprofil...")
+    podtracker = local_app()
+    client = local_client()
+    feed_url = 'https://example.com/tuned.xml'
+    with local_sqlite_tuned(podtracker), local_feed_urls({feed_url: local_feed_content(3)}):
+        response = client.post('/add_feed', json={'feed_url': feed_url})
+        assert response.status_code == 201, response.get_json()
+        with podtracker.app.app_context():
+            feed = podtracker.PodcastFeed.query.filter_by(url=feed_url).one()
+            assert podtracker.Subscription.query.filter_by(feed_id=feed.id).count() == 1
+            episode_id = podtracker.Episode.query.filter_by(feed_id=feed.id, title='Folge 3').one().id
+        assert client.put(f'/episodes/{episode_id}', json={'is_favorite': True, 'title': 'Umbenannt'}).status_code == 200
+        assert client.post(f'/feeds/{feed.id}/refresh_episodes?full=1').status_code == 200
+        with podtracker.app.app_context():
+            assert podtracker.db.session.get(podtracker.Episode, episode_id).title == 'Folge 3'
+    print("✅ Feed mit Abonnement angelegt, Episode bearbeitet und aktualisiert")
+    print("-" * 50)
+
+def test_restored_episode_stays_restored():
+    """Eine aus dem Archiv zurückgeholte Episode wird nicht erneut archiviert (lokal, ohne Server)"""
+    print("📦 Teste Wiederherstellung aus dem Episodenarchiv...")
+    podtracker = local_app()
+    client = local_client()
+    feed_id = local_feed(podtracker, 'https://example.com/restore.xml', 2)
+    with podtracker.app.app_context():
+        episode_ids = [episode_id for (episode_id,) in podtracker.db.session.query(podtracker.Episode.id).filter_by(feed_id=feed_id)]
+        cutoff = podtracker.retention_cutoff(1)
+        candidates = {episode_id for (episode_id,) in podtracker.archive_candidates_query(cutoff)}
+        assert set(episode_ids) <= candidates
+        podtracker.run_ingest_write(podtracker.archive_episode_batch, episode_ids)
+        archived_id = podtracker.ArchivedEpisode.query.filter_by(feed_id=feed_id, title='Folge 1').one().id
+    response = client.post(f'/episodes/archive/{archived_id}/restore')
+    assert response.status_code == 200
+    restored_id = response.get_json()['id']
+    with podtracker.app.app_context():
+        assert podtracker.db.session.get(podtracker.Episode, restored_id).restored_at is not None
+        candidates = {episode_id for (episode_id,) in podtracker.archive_candidates_query(cutoff)}
+        assert restored_id not in candidates
+    print("✅ Wiederhergestellte Episode bleibt in der Episodentabelle")
+    print("-" * 50)
+
+def test_merge_duplicate_feeds():
+    """Doppelte Feeds mit überlappenden Episoden und Abonnements zusammenführen (lokal, ohne Server)"""
+    print("🔗 Teste Zusammenführen doppelter Feeds...")
+    podtracker = local_app()
+    client = local_client()
+    target_id = local_feed(podtracker, 'https://www.example.com/merge.xml/', 3)
+    duplicate_id = local_feed(podtracker, 'http://example.com/merge.xml', 4)
+    assert podtracker.canonicalize_feed_url('https://www.example.com/merge.xml/') == \
+        podtracker.canonicalize_feed_url('http://example.com/merge.xml')
+    with podtracker.app.app_context():
+        target_episodes = dict(podtracker.db.session.query(podtracker.Episode.title, podtracker.Episode.id).filter_by(feed_id=target_id))
+        duplicate_episodes = dict(podtracker.db.session.query(podtracker.Episode.title, podtracker.Episode.id).filter_by(feed_id=duplicate_id))
+        reader = podtracker.User(username='zweitleser')
+        reader.set_password('zweitleser-pw')
+        podtracker.db.session.add(reader)
+        podtracker.db.session.flush()
+        podtracker.subscribe_feed(reader.id, duplicate_id)
+        podtracker.db.session.commit()
+        reader_id = reader.id
+    assert client.put(f"/episodes/{duplicate_episodes['Folge 2']}", json={'is_favorite': True}).status_code == 200
+
+    with podtracker.app.app_context():
+        assert [target_id, duplicate_id] in podtracker.find_duplicate_feed_groups(use_fingerprint=False)
+        assert podtracker.run_ingest_write(podtracker.merge_feeds, target_id, duplicate_id) == 1
+        assert podtracker.db.session.get(podtracker.PodcastFeed, duplicate_id) is None
+        episodes = dict(podtracker.db.session.query(podtracker.Episode.title, podtracker.Episode.id).filter_by(feed_id=target_id))
+        assert episodes == {**target_episodes, 'Folge 4': duplicate_episodes['Folge 4']}
+        assert podtracker.Episode.query.filter_by(feed_id=duplicate_id).count() == 0
+        tester_id = podtracker.User.query.filter_by(username='tester').one().id
+        assert {subscription.user_id for subscription in podtracker.Subscription.query.filter_by(feed_id=target_id)} == {tester_id, reader_id}
+        assert podtracker.Subscription.query.filter_by(feed_id=duplicate_id).count() == 0
+    episodes = {episode['title']: episode for episode in client.get(f'/episodes?feed_id={target_id}').get_json()}
+    assert episodes['Folge 2']['is_favorite'] is True
+    feeds = {feed['id']: feed for feed in client.get('/feeds').get_json()}
+    assert duplicate_id not in feeds and feeds[target_id]['episodes_count'] == 4
+    print("✅ Episoden abgeglichen, Abonnements und Favoriten übernommen")
+    print("-" * 50)
+
+def test_incremental_refresh_stops_at_known_episode():
+    """Ein inkrementeller Refresh liest nur die Episoden vor der ersten bekannten (lokal, ohne Server)"""
+    print("⏩ Teste inkrementellen Refresh...")
+    podtracker = local_app()
+    client = local_client()
+    feed_url = 'https://example.com/incremental.xml'
+    feed_id = local_feed(podtracker, feed_url, 3)
+    with podtracker.app.app_context():
+        before = dict(podtracker.db.session.query(podtracker.Episode.title, podtracker.Episode.id).filter_by(feed_id=feed_id))
+        assert podtracker.incremental_parse_args(feed_id, force_full=True) == (None, None)
+        known_keys, newer_than = podtracker.incremental_parse_args(feed_id)
+        assert len(known_keys) == 3 and newer_than == datetime(2024, 1, 3, 10)
+        _, episodes_data = podtracker.parse_feed_content(local_feed_content(5), known_keys, newer_than)
+        assert [episode['title'] for episode in episodes_data] == ['Folge 5', 'Folge 4']
+
+    with local_feed_urls({feed_url: local_feed_content(5)}):
+        assert client.post(f'/feeds/{feed_id}/refresh_episodes').status_code == 200
+    with podtracker.app.app_context():
+        after = dict(podtracker.db.session.query(podtracker.Episode.title, podtracker.Episode.id).filter_by(feed_id=feed_id))
+    assert set(after) == {'Folge 1', 'Folge 2', 'Folge 3', 'Folge 4', 'Folge 5'}
+    assert {title: after[title] for title in before} == before
+    print("✅ Parsen endet an der ersten bekannten Episode, neue Episoden angehängt")
+    print("-" * 50)
+
+def test_full_refresh_skips_archived_episodes():
+    """Ein vollständiger Refresh legt archivierte Episoden nicht erneut an (lokal, ohne Server)"""
+    print("🗃️ Teste vollständigen Refresh mit archivierten Episoden...")
+    podtracker = local_app()
+    feed_id = local_feed(podtracker, 'https://example.com/archived.xml', 3)
+    with podtracker.app.app_context():
+        episode_id = podtracker.Episode.query.filter_by(feed_id=feed_id, title='Folge 1').one().id
+        podtracker.run_ingest_write(podtracker.archive_episode_batch, [episode_id])
+    local_refresh(podtracker, feed_id, 3)
+    with podtracker.app.app_context():
+        titles = {title for (title,) in podtracker.db.session.query(podtracker.Episode.title).filter_by(feed_id=feed_id)}
+        assert titles == {'Folge 2', 'Folge 3'}
+        assert podtracker.ArchivedEpisode.query.filter_by(feed_id=feed_id, title='Folge 1').count() == 1
+    print("✅ Archivierte Episode bleibt im Archiv")
+    print("-" * 50)
+
 def check_environment():
     """Prüft die Umgebungsvariablen"""
     print("🔧 Prüfe Umgebungsvariablen...")
@@ -130,6 +625,22 @@ def main():
     test_episodes_api()
     test_transcript_search()
     test_youtube_search()
+    test_api_v2_stateless()
+    test_stats_api()
+    test_saved_search_unread_counts()
+    test_streamed_episodes_release_connections()
+    test_streamed_saved_search_episodes_release_connections()
+    test_webhook_event_ids_after_prune()
+    test_full_refresh_keeps_saved_search_read_state()
+    test_full_refresh_keeps_favorite_saved_search_matches()
+    test_full_refresh_keeps_episode_ids()
+    test_batch_update_rejects_invalid_values()
+    test_shared_feed_requires_admin()
+    test_writes_under_sqlite_tuned()
+    test_restored_episode_stays_restored()
+    test_merge_duplicate_feeds()
+    test_incremental_refresh_stops_at_known_episode()
+    test_full_refresh_skips_archived_episodes()
     
     print("🏁 Tests abgeschlossen!")
 